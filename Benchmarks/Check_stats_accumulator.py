@@ -0,0 +1,277 @@
+import os
+import sys
+import numpy as np
+
+sys.path.append( os.path.dirname( os.path.dirname( os.path.abspath(__file__) ) ) )   # the modules of the repository are in the parent directory
+import Calculate_stats as cs
+import Stats_accumulator as sa
+import pdb
+
+
+"""
+
+This script checks the statistics of Stats_accumulator against those calculated by NumPy on the whole data. Synthetic data (random, sorted, in reverse order and with many
+ties, with missing values) are added to an accumulator chunk by chunk, and to several accumulators which are then merged. For every variable :
+
+    COUNT, MIN, MAX                 : must be equal to those of NumPy.
+    MEAN, STANDARD_DEVIATION        : must be within MOMENT_TOLERANCE (relative) of np.mean and np.std.
+    Q1, MEDIAN, Q3, PERCENTILE_<p>  : the rank of the estimated value must be within the rank error of the accumulator of the requested rank (see
+                                      Stats_accumulator.Create_stats_accumulator). While the accumulator holds too few values to be compacted, the value must instead
+                                      be equal to np.quantile.
+
+The largest rank error measured for each case is printed (0 for exact quantiles). An AssertionError is raised as soon as a statistic is out of its bound.
+
+
+Author        : Élise Comeau
+
+Created       : October 18th, 2026
+
+Last modified : October 18th, 2026
+
+"""
+
+
+# Step 0 : Define constants
+
+NBR_OF_ROWS         = 200000
+NBR_OF_SMALL_ROWS   = 60                     # fewer values than a sketch holds before compacting them (4 / rank error), so the quantiles must be exact
+NBR_OF_VARS         = 2
+CHUNK_NBR_OF_ROWS   = 7000                   # not a divisor of NBR_OF_ROWS, so the last chunk is shorter
+NBR_OF_ACCUMULATORS = 7                      # accumulators merged (eg. one per station or per process)
+MISSING_FRACTION    = 0.01
+RANK_ERRORS         = [0.01, 0.05]
+QUANTILE_NAMES      = ['PERCENTILE_1', 'Q1', 'MEDIAN', 'Q3', 'PERCENTILE_99']
+MOMENT_NAMES        = ['COUNT', 'MIN', 'MAX', 'MEAN', 'STANDARD_DEVIATION']
+MOMENT_TOLERANCE    = 1e-9
+SEED                = 2026
+
+
+
+def Make_check_data(data_name, nbr_of_rows, rng) :
+
+    """
+
+    Makes the data of a check, with MISSING_FRACTION of missing values (NaN) at random.
+
+
+    Parameters :
+
+        data_name (string) : 'random' (normal and lognormal variables), 'sorted' (in increasing order), 'reversed' (in decreasing order) or 'ties' (few distinct values).
+
+        nbr_of_rows (int)  : Number of rows.
+
+        rng (Generator)    : Random number generator.
+
+
+    Returns :
+
+        data (array) : Data, of shape (nbr_of_rows, NBR_OF_VARS).
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    data = np.column_stack( ( rng.normal(250., 100., nbr_of_rows), rng.lognormal(3., 1., nbr_of_rows) ) )[:, :NBR_OF_VARS]
+
+    if ( data_name == 'sorted' ) :
+        data = np.sort(data, axis=0)
+
+    elif ( data_name == 'reversed' ) :
+        data = np.sort(data, axis=0)[::-1]
+
+    elif ( data_name == 'ties' ) :
+        data = np.round(data / 50.) * 50.
+
+    data[ rng.random(data.shape) < MISSING_FRACTION ] = np.nan
+
+    return data
+
+
+# End of function definition
+
+
+
+def Get_rank_error(sorted_values, quantile_value, quantile) :
+
+    """
+
+    Calculates the rank error of an estimated quantile : the distance between the requested rank and the ranks of the estimated value in the data (a value repeated in
+    the data covers several ranks), as a fraction of the amount of data.
+
+
+    Parameters :
+
+        sorted_values (array)  : Valid data of the variable, sorted.
+
+        quantile_value (float) : Estimated value of the quantile.
+
+        quantile (float)       : Quantile, from 0 to 1.
+
+
+    Returns :
+
+        rank_error (float) : Rank error (0 if the value is at the requested rank).
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    nbr_of_values = sorted_values.shape[0]
+
+    lowest_rank  = np.searchsorted(sorted_values, quantile_value, side='left') / nbr_of_values
+    highest_rank = np.searchsorted(sorted_values, quantile_value, side='right') / nbr_of_values
+
+    rank_error = max( 0., lowest_rank - quantile, quantile - highest_rank )
+
+    return rank_error
+
+
+# End of function definition
+
+
+
+def Check_accumulator(check_name, accumulator, data, rank_error) :
+
+    """
+
+    Compares the statistics of an accumulator with those of NumPy and asserts that they are within their bounds (see the description of the script).
+
+
+    Parameters :
+
+        check_name (string) : Name of the check, printed.
+
+        accumulator (dict)  : Accumulator holding data (see Stats_accumulator.Create_stats_accumulator).
+
+        data (array)        : Data added to the accumulator. Each column represents a single variable.
+
+        rank_error (float)  : Rank error of the accumulator.
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    # Step 1 : Obtain the statistics of the accumulator and the valid data of every variable
+
+    moments_values   = sa.Get_accumulated_stats(accumulator, MOMENT_NAMES)
+    quantiles_values = sa.Get_accumulated_stats(accumulator, QUANTILE_NAMES)
+    is_compacted     = any( len(sketch['levels']) > 1 for sketch in accumulator['sketches'] )
+
+    largest_rank_error = 0.
+
+    for var_nbr in range(data.shape[1]) :
+
+        valid_values = np.sort( data[ ~np.isnan(data[:, var_nbr]), var_nbr ] )
+
+
+        # Step 2 : Compare the count, extremes and moments
+
+        expected_moments = [ valid_values.shape[0], valid_values[0], valid_values[-1], np.mean(valid_values), np.std(valid_values) ]
+
+        for stat_name, stat_value, expected_value in zip(MOMENT_NAMES, moments_values[:, var_nbr], expected_moments) :
+
+            if ( stat_name in ('COUNT', 'MIN', 'MAX') ) :
+                assert stat_value == expected_value, check_name + ' : ' + stat_name + ' of variable ' + str(var_nbr) + ' is ' + str(stat_value) + ' instead of ' + str(expected_value)
+
+            else :
+                assert np.isclose(stat_value, expected_value, rtol=MOMENT_TOLERANCE, atol=0.), check_name + ' : ' + stat_name + ' of variable ' + str(var_nbr) + ' is ' + str(stat_value) + ' instead of ' + str(expected_value)
+
+
+        # Step 3 : Compare the quantiles (exact while nothing was compacted, within the rank error otherwise)
+
+        for stat_name, quantile_value in zip(QUANTILE_NAMES, quantiles_values[:, var_nbr]) :
+
+            quantile = cs.Get_quantile(stat_name)
+
+            if ( not is_compacted ) :   # interpolated as with np.quantile, so its rank may be up to 1 / (number of values) from the requested one
+
+                assert np.isclose(quantile_value, np.quantile(valid_values, quantile), rtol=MOMENT_TOLERANCE, atol=0.), check_name + ' : ' + stat_name + ' of variable ' + str(var_nbr) + ' is not exact'
+                continue
+
+            stat_rank_error    = Get_rank_error(valid_values, quantile_value, quantile)
+            largest_rank_error = max(largest_rank_error, stat_rank_error)
+
+            assert stat_rank_error <= rank_error, check_name + ' : rank error of ' + stat_name + ' of variable ' + str(var_nbr) + ' is ' + str(stat_rank_error) + ', above ' + str(rank_error)
+
+    print(check_name.ljust(40) + ' largest rank error : ' + str(round(largest_rank_error, 5)).ljust(8) + ' (bound : ' + str(rank_error) + ')')
+
+
+# End of function definition
+
+
+
+# Step 1 : Check every kind of data, with one accumulator and with merged accumulators
+
+rng = np.random.default_rng(SEED)
+
+for rank_error in RANK_ERRORS :
+
+    for data_name in ['random', 'sorted', 'reversed', 'ties'] :
+
+        data       = Make_check_data(data_name, NBR_OF_ROWS, rng)
+        small_data = Make_check_data(data_name, NBR_OF_SMALL_ROWS, rng)
+
+
+        # Step 1.1 : One accumulator, chunk by chunk
+
+        accumulator = sa.Create_stats_accumulator(NBR_OF_VARS, rank_error)
+
+        for chunk_start in range(0, NBR_OF_ROWS, CHUNK_NBR_OF_ROWS) :
+            sa.Update_stats_accumulator(accumulator, data[chunk_start:chunk_start + CHUNK_NBR_OF_ROWS])
+
+        Check_accumulator(data_name + ', eps ' + str(rank_error) + ', chunks', accumulator, data, rank_error)
+
+
+        # Step 1.2 : Several accumulators (each on a contiguous part of the data, of unequal sizes), merged two by two
+
+        part_starts  = np.sort( rng.choice(np.arange(1, NBR_OF_ROWS), NBR_OF_ACCUMULATORS - 1, replace=False) )
+        accumulators = []
+
+        for part_data in np.split(data, part_starts) :
+
+            part_accumulator = sa.Create_stats_accumulator(NBR_OF_VARS, rank_error)
+
+            for chunk_start in range(0, part_data.shape[0], CHUNK_NBR_OF_ROWS) :
+                sa.Update_stats_accumulator(part_accumulator, part_data[chunk_start:chunk_start + CHUNK_NBR_OF_ROWS])
+
+            accumulators.append(part_accumulator)
+
+        while ( len(accumulators) > 1 ) :
+            accumulators = [ sa.Merge_stats_accumulators(*accumulators[accumulator_nbr:accumulator_nbr + 2]) if ( accumulator_nbr + 1 < len(accumulators) ) else accumulators[accumulator_nbr]
+                             for accumulator_nbr in range(0, len(accumulators), 2) ]
+
+        Check_accumulator(data_name + ', eps ' + str(rank_error) + ', merged', accumulators[0], data, rank_error)
+
+
+        # Step 1.3 : Few data (the quantiles must be exact)
+
+        accumulator = sa.Create_stats_accumulator(NBR_OF_VARS, rank_error)
+        sa.Update_stats_accumulator(accumulator, small_data)
+
+        assert all( len(sketch['levels']) == 1 for sketch in accumulator['sketches'] ), data_name + ', eps ' + str(rank_error) + ' : few data were compacted'
+
+        Check_accumulator(data_name + ', eps ' + str(rank_error) + ', few data', accumulator, small_data, rank_error)
+        #pdb.set_trace()
+
+print('\nStats_accumulator agrees with NumPy on every check')
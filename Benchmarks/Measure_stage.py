@@ -0,0 +1,82 @@
+import os
+import sys
+import time
+import resource
+import tracemalloc
+import pdb
+
+
+
+MAXRSS_UNIT = 1 if ( sys.platform == 'darwin' ) else 2**10   # ru_maxrss is in bytes on macOS and in kilobytes on Linux
+
+
+
+def Measure_stage(stage_function, stage_args, nbr_of_rows) :
+
+    """
+
+    Runs a stage of the pipeline once and measures its wall-clock time, its CPU time, its throughput and its peak memory.
+
+
+    Parameters :
+
+        stage_function (function) : Function running the stage.
+
+        stage_args (list)         : Arguments of stage_function.
+
+        nbr_of_rows (int)         : Number of rows (entries) processed by the stage, used to calculate the throughput.
+
+
+    Returns :
+
+        stage_result (any)  : Value returned by stage_function.
+
+        measurements (dict) : Keys are 'seconds' (wall-clock time), 'cpu_seconds' (CPU time of the process and of the processes it waited for, eg. a pool of workers),
+                              'rows', 'rows_per_second', 'peak_memory_mb' (peak of the memory allocated by the process during the stage, numpy arrays included,
+                              as traced by tracemalloc; the memory of other processes is not included), 'peak_rss_mb' (peak resident memory of the process) and
+                              'peak_children_rss_mb' (peak resident memory of the largest process it waited for, eg. a worker of a pool). The last two are
+                              ru_maxrss, which is a peak since the start of the process (or of the first child) : the stage reached it if it is larger than
+                              that of the previous stages.
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    tracemalloc.start()
+
+    start_times = os.times()
+    start_time  = time.perf_counter()
+
+    stage_result = stage_function(*stage_args)
+
+    seconds   = time.perf_counter() - start_time
+    end_times = os.times()
+
+    peak_memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    peak_rss          = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * MAXRSS_UNIT
+    peak_children_rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * MAXRSS_UNIT
+
+    cpu_seconds = sum( end_times[:4] ) - sum( start_times[:4] )   # user and system times, of the process then of its children
+
+    measurements = { 'seconds'              : seconds,
+                     'cpu_seconds'          : cpu_seconds,
+                     'rows'                 : int(nbr_of_rows),
+                     'rows_per_second'      : nbr_of_rows / seconds if ( seconds > 0 ) else None,
+                     'peak_memory_mb'       : peak_memory / 2**20,
+                     'peak_rss_mb'          : peak_rss / 2**20,
+                     'peak_children_rss_mb' : peak_children_rss / 2**20 }
+    #pdb.set_trace()
+
+    return stage_result, measurements
+
+
+# End of function definition
@@ -0,0 +1,210 @@
+import os
+import sys
+import json
+import shutil
+import platform
+import datetime
+import numpy as np
+
+sys.path.append( os.path.dirname( os.path.dirname( os.path.abspath(__file__) ) ) )   # the modules of the repository are in the parent directory
+import fluxnet_classes as fc
+import Filter_amf_stations as fas
+import Temporal_mean as tm
+import Gem_cache as gc
+import Match_gem_dates as mgd
+import Get_UTC_offsets as guo
+import Calculate_stats as cs
+import Grouped_quartiles as gq
+import Render_plots as rp
+import Make_time_series_plot as mtsp
+import Synthetic_data as sd
+import Measure_stage as ms
+import pdb
+
+
+"""
+
+This script measures the speed of every stage of the processing on synthetic data, at several scales (number of stations and years of data), so that the stages can be
+timed without the AmeriFlux (AMF) and GEM files. For each scale, it writes AMF half-hourly csv files, GEM station files and a UTC offset file, then runs :
+
+    filter            : Filter_amf_stations (as in Filter_amf_data_abridged.py and Run_pipeline.py).
+    temporal-mean     : Temporal_mean_multi_threshold on the 30 minute means of every station.
+    gem-dates         : Load_gem_file of the dates only (empty cache) and Match_gem_dates (as in filter_gem_dates_and_data.py).
+    stats             : Calculate_stats on the 3 hour means of every station.
+    grouped-quartiles : Calculate_network_grouped_stats by hour of the day and by month (as in Make_quartiles_table.py).
+    plots             : Make_time_series_plot of every station, rendered by Render_plot_jobs (as in the Make_*_plot.py scripts). The number of failed plots is saved
+                        with the stage; if any plot failed, its throughput is dropped (None).
+
+The wall-clock and CPU times, the throughput (rows per second) and the peak memory of each stage at each scale are saved to a json file, along with the scaling curve of each
+stage (its measurements ordered by number of rows). The peak memory is given both as traced in this process and as the peak resident memory (ru_maxrss) of this process
+and of the workers it waited for (see Measure_stage).
+
+
+Author        : Élise Comeau
+
+Created       : October 18th, 2026
+
+Last modified : October 18th, 2026
+
+"""
+
+
+# Step 0 : Define constants
+
+# Step 0.1 : Define directories and filenames
+
+BENCHMARK_DIRECTORY = '/tmp/fluxnet_benchmarks'                                  # synthetic data of each scale (deleted once the scale is measured, unless KEEP_DATA)
+RESULTS_PATHNAME    = '/tmp/fluxnet_benchmarks/Benchmarks_results.json'
+VAR_NAMES_STRING    = 'TA-SW_IN-SW_OUT-LW_IN-LW_OUT-H-LE'
+
+
+# Step 0.2 : Define the scales
+
+SCALES     = [ (1, 1), (1, 4), (4, 4), (16, 4) ]   # (number of stations, number of years of data)
+START_DATE = '1995-01-01T00:00'
+KEEP_DATA  = False
+
+
+# Step 0.3 : Define values (same as the processing scripts)
+
+VAR_NAMES_LIST         = VAR_NAMES_STRING.split('-')
+NBR_OF_HEADER_ROWS     = 3
+GEM_NBR_OF_HEADER_ROWS = 2
+DELIMITER              = ','
+DATES_INDEX            = 0
+MISSING_VALUE          = float(sd.MISSING_VALUE)
+MISSING_FRACTION       = 0.02               # fraction of the AMF values missing
+HALF_TIME              = 15
+CHUNK_NBR_OF_ROWS      = 100000
+NBR_OF_WORKERS         = 4
+T_FREQ_SHORT           = 1800
+T_FREQ_LONG            = 10800
+CENTRAL_TIME           = 1.5
+AMF_T_FREQ             = 3
+SAMPLING_PERCENTAGES   = [10., 25., 50., 60., 75., 100.]
+GEM_SAMPLING_INDEX     = 2                  # index of the 50 % sampling percentage, whose dates the GEM dates are matched to
+STATS_NAMES            = ['MEAN', 'STANDARD_DEVIATION', 'MIN', 'Q1', 'MEDIAN', 'Q3', 'MAX']
+QUARTILES_NAMES        = ['COUNT', 'Q1', 'MEDIAN', 'Q3']
+UTC_OFFSETS            = [-5, -6, -7, -8]   # given to the stations in turn
+ROWS_PER_YEAR          = 17520              # 30 minute means
+
+
+
+# Step 1 : Measure every stage at every scale
+
+results_list = []
+
+for nbr_of_stations, nbr_of_years in SCALES :
+
+    # Step 1.1 : Write the synthetic files of the scale (not timed)
+
+    scale_name      = str(nbr_of_stations) + '-stations_' + str(nbr_of_years) + '-years'
+    scale_directory = BENCHMARK_DIRECTORY + '/' + scale_name
+    rng             = np.random.default_rng(nbr_of_stations * 1000 + nbr_of_years)
+
+    os.makedirs(scale_directory, exist_ok=True)
+
+    station_ids_list = [ 'US-S' + str(station_nbr).zfill(2) for station_nbr in range(nbr_of_stations) ]
+    utc_offsets_list = [ UTC_OFFSETS[station_nbr % len(UTC_OFFSETS)] for station_nbr in range(nbr_of_stations) ]
+    nbr_of_rows      = nbr_of_years * ROWS_PER_YEAR
+
+    csv_pathnames   = [ scale_directory + '/AMF_' + station_id + '_BASE_HH_1-5.csv' for station_id in station_ids_list ]
+    gem_pathnames   = [ scale_directory + '/' + station_id + '.txt' for station_id in station_ids_list ]
+    dates_pathnames = [ scale_directory + '/AMF_dates_' + station_id + '_' + VAR_NAMES_STRING + '_0-5.npy' for station_id in station_ids_list ]
+    data_pathnames  = [ dates_pathname.replace('dates', 'data') for dates_pathname in dates_pathnames ]
+    utc_pathname    = scale_directory + '/Stations_utc-offsets.txt'
+
+    for station_id, csv_pathname, gem_pathname in zip(station_ids_list, csv_pathnames, gem_pathnames) :
+
+        sd.Write_amf_csv(csv_pathname, station_id, START_DATE, nbr_of_rows, MISSING_FRACTION, rng)
+        sd.Write_gem_file(gem_pathname, START_DATE[:13], nbr_of_rows // 2 + 24, VAR_NAMES_LIST, rng)   # one more day, since the GEM dates are in UTC
+
+    sd.Write_utc_offsets(utc_pathname, station_ids_list, utc_offsets_list)
+    print('Scale ' + scale_name + ' : synthetic data written')
+    #pdb.set_trace()
+
+
+    # Step 1.2 : Run the stages one after the other, each one on the outputs of the previous ones
+
+    scale_results = {}
+
+    total_dates_list, scale_results['filter'] = ms.Measure_stage(fas.Filter_amf_stations, [ csv_pathnames, dates_pathnames, data_pathnames, VAR_NAMES_LIST, NBR_OF_HEADER_ROWS,
+                                                                                          DELIMITER, DATES_INDEX, MISSING_VALUE, HALF_TIME, fc.constants.reference_date,
+                                                                                          NBR_OF_WORKERS, CHUNK_NBR_OF_ROWS ], nbr_of_stations * nbr_of_rows)
+
+    half_hr_list = [ ( np.load(dates_pathname), np.load(data_pathname) ) for dates_pathname, data_pathname in zip(dates_pathnames, data_pathnames) ]
+
+    three_hr_list, scale_results['temporal-mean'] = ms.Measure_stage(lambda : [ tm.Temporal_mean_multi_threshold(data, dates, T_FREQ_SHORT, T_FREQ_LONG, CENTRAL_TIME, SAMPLING_PERCENTAGES)
+                                                                                for dates, data in half_hr_list ], [], sum(total_dates_list))
+
+    three_hr_dates_list = [ dates_3_hr_list[GEM_SAMPLING_INDEX] for data_3_hr_list, dates_3_hr_list in three_hr_list ]
+    three_hr_data_list  = [ data_3_hr_list[GEM_SAMPLING_INDEX] for data_3_hr_list, dates_3_hr_list in three_hr_list ]
+    nbr_of_3_hr_rows    = sum( dates.shape[0] for dates in three_hr_dates_list )
+
+    utc_offsets = guo.find_utc_offsets(utc_pathname, 1, DELIMITER, 0, 3)
+
+    gem_dates_list, scale_results['gem-dates'] = ms.Measure_stage(lambda : [ mgd.Match_gem_dates(gc.Load_gem_file(gem_pathname, GEM_NBR_OF_HEADER_ROWS, DELIMITER, DATES_INDEX, fc.constants.reference_date,
+                                                                                                                  scale_directory + '/cache', load_data=False)[0],
+                                                                                                 amf_dates, utc_offsets[station_id], AMF_T_FREQ, fc.constants.reference_date)
+                                                                             for station_id, gem_pathname, amf_dates in zip(station_ids_list, gem_pathnames, three_hr_dates_list) ],
+                                                                  [], nbr_of_stations * ( nbr_of_rows // 2 + 24 ))
+
+    stats_list, scale_results['stats'] = ms.Measure_stage(lambda : [ cs.Calculate_stats(STATS_NAMES, data, ignore_nan=True) for data in three_hr_data_list ], [], nbr_of_3_hr_rows)
+
+    grouped_stats, scale_results['grouped-quartiles'] = ms.Measure_stage(lambda : [ gq.Calculate_network_grouped_stats(QUARTILES_NAMES, three_hr_dates_list, three_hr_data_list,
+                                                                                                                        fc.constants.reference_date, grouping)
+                                                                                    for grouping in gq.GROUPINGS ], [], nbr_of_3_hr_rows * len(gq.GROUPINGS))
+
+    plot_jobs = [ rp.Make_plot_job(mtsp.Make_time_series_plot, ( [ dates ], [ data[:, VAR_NAMES_LIST.index('H')] ], [ station_id ], 'H', scale_directory + '/' + station_id + '_H.png' ),
+                                   scale_directory + '/' + station_id + '_H.png', []) for station_id, dates, data in zip(station_ids_list, three_hr_dates_list, three_hr_data_list) ]
+
+    jobs_summary, scale_results['plots'] = ms.Measure_stage(rp.Render_plot_jobs, [ plot_jobs, NBR_OF_WORKERS ], nbr_of_3_hr_rows)
+
+    nbr_of_failed_jobs = sum( 1 for output_pathname, job_status, job_seconds in jobs_summary if job_status == rp.FAILED_STATUS )   # Render_plot_jobs does not raise
+    scale_results['plots'].update( { 'failed_jobs' : nbr_of_failed_jobs } )
+
+    if ( nbr_of_failed_jobs > 0 ) :   # the time of failed jobs is not that of rendering the plots
+
+        scale_results['plots'].update( { 'rows_per_second' : None } )
+        print('Scale ' + scale_name + ' : ' + str(nbr_of_failed_jobs) + ' of ' + str(len(plot_jobs)) + ' plots failed; the throughput of the stage is dropped')
+    #pdb.set_trace()
+
+
+    # Step 1.3 : Keep the measurements of the scale
+
+    for stage_name, measurements in scale_results.items() :
+
+        results_list.append( dict( { 'scale' : scale_name, 'nbr_of_stations' : nbr_of_stations, 'nbr_of_years' : nbr_of_years, 'stage' : stage_name }, **measurements ) )
+        print('Scale ' + scale_name + ', stage ' + stage_name + ' : ' + str(round(measurements['seconds'], 3)) + ' s, ' + ( str(int(measurements['rows_per_second'])) + ' rows/s, ' if ( measurements['rows_per_second'] is not None ) else 'no throughput, ' )
+              + str(round(measurements['peak_memory_mb'], 1)) + ' MB traced, peak RSS ' + str(round(measurements['peak_rss_mb'], 1)) + ' MB (children '
+              + str(round(measurements['peak_children_rss_mb'], 1)) + ' MB)')
+
+    if ( not KEEP_DATA ) :
+        shutil.rmtree(scale_directory)
+
+
+
+# Step 2 : Save the measurements and the scaling curve of each stage
+
+scaling_curves = {}
+
+for stage_name in dict.fromkeys( result['stage'] for result in results_list ) :
+
+    stage_results = sorted( [ result for result in results_list if result['stage'] == stage_name ], key=lambda result : result['rows'] )
+    scaling_curves.update( { stage_name : { key : [ result[key] for result in stage_results ] for key in ('rows', 'seconds', 'rows_per_second', 'peak_memory_mb', 'peak_rss_mb', 'peak_children_rss_mb') } } )
+
+benchmark_results = { 'created'  : datetime.datetime.now().isoformat(timespec='seconds'),
+                      'machine'  : { 'platform' : platform.platform(), 'python' : platform.python_version(), 'numpy' : np.__version__, 'nbr_of_cpus' : os.cpu_count() },
+                      'params'   : { 'scales' : SCALES, 'nbr_of_workers' : NBR_OF_WORKERS, 'chunk_nbr_of_rows' : CHUNK_NBR_OF_ROWS, 'missing_fraction' : MISSING_FRACTION },
+                      'results'  : results_list,
+                      'scaling'  : scaling_curves }
+
+os.makedirs(os.path.dirname(RESULTS_PATHNAME), exist_ok=True)
+
+temporary_pathname = RESULTS_PATHNAME + '.' + str(os.getpid()) + '.tmp'
+
+with open(temporary_pathname, 'w') as results_file :
+    json.dump(benchmark_results, results_file, indent=1)
+
+os.replace(temporary_pathname, RESULTS_PATHNAME)
+print('Benchmark results saved to ' + RESULTS_PATHNAME)
@@ -0,0 +1,240 @@
+import numpy as np
+import pdb
+
+
+
+AMF_VAR_NAMES = ['TA', 'SW_IN', 'SW_OUT', 'LW_IN', 'LW_OUT', 'H', 'LE', 'G']   # variables of the synthetic AMF files (after TIMESTAMP_START and TIMESTAMP_END)
+MISSING_VALUE = -9999                                                          # convention used in the AMF files
+AMF_T_FREQ    = 30                                                             # in minutes
+GEM_T_FREQ    = 1                                                              # in hours (GEM dates are matched to the 3 hour AMF dates in local time)
+
+
+
+def Make_synthetic_series(dates, rng) :
+
+    """
+
+    Makes realistic values of the energy balance variables : a diurnal and seasonal cycle of the solar radiation, from which the other variables are derived, plus noise.
+
+
+    Parameters :
+
+        dates (array)   : Dates, as numpy datetime64.
+
+        rng (Generator) : Random number generator (np.random.default_rng).
+
+
+    Returns :
+
+        data (array) : Values of the variables of AMF_VAR_NAMES (one column each, in that order), in K for TA and W/m2 for the others.
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    day_of_year = ( dates - dates.astype('datetime64[Y]') ).astype('timedelta64[s]').astype(np.float64) / 86400
+    hour_of_day = ( day_of_year % 1 ) * 24
+
+    season = np.cos( 2 * np.pi * ( day_of_year - 172 ) / 365 )                          # 1 at the summer solstice
+    sun    = np.maximum( np.cos( np.pi * ( hour_of_day - 12 ) / 12 ), 0. ) * ( 0.65 + 0.35 * season )
+
+    sw_in  = 1000 * sun * rng.uniform(0.3, 1., size=dates.shape)
+    sw_out = sw_in * rng.uniform(0.1, 0.3, size=dates.shape)
+    ta     = 283 + 12 * season + 5 * sun + rng.normal(0, 2, size=dates.shape)
+    lw_in  = 5.67e-8 * 0.8 * ( ta - 10 )**4 + rng.normal(0, 10, size=dates.shape)
+    lw_out = 5.67e-8 * 0.98 * ta**4 + rng.normal(0, 5, size=dates.shape)
+    rnet   = sw_in - sw_out + lw_in - lw_out
+    g      = 0.1 * rnet + rng.normal(0, 5, size=dates.shape)
+    le     = np.maximum( rnet - g, 0. ) * rng.uniform(0.3, 0.7, size=dates.shape) + rng.normal(0, 10, size=dates.shape)
+    h      = rnet - g - le + rng.normal(0, 10, size=dates.shape)
+
+    data = np.column_stack( ( ta, sw_in, sw_out, lw_in, lw_out, h, le, g ) )
+
+    return data
+
+
+# End of function definition
+
+
+
+def Write_amf_csv(pathname, station_id, start_date, nbr_of_rows, missing_fraction, rng) :
+
+    """
+
+    Writes a synthetic AmeriFlux (AMF) half-hourly csv file : 3 header rows (site, version and names of the columns), then TIMESTAMP_START and TIMESTAMP_END (%Y%m%d%H%M)
+    and the variables of AMF_VAR_NAMES, with gaps (MISSING_VALUE) at random.
+
+
+    Parameters :
+
+        pathname (string)        : Absolute pathname of the csv file.
+
+        station_id (string)      : Id of the station (eg. 'US-Syn').
+
+        start_date (string)      : Date of the first entry (eg. '1995-01-01T00:00').
+
+        nbr_of_rows (int)        : Number of entries (17520 per year).
+
+        missing_fraction (float) : Fraction of the values replaced by MISSING_VALUE (eg. 0.05).
+
+        rng (Generator)          : Random number generator.
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    starts = np.datetime64(start_date, 'm') + np.arange(nbr_of_rows) * np.timedelta64(AMF_T_FREQ, 'm')
+
+    data = Make_synthetic_series(starts + np.timedelta64(AMF_T_FREQ // 2, 'm'), rng)
+    data[ rng.random(data.shape) < missing_fraction ] = MISSING_VALUE
+
+    columns = np.column_stack( ( Datetime64_to_ints(starts), Datetime64_to_ints(starts + np.timedelta64(AMF_T_FREQ, 'm')), data ) )
+
+    with open(pathname, 'w') as amf_file :
+
+        amf_file.write('# Site: ' + station_id + '\n# Version: 1-5\n' + ','.join( [ 'TIMESTAMP_START', 'TIMESTAMP_END' ] + AMF_VAR_NAMES ) + '\n')
+        np.savetxt(amf_file, columns, fmt=','.join( [ '%d', '%d' ] + [ '%.2f' ] * len(AMF_VAR_NAMES) ))
+
+
+# End of function definition
+
+
+
+def Write_gem_file(pathname, start_date, nbr_of_rows, var_names_list, rng) :
+
+    """
+
+    Writes a synthetic GEM station file : 2 header rows, then one line per hour (UTC) with the date (%Y%m%d%H) and the variables, comma-delimited.
+
+
+    Parameters :
+
+        pathname (string)     : Absolute pathname of the GEM file.
+
+        start_date (string)   : Date of the first entry (eg. '1995-01-01T00').
+
+        nbr_of_rows (int)     : Number of entries (8760 per year).
+
+        var_names_list (list) : Variables to write, among AMF_VAR_NAMES.
+
+        rng (Generator)       : Random number generator.
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    dates = np.datetime64(start_date, 'h') + np.arange(nbr_of_rows) * np.timedelta64(GEM_T_FREQ, 'h')
+    data  = Make_synthetic_series(dates, rng)[:, [ AMF_VAR_NAMES.index(var_name) for var_name in var_names_list ]]
+
+    columns = np.column_stack( ( Datetime64_to_ints(dates) // 100, data ) )   # the minutes are not written
+
+    with open(pathname, 'w') as gem_file :
+
+        gem_file.write( ','.join( [ 'DATE' ] + list(var_names_list) ) + '\n' + 'YYYYMMDDHH' + ',' * len(var_names_list) + '\n' )
+        np.savetxt(gem_file, columns, fmt=','.join( [ '%d' ] + [ '%.4f' ] * len(var_names_list) ))
+
+
+# End of function definition
+
+
+
+def Write_utc_offsets(pathname, station_ids_list, utc_offsets_list) :
+
+    """
+
+    Writes a UTC offset file (see Get_UTC_offsets.find_utc_offsets) : 1 header row, then the station id, two unused columns and the UTC offset of each station.
+
+
+    Parameters :
+
+        pathname (string)       : Absolute pathname of the UTC offset file.
+
+        station_ids_list (list) : Ids of the stations.
+
+        utc_offsets_list (list) : UTC offsets of the stations, in hours (eg. -5).
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    with open(pathname, 'w') as utc_offset_file :
+
+        utc_offset_file.write('STATION,LAT,LON,UTC_OFFSET\n')
+
+        for station_id, utc_offset in zip(station_ids_list, utc_offsets_list) :
+            utc_offset_file.write(station_id + ',0,0,' + str(utc_offset) + '\n')
+
+
+# End of function definition
+
+
+
+def Datetime64_to_ints(dates) :
+
+    """
+
+    Writes dates as integers in the %Y%m%d%H%M format (eg. 199501010030), for the whole array at once.
+
+
+    Parameters :
+
+        dates (array) : Dates, as numpy datetime64.
+
+
+    Returns :
+
+        date_ints (array) : Dates as integers.
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    minutes = dates.astype('datetime64[m]')
+    years   = minutes.astype('datetime64[Y]')
+    months  = minutes.astype('datetime64[M]')
+    days    = minutes.astype('datetime64[D]')
+    hours   = minutes.astype('datetime64[h]')
+
+    date_ints = ( ( years.astype(np.int64) + 1970 ) * 100000000 + ( months - years ).astype(np.int64) * 1000000 + 1000000 + ( days - months ).astype(np.int64) * 10000
+                  + 10000 + ( hours - days ).astype(np.int64) * 100 + ( minutes - hours ).astype(np.int64) )
+    #pdb.set_trace()
+
+    return date_ints
+
+
+# End of function definition
@@ -1,36 +1,64 @@
+import sys
 import numpy as np
 
 
-def Calculate_stats(stats_names, data) :
+QUANTILES_OF_STATS = { 'MIN' : 0., 'Q1' : 0.25, 'MEDIAN' : 0.5, 'Q3' : 0.75, 'MAX' : 1. }   # statistics obtained from the sorted data (along with 'PERCENTILE_<p>')
+PERCENTILE_PREFIX  = 'PERCENTILE_'                                                          # eg. 'PERCENTILE_90' is the 90th percentile
+
+
+
+def Calculate_stats(stats_names, data, ignore_nan=False) :
 
     """
 
-    Calculates descriptive statistics for data of one or more variables.
+    Calculates descriptive statistics for data of one or more variables. The data of each variable are sorted only once, whatever the number of quantiles requested.
+
 
-    
     Parameters :
-    
-        stats_names (list) : Names of the descriptive statistics that will be calculated (eg. mean).
-    
+
+        stats_names (list) : Names of the descriptive statistics that will be calculated. Available statistics are 'MEAN', 'STANDARD_DEVIATION', 'COUNT', 'MIN', 'Q1', 'MEDIAN',
+                             'Q3', 'MAX' and 'PERCENTILE_<p>' (eg. 'PERCENTILE_90', p from 0 to 100). Quantiles are interpolated linearly, as with np.quantile.
+
         data (array)       : Data with which the descriptive statistics will be calculated. Each column represents a single variable.
-        
+
+        ignore_nan (bool)  : If True, missing data (NaN) are ignored. Otherwise, the statistics of a variable with missing data are NaN.
+
 
     Returns :
-    
-        stats_values (array) : Value of the descriptive statistics.
+
+        stats_values (array) : Value of the descriptive statistics. Each row represents one statistic, in the order of stats_names (unknown names are skipped, see Validate_stats_names).
 
 
     Author        : Élise Comeau
 
     Created       : June 3rd, 2021
 
-    Last modified : August 2nd, 2021
+    Last modified : October 18th, 2026
 
 
     """
 
 
-    # Step 1 : Calculate the descriptive statistics of the variable(s)
+    # Step 1 : Validate the parameters
+
+    stats_names = Validate_stats_names(stats_names)   # unknown names are skipped
+
+    data         = np.asarray(data)
+    data_columns = data.reshape( (data.shape[0], int( np.prod(data.shape[1:]) )) )       # a single variable is handled as one column
+    nbr_of_rows  = data_columns.shape[0]
+
+
+    # Step 2 : Sort the data once if any statistic needs it (missing data are placed at the end of each column)
+
+    if ( any( Get_quantile(stat_name) is not None for stat_name in stats_names ) ) :
+
+        sorted_values = np.sort(data_columns, axis=0).T.ravel()       # one column after the other
+        starts        = np.arange(data_columns.shape[1]) * nbr_of_rows
+        counts        = np.count_nonzero(~np.isnan(data_columns), axis=0)
+        has_nan       = ( counts < nbr_of_rows ) & ( not ignore_nan )
+
+
+    # Step 3 : Calculate the descriptive statistics of the variable(s)
 
     stats_values_list = []
 
@@ -38,21 +66,305 @@ def Calculate_stats(stats_names, data) :
 
         if ( stat_name == 'MEAN' ) :
 
-            stats_values_list.append(np.mean(data, axis=0))
+            stats_values_list.append( np.nanmean(data, axis=0) if ( ignore_nan ) else np.mean(data, axis=0) )
 
         elif ( stat_name == 'STANDARD_DEVIATION' ) :
 
-            stats_values_list.append(np.std(data, axis=0))
+            stats_values_list.append( np.nanstd(data, axis=0) if ( ignore_nan ) else np.std(data, axis=0) )
+
+        elif ( stat_name == 'COUNT' ) :
 
-        elif ( stat_name == 'MEDIAN' ) :
+            stats_values_list.append( np.count_nonzero(~np.isnan(data), axis=0) if ( ignore_nan ) else np.full(data.shape[1:], nbr_of_rows) )
 
-            stats_values_list.append(np.median(data, axis=0))
+        else :
 
+            stat_values = Calculate_sorted_stat(stat_name, sorted_values, starts, counts, has_nan)
+            stats_values_list.append( stat_values.reshape(data.shape[1:]) )
 
-    # Step 2 : Return the values of the descriptive statistic(s) 
+
+    # Step 4 : Return the values of the descriptive statistic(s)
 
     stats_values = np.array(stats_values_list)
     return stats_values
 
 
 # End of function definition
+
+
+
+def Calculate_grouped_stats(stats_names, data, group_keys, ignore_nan=False) :
+
+    """
+
+    Calculates descriptive statistics for data of one or more variables, separately for each group of entries (eg. each month or each hour of the day). All groups and
+    variables are reduced at once : the data are sorted a single time by variable, group and value, and each statistic is then read from the sorted segments.
+
+
+    Parameters :
+
+        stats_names (list) : Names of the descriptive statistics that will be calculated (see Calculate_stats).
+
+        data (array)       : Data with which the descriptive statistics will be calculated. Each column represents a single variable.
+
+        group_keys (array) : Group of each entry (row) of data (eg. the month, from 1 to 12). Any sortable values can be used.
+
+        ignore_nan (bool)  : If True, missing data (NaN) are ignored. Otherwise, the statistics of a group with missing data are NaN.
+
+
+    Returns :
+
+        groups (array)       : Groups present in group_keys, sorted.
+
+        stats_values (array) : Value of the descriptive statistics, of shape (number of statistics, number of groups) + (number of variables,) if data has more than one
+                               dimension. A statistic of a group without any valid data is NaN (0 for 'COUNT').
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    # Step 1 : Validate the parameters
+
+    stats_names = Validate_stats_names(stats_names)   # unknown names are skipped
+
+    data         = np.asarray(data, dtype=np.float64)
+    data_columns = data.reshape( (data.shape[0], int( np.prod(data.shape[1:]) )) )
+    group_keys   = np.asarray(group_keys)
+
+    if ( group_keys.shape[0] != data_columns.shape[0] ) :
+
+        print('There is a mismatch between the amount of group keys and the amount of data. Grouped statistics cannot be calculated.\n')
+        sys.exit(0)
+
+
+    # Step 2 : Number the segments (one per variable and group) and sort the values of each segment
+
+    groups, group_indexes = np.unique(group_keys, return_inverse=True)
+
+    nbr_of_groups   = groups.shape[0]
+    nbr_of_columns  = data_columns.shape[1]
+    nbr_of_segments = nbr_of_groups * nbr_of_columns
+
+    segment_indexes = ( np.arange(nbr_of_columns) * nbr_of_groups + group_indexes.reshape( (-1, 1) ) ).T.ravel()   # one column after the other
+    values          = data_columns.T.ravel()
+    is_valid        = ~np.isnan(values)
+
+    order           = np.lexsort( (values, segment_indexes) )            # missing data are placed at the end of each segment
+    sorted_values   = values[order]
+
+    sizes   = np.bincount(segment_indexes, minlength=nbr_of_segments)
+    starts  = np.concatenate( ( [0], np.cumsum(sizes)[:-1] ) )
+    counts  = np.bincount(segment_indexes, weights=is_valid, minlength=nbr_of_segments).astype(np.int64)
+    has_nan = ( counts < sizes ) & ( not ignore_nan )
+
+
+    # Step 3 : Calculate the descriptive statistics of each segment
+
+    valid_values = np.where(is_valid, values, 0.)
+
+    with np.errstate(invalid='ignore', divide='ignore') :                 # segments without valid data give NaN
+
+        sums  = np.bincount(segment_indexes, weights=valid_values, minlength=nbr_of_segments)
+        means = np.where(has_nan, np.nan, sums / counts)
+
+        deviations = np.where(is_valid, values - means[segment_indexes], 0.)
+        stds       = np.where(has_nan, np.nan, np.sqrt( np.bincount(segment_indexes, weights=deviations**2, minlength=nbr_of_segments) / counts ))
+
+    stats_values_list = []
+
+    for stat_name in stats_names :
+
+        if ( stat_name == 'MEAN' ) :
+            stat_values = means
+
+        elif ( stat_name == 'STANDARD_DEVIATION' ) :
+            stat_values = stds
+
+        elif ( stat_name == 'COUNT' ) :
+            stat_values = counts if ( ignore_nan ) else sizes
+
+        else :
+            stat_values = Calculate_sorted_stat(stat_name, sorted_values, starts, counts, has_nan)
+
+        stats_values_list.append( stat_values.reshape( (nbr_of_columns, nbr_of_groups) ).T.reshape( (nbr_of_groups,) + data.shape[1:] ) )
+
+
+    # Step 4 : Return the groups and the values of the descriptive statistic(s)
+
+    stats_values = np.array(stats_values_list)
+    return groups, stats_values
+
+
+# End of function definition
+
+
+
+def Calculate_sorted_stat(stat_name, sorted_values, starts, counts, has_nan) :
+
+    """
+
+    Calculates a statistic obtained from sorted data (minimum, maximum, median or another quantile) for several segments of sorted values at once.
+
+
+    Parameters :
+
+        stat_name (string)    : Name of the statistic (see Calculate_stats).
+
+        sorted_values (array) : Values of all the segments, one segment after the other. The values of each segment are sorted, missing data (NaN) last.
+
+        starts (array)        : Position of the first value of each segment in sorted_values.
+
+        counts (array)        : Number of valid (ie, not NaN) values of each segment.
+
+        has_nan (array)       : True for the segments whose statistic must be NaN because they have missing data.
+
+
+    Returns :
+
+        stat_values (array) : Value of the statistic for each segment (NaN for a segment without valid values).
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    if ( sorted_values.shape[0] == 0 ) :   # no data at all
+        return np.full(counts.shape, np.nan)
+
+    quantile    = Get_quantile(stat_name)
+    is_empty    = ( counts == 0 ) | has_nan
+    last_values = np.maximum(counts - 1, 0)
+
+    if ( stat_name == 'MEDIAN' ) :   # same as np.median : mean of the two middle values if their number is even
+
+        lower_values = sorted_values[ starts + last_values // 2 ]
+        upper_values = sorted_values[ starts + ( counts // 2 ) * ( counts > 0 ) ]
+        stat_values  = np.where(counts % 2 == 1, lower_values, ( lower_values + upper_values ) / 2)
+
+    else :                           # same as np.quantile (linear interpolation)
+
+        virtual_positions  = last_values * quantile
+        previous_positions = np.floor(virtual_positions).astype(np.int64)
+        next_positions     = np.minimum(previous_positions + 1, last_values)
+        gammas             = virtual_positions - previous_positions
+
+        previous_values = sorted_values[ starts + previous_positions ]
+        next_values     = sorted_values[ starts + next_positions ]
+        differences     = next_values - previous_values
+
+        stat_values = np.where(gammas >= 0.5, next_values - differences * (1 - gammas), previous_values + differences * gammas)
+
+    stat_values = np.where(is_empty, np.nan, stat_values)
+
+    return stat_values
+
+
+# End of function definition
+
+
+
+def Get_quantile(stat_name) :
+
+    """
+
+    Finds the quantile (from 0 to 1) corresponding to a statistic obtained from sorted data.
+
+
+    Parameters :
+
+        stat_name (string) : Name of the statistic (eg. 'Q1' or 'PERCENTILE_90').
+
+
+    Returns :
+
+        quantile (float) : Quantile of the statistic, or None if the statistic is not obtained from sorted data (eg. 'MEAN').
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    quantile = QUANTILES_OF_STATS.get(stat_name)
+
+    if ( stat_name.startswith(PERCENTILE_PREFIX) ) :
+        quantile = float( stat_name.replace(PERCENTILE_PREFIX, '') ) / 100
+
+    return quantile
+
+
+# End of function definition
+
+
+
+def Validate_stats_names(stats_names) :
+
+    """
+
+    Verifies that the names of the descriptive statistics are known (see Calculate_stats). As in the first versions of Calculate_stats, an unknown name is not calculated;
+    a warning is printed and the name is skipped.
+
+
+    Parameters :
+
+        stats_names (list) : Names of the descriptive statistics.
+
+
+    Returns :
+
+        known_stats_names (list) : Names of the known descriptive statistics, in the order of stats_names.
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    known_stats_names = []
+
+    for stat_name in stats_names :
+
+        if ( stat_name in ('MEAN', 'STANDARD_DEVIATION', 'COUNT') ) :
+
+            known_stats_names.append(stat_name)
+            continue
+
+        try :
+            quantile = Get_quantile(stat_name)
+
+        except ValueError :
+            quantile = None
+
+        if ( ( quantile is None ) or ( quantile < 0 ) or ( quantile > 1 ) ) :
+
+            print('Warning : ' + stat_name + ' is not a known descriptive statistic. It is skipped.\n')
+            continue
+
+        known_stats_names.append(stat_name)
+
+    return known_stats_names
+
+
+# End of function definition
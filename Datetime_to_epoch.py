@@ -0,0 +1,108 @@
+import numpy as np
+import pdb
+
+
+
+def datetime_to_epoch (years, months, days, hours, minutes, reference_date) :
+
+    """
+    Converts dates given by their components to epoch dates, using only integer arithmetic on arrays (no datetime object is created per date).
+
+
+    Parameters :
+
+        years (array)                    : Years of the dates (eg. 2021).
+
+        months (array)                   : Months of the dates, from 1 to 12.
+
+        days (array)                     : Days of the month of the dates, from 1 to 31.
+
+        hours (array)                    : Hours of the dates, from 0 to 23.
+
+        minutes (array)                  : Minutes of the dates, from 0 to 59.
+
+        reference_date (datetime object) : Reference date from which epoch dates are calculated.
+
+
+    Returns :
+
+        epoch_dates (array)              : Epoch dates in seconds (integers), ie time differences since reference_date.
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    # Step 1 : Count the days of the dates and of the reference date
+
+    day_numbers          = dates_to_day_numbers(years, months, days)
+    reference_day_number = dates_to_day_numbers(reference_date.year, reference_date.month, reference_date.day)
+
+
+    # Step 2 : Convert to seconds since reference_date
+
+    reference_seconds = reference_date.hour * 3600 + reference_date.minute * 60 + reference_date.second
+
+    epoch_dates       = ( day_numbers - reference_day_number ) * 86400 + np.asarray(hours, dtype=np.int64) * 3600 + np.asarray(minutes, dtype=np.int64) * 60 - reference_seconds
+    #pdb.set_trace()
+
+    return epoch_dates
+
+
+# End of function definition
+
+
+
+def dates_to_day_numbers (years, months, days) :
+
+    """
+    Counts the number of days since March 1st of year 0 (proleptic Gregorian calendar) of one or more dates.
+
+
+    Parameters :
+
+        years (array)  : Years of the dates (eg. 2021).
+
+        months (array) : Months of the dates, from 1 to 12.
+
+        days (array)   : Days of the month of the dates, from 1 to 31.
+
+
+    Returns :
+
+        day_numbers (array) : Number of days since March 1st of year 0.
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    # years are made to start in March so that the leap day is the last day of the year; each era spans 400 years (146097 days)
+
+    years  = np.asarray(years, dtype=np.int64)
+    months = np.asarray(months, dtype=np.int64)
+    days   = np.asarray(days, dtype=np.int64)
+
+    march_years = years - ( months <= 2 )
+    eras        = np.floor_divide(march_years, 400)
+    year_of_era = march_years - eras * 400
+    day_of_year = ( 153 * ( months + np.where(months > 2, -3, 9) ) + 2 ) // 5 + days - 1
+    day_of_era  = year_of_era * 365 + year_of_era // 4 - year_of_era // 100 + day_of_year
+    day_numbers = eras * 146097 + day_of_era
+
+    return day_numbers
+
+
+# End of function definition
@@ -0,0 +1,172 @@
+import sys
+import numpy as np
+import pdb
+
+
+
+DERIVED_VAR_NAMES = { 'NETRAD' : ['SW_IN', 'SW_OUT', 'LW_IN', 'LW_OUT'],   # keys are the derived variables and values are the variables they are calculated from
+                      'ALB'    : ['SW_IN', 'SW_OUT'] }
+
+
+
+def Calculate_net_radiation(sw_in, sw_out, lw_in, lw_out) :
+
+    """
+
+    Calculates the net radiation from the incoming and outgoing shortwave and longwave radiation, for every entry at once.
+
+
+    Parameters :
+
+        sw_in (array)  : Shortwave radiation, incoming.
+
+        sw_out (array) : Shortwave radiation, outgoing.
+
+        lw_in (array)  : Longwave radiation, incoming.
+
+        lw_out (array) : Longwave radiation, outgoing.
+
+
+    Returns :
+
+        net_radiation (array) : Net radiation (LW_IN - LW_OUT) + (SW_IN - SW_OUT).
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    net_radiation = ( np.asarray(lw_in, dtype=np.float64) - lw_out ) + ( np.asarray(sw_in, dtype=np.float64) - sw_out )
+
+    return net_radiation
+
+
+# End of function definition
+
+
+
+def Calculate_albedo(sw_in, sw_out, undefined_value) :
+
+    """
+
+    Calculates the albedo (from 0 to 100) from the incoming and outgoing shortwave radiation, for every entry at once. Only the Sun's radiation is considered.
+
+
+    Parameters :
+
+        sw_in (array)           : Shortwave radiation, incoming.
+
+        sw_out (array)          : Shortwave radiation, outgoing.
+
+        undefined_value (float) : Value given to the albedo when there is no incoming shortwave radiation (SW_IN of 0 or less, eg. at night), to avoid dividing by zero.
+
+
+    Returns :
+
+        albedo (array) : Albedo, (SW_OUT / SW_IN) * 100.
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    sw_in  = np.asarray(sw_in, dtype=np.float64)
+    sw_out = np.asarray(sw_out, dtype=np.float64)
+
+    is_defined = sw_in > 0
+    albedo     = np.full(sw_in.shape, undefined_value, dtype=np.float64)
+
+    np.divide(sw_out, sw_in, out=albedo, where=is_defined)
+    albedo[is_defined] = albedo[is_defined] * 100
+
+    return albedo
+
+
+# End of function definition
+
+
+
+def Add_derived_variables(data_array, var_names_list, derived_var_names_list, undefined_value) :
+
+    """
+
+    Calculates derived variables (see DERIVED_VAR_NAMES) from the columns of a data array and adds them as new columns, in a single pass over each column.
+
+
+    Parameters :
+
+        data_array (array)            : Data. Each column represents one variable. An empty array is returned as is.
+
+        var_names_list (list)         : Names of the variables of the columns of data_array (eg. ['TA', 'SW_IN', 'SW_OUT', 'LW_IN', 'LW_OUT', 'H', 'LE']).
+
+        derived_var_names_list (list) : Names of the derived variables to add, in order (eg. ['NETRAD', 'ALB']).
+
+        undefined_value (float)       : Value given to a derived variable where it is undefined (see Calculate_albedo).
+
+
+    Returns :
+
+        data_array (array) : Data, followed by one column per derived variable.
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    # Step 1 : Validate the parameters
+
+    if ( ( not derived_var_names_list ) or ( data_array.size == 0 ) ) :
+        return data_array
+
+    for derived_var_name in derived_var_names_list :
+
+        if ( derived_var_name not in DERIVED_VAR_NAMES ) :
+
+            print(derived_var_name + ' is not a derived variable. Derived variables cannot be calculated.\n')
+            sys.exit(0)
+
+        elif ( not set(DERIVED_VAR_NAMES[derived_var_name]).issubset(var_names_list) ) :
+
+            print('The variables needed to calculate ' + derived_var_name + ' are not all in the data. Derived variables cannot be calculated.\n')
+            sys.exit(0)
+
+
+    # Step 2 : Calculate the derived variables
+
+    columns         = { var_name : data_array[:, var_names_list.index(var_name)] for var_name in set(var_names_list) }
+    derived_columns = []
+
+    for derived_var_name in derived_var_names_list :
+
+        if ( derived_var_name == 'NETRAD' ) :
+            derived_columns.append( Calculate_net_radiation(columns['SW_IN'], columns['SW_OUT'], columns['LW_IN'], columns['LW_OUT']) )
+
+        elif ( derived_var_name == 'ALB' ) :
+            derived_columns.append( Calculate_albedo(columns['SW_IN'], columns['SW_OUT'], undefined_value) )
+
+    #pdb.set_trace()
+
+    data_array = np.column_stack( [ data_array ] + derived_columns )
+
+    return data_array
+
+
+# End of function definition
@@ -1,4 +1,4 @@
-import datetime
+import numpy as np
 import pdb
 
 
@@ -25,20 +25,101 @@ def epoch_to_datetime (epoch_dates, reference_date) :
 
     Created	  : July 28th, 2021
 
-    Last modified : July 28th, 2021
+    Last modified : October 18th, 2026
 
 
     """
 
 
-    datetime_dates = []
+    # the conversion is done on the whole array by epoch_to_datetime64; the dates are then turned into datetime objects
 
-    for epoch_date in epoch_dates :
+    datetime_dates = epoch_to_datetime64(epoch_dates, reference_date).tolist()
+    #pdb.set_trace()
 
-        #pdb.set_trace()
-        timedelta_date = datetime.timedelta(seconds=int(epoch_date))
-        datetime_date  = reference_date + timedelta_date
+    return datetime_dates
 
-        datetime_dates.append(datetime_date)
 
-    return datetime_dates
+
+def epoch_to_datetime64 (epoch_dates, reference_date, start_index=None, end_index=None) :
+
+    """
+    Converts epoch dates to numpy datetime64 format, for the whole array at once. Only some consecutive epoch dates can be converted, by giving start_index and end_index.
+
+
+    Parameters :
+
+        epoch_dates (array)              : Array of epoch dates in seconds. Epoch dates are assumed to be time differences since reference_date.
+
+        reference_date (datetime object) : Reference date from which epoch dates were calculated (without time zone).
+
+        start_index (int)                : Index of the first epoch date to convert. By default, conversion starts at the first epoch date.
+
+        end_index (int)                  : Index at which conversion stops (excluded), as in a slice. By default, conversion stops at the last epoch date.
+
+
+    Returns :
+
+        datetime64_dates (array)         : Dates in datetime64 format (microsecond resolution), for epoch dates start_index to end_index - 1.
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    epoch_dates = np.asarray(epoch_dates)[start_index:end_index]
+
+    # epoch dates are truncated to whole seconds, as was done with int() when converting one date at a time
+
+    epoch_timedeltas = epoch_dates.astype(np.int64).astype('timedelta64[s]')
+    datetime64_dates = np.datetime64(reference_date, 'us') + epoch_timedeltas
+
+    return datetime64_dates
+
+
+
+def epoch_to_hours_and_months (epoch_dates, reference_date) :
+
+    """
+    Finds the hour of the day and the month of epoch dates, for the whole array at once and without converting them to datetime objects.
+
+
+    Parameters :
+
+        epoch_dates (array)              : Array of epoch dates in seconds. Epoch dates are assumed to be time differences since reference_date.
+
+        reference_date (datetime object) : Reference date from which epoch dates were calculated (without time zone).
+
+
+    Returns :
+
+        hours (array)                    : Hours of the day of the dates, from 0 to 23 (eg. 4 for 04:30).
+
+        months (array)                   : Months of the dates, from 1 to 12.
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    # epoch dates are truncated to whole seconds, as in epoch_to_datetime64; reference_date might not be at midnight
+
+    epoch_seconds     = np.asarray(epoch_dates).astype(np.int64)
+    reference_seconds = reference_date.hour * 3600 + reference_date.minute * 60 + reference_date.second
+
+    hours  = ( epoch_seconds + reference_seconds ) // 3600 % 24
+    months = ( np.datetime64(reference_date, 's') + epoch_seconds.astype('timedelta64[s]') ).astype('datetime64[M]').astype(np.int64) % 12 + 1
+    #pdb.set_trace()
+
+    return hours, months
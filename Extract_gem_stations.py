@@ -0,0 +1,78 @@
+import os
+import sys
+import glob
+import pandas as pd
+import Gem_extractor as ge
+import pdb
+
+
+"""
+
+This script extracts the GEM time series of every station from the gridded GEM output, at the grid point matched to the station (see Match_stations_to_grid.py), and writes
+them as GEM station files (<station id>.txt), the files read by filter_gem_dates_and_data.py. Each time chunk of the gridded output is read once for all the stations,
+instead of once per station.
+
+
+Author        : Élise Comeau
+
+Created       : October 18th, 2026
+
+Last modified : October 18th, 2026
+
+"""
+
+
+# Step 0 : Define constants
+
+# Step 0.1 : Define directories and filenames
+
+GRID_R_DIRECTORY = '/snow/diluca/FLUXNET_America/GEM_gridded_1990-2017'                        # time chunks of the gridded GEM output (.nc, or raw .npy arrays, not both)
+MATCHES_PATHNAME = '/snow/comeau/FLUXNET_America/GEM_1990-2017/Stations_grid-points_GEM.csv'   # see Match_stations_to_grid.py
+GEM_W_DIRECTORY  = '/snow/comeau/FLUXNET_America/GEM_1990-2017/stations'                       # GEM station files (set GEM_DIRECTORY_R of filter_gem_dates_and_data.py to it)
+NETCDF_GLOB      = '/*.nc'
+RAW_DATES_GLOB   = '/*_dates.npy'
+RAW_DATES_SUFFIX = '_dates.npy'
+
+
+# Step 0.2 : Define delimiters, indexes and values
+
+DELIMITER          = ','
+MATCHES_STATION_ID = 'STATION'
+MATCHES_MATCH_ID   = 'MATCH'
+MATCHES_GRID_ID    = 'GRID_INDEX'
+VAR_NAMES          = ['TA', 'SW_IN', 'SW_OUT', 'LW_IN', 'LW_OUT', 'H', 'LE']   # variables of the GEM station files, in order
+FILE_VAR_NAMES     = ['TA', 'SW_IN', 'SW_OUT', 'LW_IN', 'LW_OUT', 'H', 'LE']   # names of the same variables in the gridded output
+NBR_OF_WORKERS     = 4                                                        # number of chunks read at the same time
+
+
+
+# Step 1 : Obtain the grid point of every station (nearest match) and the time chunks, in chronological order
+
+matches = pd.read_csv(MATCHES_PATHNAME, sep=DELIMITER)
+matches = matches[ matches[MATCHES_MATCH_ID] == 1 ]
+
+station_ids_list = matches[MATCHES_STATION_ID].astype(str).tolist()
+grid_indexes     = matches[MATCHES_GRID_ID].to_numpy()
+
+netcdf_pathnames = sorted( glob.glob(GRID_R_DIRECTORY + NETCDF_GLOB) )
+raw_pathnames    = sorted( pathname.replace(RAW_DATES_SUFFIX, '') for pathname in glob.glob(GRID_R_DIRECTORY + RAW_DATES_GLOB) )
+
+if ( netcdf_pathnames and raw_pathnames ) :   # the chunks are ordered by name, which only gives the chronological order within a single format
+
+    print('The directory ' + GRID_R_DIRECTORY + ' holds both NetCDF and raw chunks of gridded GEM output. Keep a single format; GEM station files cannot be extracted.\n')
+    sys.exit(0)
+
+chunk_pathnames = netcdf_pathnames or raw_pathnames
+
+if ( not chunk_pathnames ) :
+
+    print('No chunk of gridded GEM output was found. GEM station files cannot be extracted.\n')
+    sys.exit(0)
+#pdb.set_trace()
+
+
+
+# Step 2 : Extract the time series of all the stations
+
+gem_pathnames = ge.Extract_gem_stations(chunk_pathnames, station_ids_list, grid_indexes, FILE_VAR_NAMES, VAR_NAMES, GEM_W_DIRECTORY, DELIMITER, NBR_OF_WORKERS)
+print(str(len(gem_pathnames)) + ' GEM station files extracted from ' + str(len(chunk_pathnames)) + ' chunks')
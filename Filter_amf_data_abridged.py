@@ -1,8 +1,8 @@
 import os
-import glob
 import fluxnet_classes as fc
 import numpy as np
-import datetime
+import Filter_amf_stations as fas
+import Instrumentation as ins
 import pdb
 
 
@@ -16,7 +16,7 @@ Author        : Élise Comeau
 
 Created       : July 28th, 2021
 
-Last modified : August 5th, 2021
+Last modified : October 18th, 2026
 
 """
 
@@ -56,7 +56,6 @@ TXT_SUFFIX = '.txt'
 
 # Step 0.5 : Define special characters
 
-NEW_LINE_CHAR = '\n'
 NULL_CHAR     = ''
 READING_CHAR  = 'r'
 SLASH_BAR     = '/'
@@ -66,7 +65,6 @@ STAR          = '*'
 # Step 0.6 : Define indexes
 
 DATES_INDEX      = 0
-PATHNAME_INDEX   = 0
 STATION_ID_INDEX = 3
 VAR_NAMES_INDEX  = 3
 
@@ -74,12 +72,15 @@ VAR_NAMES_INDEX  = 3
 # Step 0.7 : Define values
 
 DATA_ID              = 'data'
-DATES_FORMAT         = '%Y%m%d%H%M'
 DATES_ID             = 'dates'
 HALF_HOURLY          = 'HH'
 HALF_TIME            = 15                                     # half of 30 minutes os 15 minutes
 MISSING_VALUE        = '-9999'                                # convention used in the AMF files
 NBR_OF_HEADER_ROWS   = 3
+CHUNK_NBR_OF_ROWS    = 100000                                 # number of lines of a csv file read at a time (about 6 years of 30 minute data)
+DERIVED_VAR_NAMES    = []                                     # derived variables saved after the variables of interest (eg. ['NETRAD', 'ALB'])
+NBR_OF_WORKERS       = 8                                      # number of stations processed at the same time
+MEMORY_BUDGET        = None                                   # memory the stations filtered at the same time may use, in MB (eg. 16000); by default, NBR_OF_WORKERS stations at a time
 SAMPLING_PERCENTAGES = ['10', '25', '50', '60', '75', '100']  # minimum sampling percentages
 STATION_NBR_STR_LEN  = 3
 T_FREQ               = 0.5                                    # in hours
@@ -128,82 +129,39 @@ for station_nbr in np.arange(1, (len(station_ids_list) + 1)) :
 
 # Step 3 : Process dates and data
 
-total_dates_list = []
-
-for station_nbr, station_id in zip(station_nbrs_list, station_ids_list) :
+# Step 3.1 : Obtain files for the dates and data of each station
 
+dates_and_data_pathname_patterns = []
+dates_pathnames                  = []
+data_pathnames                   = []
 
-    # Step 3.1 : Obtain file for the dates and data
+for station_nbr, station_id in zip(station_nbrs_list, station_ids_list) :
 
     dates_and_data_pathname_pattern = DATES_AND_DATA_R_DIRECTORY + SLASH_BAR + AMF_PREFIX + station_id + STAR + HALF_HOURLY + STAR + CSV_SUFFIX
-    dates_and_data_pathname         = glob.glob(dates_and_data_pathname_pattern)[PATHNAME_INDEX]
-    dates_and_data_file             = open(dates_and_data_pathname, READING_CHAR)
-    #pdb.set_trace()
-
-
-    # Step 3.2 : Obtain variables for the dates and data files
-
-    for line_nbr in range(0, NBR_OF_HEADER_ROWS - 1) :
-        dates_and_data_file.readline()
-
-    var_names_in_file     = dates_and_data_file.readline().split(DATES_AND_DATA_DELIMITER)
-    var_names_in_file_len = len(var_names_in_file)
-
-    var_names_in_file[ var_names_in_file_len - 1 ] = var_names_in_file[ var_names_in_file_len - 1 ].replace(NEW_LINE_CHAR, NULL_CHAR)
-    #pdb.set_trace()
-
-
-    # Step 3.3 : Extract relevant dates and data
-
-    data_list  = []
-    dates_list = []
-
-    for dates_and_data_line in dates_and_data_file :
 
-        data_line_list = []
-
-        for var_name in var_names_list :
-
-            var_index = var_names_in_file.index(var_name)
-            var_value = dates_and_data_line.split(DATES_AND_DATA_DELIMITER)[var_index].replace(NEW_LINE_CHAR, NULL_CHAR)
-
-            if ( var_value == MISSING_VALUE ) :  # if at least one value is missing ...
-                break                            # ... then the entire line is not worth keeping
-
-            else :
-                data_line_list.append( float(var_value) )
-
-        if ( len(data_line_list) == len(var_names_list) ) :  # so as to not append an incomplete list
-
-            date_string           = dates_and_data_line.split(DATES_AND_DATA_DELIMITER)[DATES_INDEX]
-            date_datetime         = datetime.datetime.strptime(date_string, DATES_FORMAT)
-            date_central_datetime = date_datetime + datetime.timedelta(minutes=HALF_TIME)
-            date_elapsed_time     = (date_central_datetime - fc.constants.reference_date).total_seconds()
-
-            dates_list.append(date_elapsed_time)
-            data_list.append(data_line_list)
-            #pdb.set_trace()
+    dates_filename = DATES_FILENAME_1 + station_nbr + STATION_IDS_DELIMITER + station_id + DATES_FILENAME_2 + var_names_string + DATES_FILENAME_3
+    dates_pathname = DATES_AND_DATA_W_DIRECTORY + SLASH_BAR + dates_filename
+    data_pathname  = dates_pathname.replace(DATES_ID, DATA_ID)
 
-    total_dates_list.append(len(dates_list))
+    dates_and_data_pathname_patterns.append(dates_and_data_pathname_pattern)
+    dates_pathnames.append(dates_pathname)
+    data_pathnames.append(data_pathname)
     #pdb.set_trace()
 
 
-    # Step 3.4 : Save relevant dates and data
+# Step 3.2 : Extract and save relevant dates and data (stations are processed in parallel, each file being read in chunks)
 
-    dates_array    = np.array(dates_list)
-    dates_filename = DATES_FILENAME_1 + station_nbr + STATION_IDS_DELIMITER + station_id + DATES_FILENAME_2 + var_names_string + DATES_FILENAME_3
-    dates_pathname = DATES_AND_DATA_W_DIRECTORY + SLASH_BAR + dates_filename
+measure = ins.Start_measure('filter')   # the time, rows and memory of each station are also logged (see Instrumentation)
 
-    np.save(dates_pathname, dates_array)
+total_dates_list = fas.Filter_amf_stations(dates_and_data_pathname_patterns, dates_pathnames, data_pathnames, var_names_list, NBR_OF_HEADER_ROWS, DATES_AND_DATA_DELIMITER, DATES_INDEX,
+                                           float(MISSING_VALUE), HALF_TIME, fc.constants.reference_date, NBR_OF_WORKERS, CHUNK_NBR_OF_ROWS,
+                                           DERIVED_VAR_NAMES, MEMORY_BUDGET)
 
-    data_array    = np.array(data_list)
-    data_pathname = dates_pathname.replace(DATES_ID, DATA_ID)
-
-    np.save(data_pathname, data_array)
-    #pdb.set_trace()
+ins.Stop_measure(measure, sum(total_dates_list))
+#pdb.set_trace()
 
 
-# Step 3.5 : Save number of years of data
+# Step 3.3 : Save number of years of data
 
 t_freq_list = [ T_FREQ ] * len(total_dates_list)
 
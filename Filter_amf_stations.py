@@ -0,0 +1,340 @@
+import os
+import glob
+import multiprocessing
+import numpy as np
+import Read_amf_data as rad
+import Instrumentation as ins
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+import pdb
+
+
+
+STATION_BASE_MEMORY = 8.      # estimated memory used by a worker whatever the file, in MB (the workers are forked, so they share the memory of the parent process)
+ARRAY_COPIES        = 3.5     # estimated copies of the columns read held at the same time (pandas chunk, float arrays, masks and filtered arrays)
+TEXT_FRACTION       = 0.2     # estimated fraction of the text of the lines read held by the csv parser
+NBR_OF_SAMPLE_LINES = 1000    # lines read to estimate the length of a line of a csv file
+VALUE_SIZE          = 8       # bytes per value (float64)
+
+
+
+def Filter_amf_station(dates_and_data_pathname_pattern, dates_pathname, data_pathname, var_names_list, nbr_of_header_rows, delimiter, dates_index, missing_value, half_time, reference_date, chunk_nbr_of_rows=None, derived_var_names_list=None) :
+
+    """
+
+    Extracts the dates and the data of the variables of interest from the AmeriFlux (AMF) csv file of one station and saves them to .npy files.
+
+
+    Parameters :
+
+        dates_and_data_pathname_pattern (string) : Glob pattern of the AMF csv file of the station. The first match is read.
+
+        dates_pathname (string)                  : Pathname of the .npy file to which the dates are saved.
+
+        data_pathname (string)                   : Pathname of the .npy file to which the data are saved.
+
+        var_names_list (list)                    : Names of the variables to extract (see Read_amf_data).
+
+        nbr_of_header_rows (int)                 : Number of header rows in the csv file.
+
+        delimiter (string)                       : Delimiter used in the csv file.
+
+        dates_index (int)                        : Index of the dates on a line of the csv file.
+
+        missing_value (float)                    : Value used in the csv file for missing data.
+
+        half_time (int)                          : Half of the temporal frequency of the data, expressed in minutes.
+
+        reference_date (datetime object)         : Reference date from which epoch dates are calculated.
+
+        chunk_nbr_of_rows (int)                  : Number of lines of the csv file read at a time (see Read_amf_data.Stream_amf_data). By default, the whole file is read at once.
+
+        derived_var_names_list (list)            : Names of derived variables (eg. ['NETRAD', 'ALB']) saved after the variables of interest (see Read_amf_data). Optional.
+
+
+    Returns :
+
+        nbr_of_entries (int) : Number of complete entries saved for the station.
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    dates_and_data_pathname = glob.glob(dates_and_data_pathname_pattern)[0]
+    measure                 = ins.Start_measure('filter', os.path.basename(dates_and_data_pathname))   # see Instrumentation (off by default)
+
+    if ( chunk_nbr_of_rows ) :   # the dates and data are written as the file is read, so that the memory used does not depend on the length of the file
+
+        nbr_of_entries = rad.Stream_amf_data(dates_and_data_pathname, dates_pathname, data_pathname, var_names_list, nbr_of_header_rows, delimiter, dates_index, missing_value,
+                                             half_time, reference_date, chunk_nbr_of_rows, derived_var_names_list)
+
+    else :
+
+
+        # Step 1 : Extract relevant dates and data
+
+        dates_array, data_array = rad.Read_amf_data(dates_and_data_pathname, var_names_list, nbr_of_header_rows, delimiter, dates_index, missing_value, half_time, reference_date,
+                                                    derived_var_names_list)
+        #pdb.set_trace()
+
+
+        # Step 2 : Save relevant dates and data
+
+        np.save(dates_pathname, dates_array)
+        np.save(data_pathname, data_array)
+
+        nbr_of_entries = dates_array.shape[0]
+
+    ins.Stop_measure(measure, nbr_of_entries)
+
+    return nbr_of_entries
+
+
+# End of function definition
+
+
+
+def Estimate_station_memory(dates_and_data_pathname, nbr_of_columns_read, nbr_of_columns_saved, nbr_of_header_rows, chunk_nbr_of_rows=None) :
+
+    """
+
+    Estimates the peak memory needed by Filter_amf_station for an AMF csv file, from the size of the file and its number of lines (itself estimated from the size of the
+    file and the length of its first lines) : the lines held at the same time (all of them, or a chunk), times the columns read and their copies, plus the text parsed and,
+    when the file is read in chunks, the .npy files being written (they are mapped to memory). STATION_BASE_MEMORY, ARRAY_COPIES and TEXT_FRACTION are estimates, chosen
+    to stay on the high side; they are not calibrated against a measurement shipped with the code. To check them on real files, run the filter with
+    --instrumentation=<pathname> and compare the estimates with the 'rss_increase_mb' of the 'filter' blocks (see Summarize_instrumentation.py).
+
+
+    Parameters :
+
+        dates_and_data_pathname (string) : Absolute pathname of the AMF csv file.
+
+        nbr_of_columns_read (int)        : Number of columns read (the dates and the variables of interest).
+
+        nbr_of_columns_saved (int)       : Number of columns saved (the dates, the variables of interest and the derived variables).
+
+        nbr_of_header_rows (int)         : Number of header rows in the csv file.
+
+        chunk_nbr_of_rows (int)          : Number of lines of the csv file read at a time. By default, the whole file is read at once.
+
+
+    Returns :
+
+        station_memory (float) : Estimated peak memory, in MB.
+
+        nbr_of_rows (int)      : Estimated number of lines of data of the file.
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    file_size = os.path.getsize(dates_and_data_pathname)
+
+    with open(dates_and_data_pathname, 'rb') as dates_and_data_file :
+
+        header_size  = sum( len(dates_and_data_file.readline()) for header_row_nbr in range(nbr_of_header_rows) )
+        sample_lines = [ line for line in ( dates_and_data_file.readline() for line_nbr in range(NBR_OF_SAMPLE_LINES) ) if line ]
+
+    line_size   = sum( len(line) for line in sample_lines ) / len(sample_lines) if ( sample_lines ) else 1
+    nbr_of_rows = int( round( ( file_size - header_size ) / line_size ) )
+
+    nbr_of_rows_held = min(nbr_of_rows, chunk_nbr_of_rows) if ( chunk_nbr_of_rows ) else nbr_of_rows
+    station_memory   = nbr_of_rows_held * ( nbr_of_columns_read * VALUE_SIZE * ARRAY_COPIES + line_size * TEXT_FRACTION )
+
+    if ( chunk_nbr_of_rows ) :
+        station_memory = station_memory + nbr_of_rows * nbr_of_columns_saved * VALUE_SIZE
+
+    station_memory = STATION_BASE_MEMORY + station_memory / 2**20
+
+    return station_memory, nbr_of_rows
+
+
+# End of function definition
+
+
+
+def Try_filter_amf_station(*station_args) :
+
+    """
+
+    Applies Filter_amf_station to one station, reporting an error instead of raising it, so that the other stations of a pool are still filtered.
+
+
+    Parameters :
+
+        See Filter_amf_station.
+
+
+    Returns :
+
+        nbr_of_entries (int) : Number of complete entries saved for the station, or None if the station could not be filtered.
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    try :
+        nbr_of_entries = Filter_amf_station(*station_args)
+
+    except ( Exception, SystemExit ) as error :   # the functions exit when their parameters are not valid
+
+        print('Station ' + os.path.basename(station_args[0]) + ' could not be filtered (' + repr(error) + '). Station is skipped.\n')
+        nbr_of_entries = None
+
+    return nbr_of_entries
+
+
+# End of function definition
+
+
+
+def Filter_amf_stations(dates_and_data_pathname_patterns, dates_pathnames, data_pathnames, var_names_list, nbr_of_header_rows, delimiter, dates_index, missing_value, half_time, reference_date, nbr_of_workers, chunk_nbr_of_rows=None, derived_var_names_list=None, memory_budget=None, skip_failed_stations=False) :
+
+    """
+
+    Applies Filter_amf_station to several stations, using a pool of processes. Stations are independent from one another, so each is handled by a single process.
+
+    If a memory budget is given, the number of stations processed at the same time is chosen from it : a station is only started if the sum of the estimated memory of the
+    stations in progress (see Estimate_station_memory) stays within the budget, the largest stations being started first. A station whose estimate exceeds the budget by
+    itself is processed alone.
+
+
+    Parameters :
+
+        dates_and_data_pathname_patterns (list) : Glob patterns of the AMF csv files, one per station.
+
+        dates_pathnames (list)                  : Pathnames of the .npy files to which the dates are saved, one per station.
+
+        data_pathnames (list)                   : Pathnames of the .npy files to which the data are saved, one per station.
+
+        nbr_of_workers (int)                    : Number of processes used. With 1, the stations are processed one after the other in the current process.
+
+        memory_budget (float)                   : Memory the stations in progress may use, in MB (eg. 16000). Optional. By default, nbr_of_workers stations are always in
+                                                  progress.
+
+        skip_failed_stations (bool)             : If True, a station that cannot be filtered is reported and skipped (see Try_filter_amf_station). Optional. By default, its
+                                                  error is raised.
+
+        The other parameters are those of Filter_amf_station and are the same for every station.
+
+
+    Returns :
+
+        total_dates_list (list) : Number of complete entries of each station, in the same order as the stations were given (None for the stations skipped).
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    # Step 1 : Prepare the parameters of each station
+
+    nbr_of_stations = len(dates_and_data_pathname_patterns)
+
+    stations_args = [ dates_and_data_pathname_patterns, dates_pathnames, data_pathnames ]
+    common_args   = [ var_names_list, nbr_of_header_rows, delimiter, dates_index, missing_value, half_time, reference_date, chunk_nbr_of_rows, derived_var_names_list ]
+    common_args   = [ [ common_arg ] * nbr_of_stations for common_arg in common_args ]
+
+    filter_function = ( Try_filter_amf_station if skip_failed_stations else Filter_amf_station )
+
+
+    # Step 2 : Process the stations
+
+    if ( nbr_of_workers <= 1 ) :
+
+        total_dates_list = list( map(filter_function, *stations_args, *common_args) )
+
+    else :
+
+        # the scripts calling this function are not protected by a main guard, so the processes are forked (they must not import the calling script again)
+
+        with ProcessPoolExecutor(max_workers=nbr_of_workers, mp_context=multiprocessing.get_context('fork')) as executor :
+
+            if ( memory_budget is None ) :
+
+                total_dates_list = list( executor.map(filter_function, *stations_args, *common_args) )   # map returns the results in the order of the stations
+
+            else :
+
+
+                # Step 2.1 : Estimate the memory of each station
+
+                nbr_of_columns_read  = 1 + len(var_names_list)
+                nbr_of_columns_saved = nbr_of_columns_read + len(derived_var_names_list or [])
+
+                dates_and_data_pathnames = [ glob.glob(dates_and_data_pathname_pattern)[0] for dates_and_data_pathname_pattern in dates_and_data_pathname_patterns ]
+
+                stations_memory = [ Estimate_station_memory(dates_and_data_pathname, nbr_of_columns_read, nbr_of_columns_saved, nbr_of_header_rows, chunk_nbr_of_rows)[0]
+                                    for dates_and_data_pathname in dates_and_data_pathnames ]
+
+                for dates_and_data_pathname, station_memory in zip(dates_and_data_pathnames, stations_memory) :
+
+                    if ( station_memory > memory_budget ) :
+                        print('Station ' + os.path.basename(dates_and_data_pathname) + ' needs about ' + str(int(station_memory)) + ' MB, more than the memory budget. '
+                              + 'It is processed alone.\n')
+
+
+                # Step 2.2 : Start the stations, largest first, as long as the memory of the stations in progress stays within the budget
+
+                stations_to_start  = sorted(range(nbr_of_stations), key=lambda station_index : stations_memory[station_index], reverse=True)
+                stations_running   = {}   # keys are the futures of the stations in progress and values are their indexes
+                total_dates_list   = [ None ] * nbr_of_stations
+                max_nbr_of_running = 0
+
+                while ( stations_to_start or stations_running ) :
+
+                    memory_in_use = sum( stations_memory[station_index] for station_index in stations_running.values() )
+
+                    for station_index in list(stations_to_start) :
+
+                        station_fits = ( memory_in_use + stations_memory[station_index] <= memory_budget ) or ( not stations_running )   # a station larger than the budget is processed alone
+
+                        if ( ( len(stations_running) < nbr_of_workers ) and ( station_fits ) ) :
+
+                            station_args = [ station_arg[station_index] for station_arg in stations_args + common_args ]
+
+                            stations_running.update( { executor.submit(filter_function, *station_args) : station_index } )
+                            stations_to_start.remove(station_index)
+                            memory_in_use = memory_in_use + stations_memory[station_index]
+
+                    max_nbr_of_running = max(max_nbr_of_running, len(stations_running))
+
+                    done_stations, pending_stations = wait(list(stations_running), return_when=FIRST_COMPLETED)
+
+                    for done_station in done_stations :
+                        total_dates_list[stations_running.pop(done_station)] = done_station.result()
+
+                print('Memory budget of ' + str(memory_budget) + ' MB : up to ' + str(max_nbr_of_running) + ' stations filtered at the same time')
+
+    #pdb.set_trace()
+
+    return total_dates_list
+
+
+# End of function definition
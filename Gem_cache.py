@@ -0,0 +1,248 @@
+import os
+import glob
+import hashlib
+import numpy as np
+import pandas as pd
+import Match_gem_dates as mgd
+import pdb
+
+
+
+def Load_gem_file(gem_pathname, nbr_of_header_rows, delimiter, date_index, reference_date, cache_directory, load_data=True) :
+
+    """
+
+    Loads the dates and the data of a GEM station file. The first time a file is loaded, its content is parsed and saved to .npy files in cache_directory. Afterwards, the
+    arrays are read from the cache (memory-mapped) so the text file is not parsed again. A cache entry is only used if the GEM file still has the same pathname, size and
+    modification time as when the entry was made; the entries of the older versions of the file are removed when a new one is made. The dates and the data are cached
+    separately, so a caller needing only the dates never parses the variables.
+
+
+    Parameters :
+
+        gem_pathname (string)            : Absolute pathname of the GEM station file.
+
+        nbr_of_header_rows (int)         : Number of header rows in the GEM file.
+
+        delimiter (string)               : Delimiter used in the GEM file to seperate the variables on a line.
+
+        date_index (int)                 : Index of the dates (%Y%m%d%H format) on a line of the GEM file.
+
+        reference_date (datetime object) : Reference date from which epoch dates are calculated.
+
+        cache_directory (string)         : Directory in which the cached arrays are saved. It is created if needed.
+
+        load_data (bool)                 : If False, only the dates are loaded (and parsed, if they are not in the cache). Optional. By default, the data are loaded too.
+
+
+    Returns :
+
+        gem_dates_utc (array) : Epoch dates, in seconds (integers), of the GEM file, in UTC. Memory-mapped, read only.
+
+        gem_data (array)      : Values of the other columns of the GEM file (ie, the variables). Each column represents one variable, in the order of the file. Memory-mapped,
+                                read only. None if load_data is False.
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    # Step 1 : Find the cache entry of the GEM file
+
+    gem_file_stat = os.stat(gem_pathname)
+    cache_key     = '|'.join( [ os.path.abspath(gem_pathname), str(gem_file_stat.st_size), str(gem_file_stat.st_mtime_ns), reference_date.isoformat(), str(nbr_of_header_rows), delimiter, str(date_index) ] )
+    cache_digest  = hashlib.sha1(cache_key.encode()).hexdigest()[:16]
+
+    station_filename_prefix = os.path.splitext(os.path.basename(gem_pathname))[0]
+    cache_filename_prefix   = station_filename_prefix + '_' + cache_digest
+    dates_cache_pathname    = os.path.join(cache_directory, cache_filename_prefix + '_dates.npy')
+    data_cache_pathname     = os.path.join(cache_directory, cache_filename_prefix + '_data.npy')
+    #pdb.set_trace()
+
+
+    # Step 2 : Parse the GEM file and save it to the cache (only the arrays requested that are not in the cache yet)
+
+    cache_arrays = {}   # keys are the pathnames of the cache files to write and values are their arrays
+
+    if ( ( load_data ) and ( not os.path.exists(data_cache_pathname) ) ) :   # the dates come with the data, in the same pass over the file
+
+        gem_dates_utc, gem_data = Read_gem_file(gem_pathname, nbr_of_header_rows, delimiter, date_index, reference_date)
+        cache_arrays.update( { data_cache_pathname : gem_data, dates_cache_pathname : gem_dates_utc } )
+
+    elif ( not os.path.exists(dates_cache_pathname) ) :
+        cache_arrays.update( { dates_cache_pathname : Read_gem_dates(gem_pathname, nbr_of_header_rows, delimiter, date_index, reference_date) } )
+
+    if ( cache_arrays ) :
+
+        os.makedirs(cache_directory, exist_ok=True)
+
+        # the arrays are first written to temporary files, then renamed, so a station read at the same time by another process never sees an incomplete file
+
+        for cache_pathname, cache_array in cache_arrays.items() :
+
+            temporary_pathname = cache_pathname + '.' + str(os.getpid()) + '.tmp'
+
+            with open(temporary_pathname, 'wb') as temporary_file :
+                np.save(temporary_file, cache_array)
+
+            os.replace(temporary_pathname, cache_pathname)
+
+
+        # Step 2.1 : Remove the entries of the older versions of the GEM file (a file still memory-mapped by another process stays readable until it is closed)
+
+        for old_cache_pathname in glob.glob( os.path.join(cache_directory, station_filename_prefix + '_' + '[0-9a-f]' * len(cache_digest) + '_*.npy') ) :
+
+            if ( not os.path.basename(old_cache_pathname).startswith(cache_filename_prefix) ) :
+
+                try :
+                    os.remove(old_cache_pathname)
+
+                except FileNotFoundError :   # removed by another process in the meantime
+                    pass
+
+
+    # Step 3 : Read the arrays from the cache
+
+    gem_dates_utc = np.load(dates_cache_pathname, mmap_mode='r')
+    gem_data      = ( np.load(data_cache_pathname, mmap_mode='r') if load_data else None )
+
+    return gem_dates_utc, gem_data
+
+
+# End of function definition
+
+
+
+def Read_gem_file(gem_pathname, nbr_of_header_rows, delimiter, date_index, reference_date) :
+
+    """
+
+    Reads the dates and the data of a GEM station file, in a single pass over the file.
+
+
+    Parameters :
+
+        See Load_gem_file.
+
+
+    Returns :
+
+        gem_dates_utc (array) : Epoch dates, in seconds (integers), of the GEM file, in UTC.
+
+        gem_data (array)      : Values of the other columns of the GEM file. Each column represents one variable, in the order of the file.
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    gem_columns = pd.read_csv(gem_pathname, sep=delimiter, header=None, skiprows=nbr_of_header_rows, dtype={date_index : np.int64}, float_precision='round_trip')
+
+    gem_dates_utc = mgd.Convert_gem_dates(gem_columns[date_index].to_numpy(), reference_date)
+    gem_data      = gem_columns.drop(columns=date_index).to_numpy(dtype=np.float64)
+    #pdb.set_trace()
+
+    return gem_dates_utc, gem_data
+
+
+# End of function definition
+
+
+
+def Read_gem_dates(gem_pathname, nbr_of_header_rows, delimiter, date_index, reference_date) :
+
+    """
+
+    Reads the dates of a GEM station file. Only the date column is parsed.
+
+
+    Parameters :
+
+        See Load_gem_file.
+
+
+    Returns :
+
+        gem_dates_utc (array) : Epoch dates, in seconds (integers), of the GEM file, in UTC.
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    gem_date_column = pd.read_csv(gem_pathname, sep=delimiter, header=None, skiprows=nbr_of_header_rows, usecols=[date_index], dtype={date_index : np.int64})
+
+    gem_dates_utc = mgd.Convert_gem_dates(gem_date_column[date_index].to_numpy(), reference_date)
+
+    return gem_dates_utc
+
+
+# End of function definition
+
+
+
+def Read_gem_var_names(gem_pathname, delimiter, date_index, default_var_names=None) :
+
+    """
+
+    Reads the names of the variables of a GEM station file from its first header row (eg. 'DATE,TA,SW_IN,...', see Gem_extractor.Extract_gem_stations). The GEM files
+    produced elsewhere may not name their variables on that row; default_var_names is then returned.
+
+
+    Parameters :
+
+        gem_pathname (string)     : Absolute pathname of the GEM station file.
+
+        delimiter (string)        : Delimiter used in the GEM file to seperate the variables on a line.
+
+        date_index (int)          : Index of the dates on a line of the GEM file.
+
+        default_var_names (list)  : Names of the variables of the GEM files whose header row does not name any of them, in the order of their columns (after the date).
+                                    Optional.
+
+
+    Returns :
+
+        gem_var_names (list) : Names of the variables, in the order of the columns of the data returned by Load_gem_file (ie, the date column is left out).
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    with open(gem_pathname) as gem_file :
+        column_names = [ column_name.strip() for column_name in gem_file.readline().replace('\n', '').split(delimiter) ]
+
+    gem_var_names = column_names[:date_index] + column_names[date_index + 1:]
+
+    if ( ( default_var_names ) and ( not set(gem_var_names) & set(default_var_names) ) ) :   # eg. the header row holds the units or the grid point
+        gem_var_names = list(default_var_names)
+
+    return gem_var_names
+
+
+# End of function definition
@@ -0,0 +1,179 @@
+import os
+import collections
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+import pdb
+
+
+
+NETCDF_SUFFIX = '.nc'      # other chunks are raw arrays (see Read_grid_chunk)
+DATES_ID      = 'dates'
+TIME_VAR_NAME = 'time'     # time variable of the NetCDF files
+
+
+
+def Read_grid_chunk(chunk_pathname, file_var_names_list, grid_indexes) :
+
+    """
+
+    Reads one time chunk of the gridded GEM output and gathers the values of the grid points of all the stations at once (the chunk is read a single time, whatever the
+    number of stations).
+
+    A chunk is either a NetCDF file (.nc, read with netCDF4) or a set of raw .npy arrays sharing a prefix : <prefix>_dates.npy, with the dates as integers in the %Y%m%d%H
+    format, and <prefix>_<variable>.npy for each variable. In both cases, every variable has the time as first dimension, followed by the dimensions of the grid.
+
+
+    Parameters :
+
+        chunk_pathname (string)    : Absolute pathname of the NetCDF file, or prefix of the raw arrays (eg. '/.../GEM_199001').
+
+        file_var_names_list (list) : Names of the variables in the chunk, in the order of the columns to extract.
+
+        grid_indexes (array)       : Flat index, in the grid, of the grid point of each station (see Grid_matcher.Match_to_grid).
+
+
+    Returns :
+
+        gem_date_ints (array) : Dates of the chunk, as integers in the %Y%m%d%H format, in UTC.
+
+        station_data (array)  : Values of the variables at the grid points, of shape (number of dates, number of stations, number of variables).
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    if ( chunk_pathname.endswith(NETCDF_SUFFIX) ) :
+
+        import netCDF4   # only needed for NetCDF chunks
+
+        with netCDF4.Dataset(chunk_pathname) as chunk :
+
+            time_var      = chunk.variables[TIME_VAR_NAME]
+            gem_datetimes = netCDF4.num2date(time_var[:], time_var.units, getattr(time_var, 'calendar', 'standard'), only_use_cftime_datetimes=False)
+            gem_date_ints = np.array( [ int( gem_datetime.strftime('%Y%m%d%H') ) for gem_datetime in gem_datetimes ], dtype=np.int64 )
+
+            var_arrays = [ np.asarray(chunk.variables[file_var_name][:]) for file_var_name in file_var_names_list ]
+
+    else :
+
+        gem_date_ints = np.load(chunk_pathname + '_' + DATES_ID + '.npy').astype(np.int64)
+        var_arrays    = [ np.load(chunk_pathname + '_' + file_var_name + '.npy', mmap_mode='r') for file_var_name in file_var_names_list ]
+
+    station_data = np.stack( [ np.reshape(var_array, (var_array.shape[0], -1))[:, grid_indexes] for var_array in var_arrays ], axis=-1 )
+    #pdb.set_trace()
+
+    return gem_date_ints, station_data
+
+
+# End of function definition
+
+
+
+def Extract_gem_stations(chunk_pathnames, station_ids_list, grid_indexes, file_var_names_list, var_names_list, gem_directory, delimiter, nbr_of_workers) :
+
+    """
+
+    Extracts the time series of every station from the gridded GEM output and writes them as GEM station files (<station id>.txt : two header rows, then one line per date
+    with the date in the %Y%m%d%H format followed by the variables), the format read by filter_gem_dates_and_data.py. Each chunk is read once for all the stations; the
+    chunks are read by a pool of threads while the values of the previous chunks are written. The station files are replaced only once every chunk has been written.
+
+
+    Parameters :
+
+        chunk_pathnames (list)     : Pathnames of the time chunks (see Read_grid_chunk), in chronological order.
+
+        station_ids_list (list)    : Ids of the stations (eg. ['CA-Oas', 'US-Ha1']).
+
+        grid_indexes (array)       : Flat index, in the grid, of the grid point of each station.
+
+        file_var_names_list (list) : Names of the variables in the chunks.
+
+        var_names_list (list)      : Names of the variables written in the header of the station files (eg. ['TA', 'SW_IN', ...]), in the same order.
+
+        gem_directory (string)     : Directory in which the station files are written. It is created if needed.
+
+        delimiter (string)         : Delimiter between the values of a line.
+
+        nbr_of_workers (int)       : Number of chunks read at the same time.
+
+
+    Returns :
+
+        gem_pathnames (list) : Pathnames of the station files, in the order of station_ids_list.
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    # Step 1 : Open a temporary file for each station and write its header (names of the columns, then the station and its grid point)
+
+    os.makedirs(gem_directory, exist_ok=True)
+
+    grid_indexes        = np.asarray(grid_indexes, dtype=np.int64)
+    gem_pathnames       = [ os.path.join(gem_directory, station_id + '.txt') for station_id in station_ids_list ]
+    temporary_pathnames = [ gem_pathname + '.' + str(os.getpid()) + '.tmp' for gem_pathname in gem_pathnames ]
+
+    values_format = delimiter.join( [ '%d' ] + [ '%.9g' ] * len(var_names_list) )   # dates as integers (%Y%m%d%H), then the variables
+    station_files = [ open(temporary_pathname, 'w') for temporary_pathname in temporary_pathnames ]
+
+    try :
+
+        for station_file, station_id, grid_index in zip(station_files, station_ids_list, grid_indexes) :
+            station_file.write( delimiter.join( [ 'DATE' ] + list(var_names_list) ) + '\n' + station_id + delimiter + str(grid_index) + '\n' )
+
+
+        # Step 2 : Read the chunks in parallel (a few chunks ahead at most, to bound memory) and append their values to the station files in chronological order
+
+        with ThreadPoolExecutor(max_workers=nbr_of_workers) as executor :
+
+            pending_reads = collections.deque()
+
+            for chunk_pathname in chunk_pathnames + [ None ] * ( nbr_of_workers + 1 ) :
+
+                if ( chunk_pathname is not None ) :
+                    pending_reads.append( executor.submit(Read_grid_chunk, chunk_pathname, file_var_names_list, grid_indexes) )
+
+                if ( ( len(pending_reads) > nbr_of_workers ) or ( ( chunk_pathname is None ) and pending_reads ) ) :
+
+                    gem_date_ints, station_data = pending_reads.popleft().result()
+
+                    for station_nbr, station_file in enumerate(station_files) :
+                        np.savetxt(station_file, np.column_stack( ( gem_date_ints, station_data[:, station_nbr, :] ) ), fmt=values_format)
+                    #pdb.set_trace()
+
+    except BaseException :   # no partial station file is left behind
+
+        for station_file, temporary_pathname in zip(station_files, temporary_pathnames) :
+
+            station_file.close()
+            os.remove(temporary_pathname)
+
+        raise
+
+    for station_file in station_files :
+        station_file.close()
+
+
+    # Step 3 : Replace the station files
+
+    for temporary_pathname, gem_pathname in zip(temporary_pathnames, gem_pathnames) :
+        os.replace(temporary_pathname, gem_pathname)
+
+    return gem_pathnames
+
+
+# End of function definition
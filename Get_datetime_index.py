@@ -50,3 +50,52 @@ def Get_datetime_index(datetime_array, specific_datetime) :
     datetime_index   = int( datetime_indexes[0][0] )
 
     return datetime_index
+
+
+
+def Get_epoch_index(epoch_array, specific_epochs) :
+
+    """
+    Finds the index of the epoch date closest to one or more specific epoch dates, using a binary search. The result is the same as that of Get_datetime_index : when two
+    dates are equally close, the earlier one is chosen, and when a date is repeated, its first index is returned.
+
+
+    Parameters :
+
+        epoch_array (array)     : One dimensional array of epoch dates (eg. in seconds), sorted in chronological order.
+
+        specific_epochs (float) : Specific epoch date which must be matched as closely as possible. An array of epoch dates can also be given, to find all their indexes at once.
+
+
+    Returns :
+
+        epoch_index (int) : Index of the epoch date closest to specific_epochs. If specific_epochs is an array, an array of indexes (one per specific epoch date) is returned.
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+    """
+
+    epoch_array     = np.asarray(epoch_array)
+    specific_epochs = np.asarray(specific_epochs)
+
+    last_index = epoch_array.shape[0] - 1
+
+    # the closest date is either the first date that is not earlier than the specific date, or the date just before it
+
+    later_indexes   = np.minimum( np.searchsorted(epoch_array, specific_epochs, side='left'), last_index )
+    earlier_indexes = np.maximum( later_indexes - 1, 0 )
+
+    is_earlier_closer = ( np.abs(specific_epochs - epoch_array[earlier_indexes]) <= np.abs(epoch_array[later_indexes] - specific_epochs) )
+    closest_epochs    = np.where(is_earlier_closer, epoch_array[earlier_indexes], epoch_array[later_indexes])
+
+    epoch_indexes = np.searchsorted(epoch_array, closest_epochs, side='left')   # first index of the closest date, in case it is repeated
+
+    if ( epoch_indexes.ndim == 0 ) :
+        return int(epoch_indexes)
+
+    return epoch_indexes
@@ -0,0 +1,207 @@
+import sys
+import numpy as np
+from scipy.spatial import cKDTree
+import pdb
+
+
+
+EARTH_RADIUS         = 6371.   # in km
+CANDIDATES_PER_MATCH = 8       # grid points first queried per nearest point requested when some points can be rejected (eg. elevation too different)
+
+
+
+def Latlon_to_unit_vectors(lats, lons) :
+
+    """
+
+    Converts latitudes and longitudes to points on the unit sphere (x, y, z). The straight-line distance between two such points only depends on the great-circle distance
+    between the locations, so nearest neighbours are found without the distortion of a (rotated) latitude-longitude grid.
+
+
+    Parameters :
+
+        lats (array) : Latitudes, in degrees.
+
+        lons (array) : Longitudes, in degrees (from -180 to 180 or from 0 to 360).
+
+
+    Returns :
+
+        unit_vectors (array) : Points on the unit sphere, one row (x, y, z) per location.
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    lats = np.radians( np.asarray(lats, dtype=np.float64).ravel() )
+    lons = np.radians( np.asarray(lons, dtype=np.float64).ravel() )
+
+    unit_vectors = np.column_stack( ( np.cos(lats) * np.cos(lons), np.cos(lats) * np.sin(lons), np.sin(lats) ) )
+
+    return unit_vectors
+
+
+# End of function definition
+
+
+
+def Build_grid_tree(grid_lats, grid_lons, grid_mask=None) :
+
+    """
+
+    Builds a KD-tree over the points of a model grid, to match any number of locations to their nearest grid points (see Match_to_grid).
+
+
+    Parameters :
+
+        grid_lats (array) : Latitude, in degrees, of every grid point (eg. a two dimensional array for a rotated latitude-longitude grid).
+
+        grid_lons (array) : Longitude, in degrees, of every grid point. Same shape as grid_lats.
+
+        grid_mask (array) : True for the grid points that can be matched (eg. land fraction of at least 0.5). By default, every grid point can be matched.
+
+
+    Returns :
+
+        grid_tree (dict) : Keys are 'tree' (KD-tree of the grid points that can be matched), 'grid_indexes' (flat index, in the grid, of each point of the tree) and
+                           'grid_shape' (shape of the grid).
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    grid_shape   = np.shape(grid_lats)
+    grid_indexes = np.arange( int( np.prod(grid_shape) ) )
+
+    if ( grid_mask is not None ) :
+        grid_indexes = grid_indexes[ np.asarray(grid_mask, dtype=bool).ravel() ]
+
+    if ( grid_indexes.shape[0] == 0 ) :
+
+        print('No grid point can be matched. Grid tree cannot be built.\n')
+        sys.exit(0)
+
+    unit_vectors = Latlon_to_unit_vectors(np.ravel(grid_lats)[grid_indexes], np.ravel(grid_lons)[grid_indexes])
+
+    grid_tree = { 'tree' : cKDTree(unit_vectors), 'grid_indexes' : grid_indexes, 'grid_shape' : grid_shape }
+
+    return grid_tree
+
+
+# End of function definition
+
+
+
+def Match_to_grid(grid_tree, lats, lons, nbr_of_matches=1, elevations=None, grid_elevations=None, max_elevation_difference=None) :
+
+    """
+
+    Finds the nearest grid points of every location (eg. every station), in a single query of the KD-tree for all the locations.
+
+
+    Parameters :
+
+        grid_tree (dict)                 : KD-tree of the grid (see Build_grid_tree).
+
+        lats (array)                     : Latitudes of the locations, in degrees.
+
+        lons (array)                     : Longitudes of the locations, in degrees.
+
+        nbr_of_matches (int)             : Number of nearest grid points found for each location.
+
+        elevations (array)               : Elevations of the locations, in m. Only needed with max_elevation_difference.
+
+        grid_elevations (array)          : Elevation of every grid point, in m (same shape as the grid). Only needed with max_elevation_difference.
+
+        max_elevation_difference (float) : If given, grid points whose elevation differs from that of the location by more than this value (in m) are not matched. More
+                                           grid points are queried until enough of them are matched (or the whole grid has been queried).
+
+
+    Returns :
+
+        grid_indexes (array) : Flat index, in the grid, of the nearest grid points, of shape (number of locations, nbr_of_matches), from the nearest to the farthest.
+                               Use np.unravel_index with the grid shape to obtain the grid indexes. -1 where fewer grid points could be matched.
+
+        distances (array)    : Great-circle distances, in km, between the locations and their matched grid points (inf where no grid point was matched).
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    # Step 1 : Query the nearest grid points of all the locations at once
+
+    unit_vectors  = Latlon_to_unit_vectors(lats, lons)
+    nbr_of_points = grid_tree['grid_indexes'].shape[0]
+
+    chord_lengths = np.full( (unit_vectors.shape[0], nbr_of_matches), np.inf )
+    grid_indexes  = np.full( (unit_vectors.shape[0], nbr_of_matches), -1 )
+
+    nbr_of_queried    = nbr_of_matches if ( max_elevation_difference is None ) else nbr_of_matches * CANDIDATES_PER_MATCH
+    pending_locations = np.arange(unit_vectors.shape[0])
+
+    while ( pending_locations.shape[0] > 0 ) :
+
+        nbr_of_queried = min(nbr_of_queried, nbr_of_points)
+
+        queried_chord_lengths, tree_indexes = grid_tree['tree'].query(unit_vectors[pending_locations], k=nbr_of_queried)
+
+        queried_chord_lengths = np.reshape(queried_chord_lengths, (pending_locations.shape[0], nbr_of_queried))
+        queried_grid_indexes  = grid_tree['grid_indexes'][ np.reshape(tree_indexes, (pending_locations.shape[0], nbr_of_queried)) ]
+        #pdb.set_trace()
+
+
+        # Step 2 : Reject the grid points whose elevation is too different and keep the nearest remaining ones
+
+        if ( max_elevation_difference is not None ) :
+
+            elevation_differences = np.abs( np.ravel(grid_elevations)[queried_grid_indexes] - np.reshape(elevations, (-1, 1))[pending_locations] )
+            is_rejected           = ~( elevation_differences <= max_elevation_difference )
+
+            queried_chord_lengths = np.where(is_rejected, np.inf, queried_chord_lengths)
+            kept_order            = np.argsort(queried_chord_lengths, axis=1, kind='stable')
+            queried_chord_lengths = np.take_along_axis(queried_chord_lengths, kept_order, axis=1)
+            queried_grid_indexes  = np.take_along_axis(queried_grid_indexes, kept_order, axis=1)
+
+        nbr_of_kept = min(nbr_of_matches, nbr_of_queried)
+
+        chord_lengths[pending_locations, :nbr_of_kept] = queried_chord_lengths[:, :nbr_of_kept]
+        grid_indexes[pending_locations, :nbr_of_kept]  = np.where(np.isinf(queried_chord_lengths[:, :nbr_of_kept]), -1, queried_grid_indexes[:, :nbr_of_kept])
+
+
+        # Step 2.1 : Query more grid points for the locations which do not have enough matches yet, until the whole grid has been queried
+
+        is_resolved       = ( nbr_of_queried == nbr_of_points ) | np.all(np.isfinite(chord_lengths[pending_locations]), axis=1)
+        pending_locations = pending_locations[~is_resolved]
+        nbr_of_queried    = nbr_of_queried * 2
+
+
+    # Step 3 : Convert the straight-line distances on the unit sphere to great-circle distances
+
+    with np.errstate(invalid='ignore') :
+        distances = np.where(np.isinf(chord_lengths), np.inf, 2 * EARTH_RADIUS * np.arcsin( np.minimum(chord_lengths / 2, 1.) ))
+
+    return grid_indexes, distances
+
+
+# End of function definition
@@ -0,0 +1,185 @@
+import os
+import numpy as np
+import Calculate_stats as cs
+import Epoch_to_datetime as etd
+import pdb
+
+
+
+GROUPINGS        = ['HOUR', 'MONTH']   # groupings of the dates : hour of the day (from 0 to 23) or month (from 1 to 12)
+GROUP_KEY_FACTOR = 100                 # the group key of an entry is station index * GROUP_KEY_FACTOR + hour or month
+
+
+
+def Calculate_network_grouped_stats(stats_names, dates_list, data_list, reference_date, grouping) :
+
+    """
+
+    Calculates descriptive statistics (eg. quartiles) of every variable of every station, separately for each hour of the day or each month. The hours and months are
+    obtained from the epoch dates of all the stations at once, and the data of all the stations are reduced together (see Calculate_stats.Calculate_grouped_stats), so
+    that the values are sorted a single time for the whole network. Missing data (NaN) are ignored.
+
+
+    Parameters :
+
+        stats_names (list)               : Names of the descriptive statistics (see Calculate_stats.Calculate_stats), eg. ['COUNT', 'Q1', 'MEDIAN', 'Q3'].
+
+        dates_list (list)                : Epoch dates, in seconds (arrays), of each station (eg. the central dates of the 3 hour means, in local time).
+
+        data_list (list)                 : Data (arrays) of each station. Each column represents one variable; all stations must have the same variables.
+
+        reference_date (datetime object) : Reference date from which epoch dates were calculated.
+
+        grouping (string)                : 'HOUR' to group the data by hour of the day or 'MONTH' to group them by month (see GROUPINGS).
+
+
+    Returns :
+
+        station_indexes (array) : Index of the station (in dates_list) of each group.
+
+        group_values (array)    : Hour of the day or month of each group. Groups are sorted by station, then by hour or month; only groups with entries are present.
+
+        stats_values (array)    : Value of the descriptive statistics, of shape (number of statistics, number of groups, number of variables).
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    # Step 1 : Find the hour of the day or the month of every entry of every station
+
+    nbr_of_vars = max( [ np.shape(data)[1] for data in data_list if np.ndim(data) == 2 ] + [ 0 ] )
+
+    group_keys_list = []
+
+    for station_index, dates in enumerate(dates_list) :
+
+        hours, months = etd.epoch_to_hours_and_months(dates, reference_date)
+        time_keys     = hours if ( grouping == 'HOUR' ) else months
+
+        group_keys_list.append( station_index * GROUP_KEY_FACTOR + time_keys )
+
+    group_keys = np.concatenate(group_keys_list + [ np.array([], dtype=np.int64) ])
+    data       = np.concatenate( [ np.reshape(data, (-1, nbr_of_vars)) for data in data_list ] + [ np.empty( (0, nbr_of_vars) ) ] )
+    #pdb.set_trace()
+
+
+    # Step 2 : Calculate the statistics of every station, variable and group in a single reduction
+
+    groups, stats_values = cs.Calculate_grouped_stats(stats_names, data, group_keys, ignore_nan=True)
+
+    station_indexes = groups // GROUP_KEY_FACTOR
+    group_values    = groups % GROUP_KEY_FACTOR
+
+    return station_indexes, group_values, stats_values
+
+
+# End of function definition
+
+
+
+def Make_grouped_stats_lines(source, grouping, station_ids_list, var_names_list, station_indexes, group_values, stats_values, delimiter) :
+
+    """
+
+    Writes the grouped statistics of a source of data as lines of a table, one line per station, variable and group (see Save_grouped_stats_table).
+
+
+    Parameters :
+
+        source (string)         : Source of the data (eg. 'AMF' or 'GEM').
+
+        grouping (string)       : Grouping of the statistics ('HOUR' or 'MONTH').
+
+        station_ids_list (list) : Ids of the stations, in the order of the station indexes (eg. ['CA-Oas', 'US-Ha1']).
+
+        var_names_list (list)   : Names of the variables, in the order of the columns of the data.
+
+        station_indexes (array) : Index of the station of each group (see Calculate_network_grouped_stats).
+
+        group_values (array)    : Hour of the day or month of each group.
+
+        stats_values (array)    : Value of the descriptive statistics, of shape (number of statistics, number of groups, number of variables).
+
+        delimiter (string)      : Delimiter between the values of a line.
+
+
+    Returns :
+
+        lines_list (list) : Lines of the table (without line breaks), grouped by station and variable.
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    lines_list = []
+
+    for var_index, var_name in enumerate(var_names_list) :
+
+        for group_index, ( station_index, group_value ) in enumerate( zip(station_indexes, group_values) ) :
+
+            values_strings = [ '{:.6g}'.format(stat_value) for stat_value in stats_values[:, group_index, var_index] ]
+            lines_list.append( delimiter.join( [ station_ids_list[station_index], source, var_name, grouping, str(group_value) ] + values_strings ) )
+
+    lines_list.sort( key=lambda line : line.split(delimiter, 3)[:3] )   # the sort is stable, so the groups of a station stay in order
+
+    return lines_list
+
+
+# End of function definition
+
+
+
+def Save_grouped_stats_table(table_pathname, stats_names, lines_list, delimiter) :
+
+    """
+
+    Saves the grouped statistics of all the stations to a single table (csv). The file is replaced in a single operation, so that an interrupted run never leaves a
+    partial table.
+
+
+    Parameters :
+
+        table_pathname (string) : Absolute pathname of the table.
+
+        stats_names (list)      : Names of the descriptive statistics, in the order of the values of the lines.
+
+        lines_list (list)       : Lines of the table (see Make_grouped_stats_lines).
+
+        delimiter (string)      : Delimiter between the values of a line.
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    header = delimiter.join( [ 'STATION', 'SOURCE', 'VARIABLE', 'GROUPING', 'GROUP' ] + list(stats_names) )
+
+    temporary_pathname = table_pathname + '.' + str(os.getpid()) + '.tmp'
+
+    with open(temporary_pathname, 'w') as table_file :
+        table_file.write( '\n'.join( [ header ] + lines_list ) + '\n' )
+
+    os.replace(temporary_pathname, table_pathname)
+
+
+# End of function definition
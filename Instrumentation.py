@@ -0,0 +1,458 @@
+import os
+import sys
+import json
+import time
+import datetime
+import cProfile
+import threading
+import contextlib
+import tracemalloc
+import pdb
+
+
+
+LOG_ENV_VAR           = 'FLUXNET_INSTRUMENTATION'   # pathname of the JSON lines file the measurements are appended to
+PROFILE_ENV_VAR       = 'FLUXNET_PROFILE'           # directory in which the cProfile files are saved
+TRACEMALLOC_ENV_VAR   = 'FLUXNET_TRACEMALLOC'       # any value but '' or '0' traces the memory allocated by Python (slower; the resident memory is always sampled)
+RUN_ID_ENV_VAR        = 'FLUXNET_RUN_ID'            # id of the run, to compare runs (by default, the start time of the script and its process id)
+LOG_SWITCH            = '--instrumentation='        # command line switches, equivalent to the environment variables (eg. python Run_pipeline.py --profile=/tmp/profiles)
+PROFILE_SWITCH        = '--profile='
+TRACEMALLOC_SWITCH    = '--tracemalloc'
+RSS_SAMPLING_INTERVAL = 0.05                        # in seconds
+RSS_PATHNAME          = '/proc/self/statm'          # resident memory of the process (Linux); without it, the memory is not measured
+OK_STATUS             = 'ok'
+ERROR_STATUS          = 'error'
+
+settings = { 'log_pathname'      : os.environ.get(LOG_ENV_VAR) or None,
+             'profile_directory' : os.environ.get(PROFILE_ENV_VAR) or None,
+             'run_id'            : os.environ.get(RUN_ID_ENV_VAR) or datetime.datetime.now().strftime('%Y%m%dT%H%M%S') + '-' + str(os.getpid()),
+             'script'            : os.path.basename(sys.argv[0]) if sys.argv else '',
+             'trace_memory'      : os.environ.get(TRACEMALLOC_ENV_VAR, '0') not in ( '', '0' ),
+             'profiler'          : None,     # profiler of the block being profiled, and the process it belongs to (forked processes inherit it)
+             'profiler_pid'      : None,
+             'tracer_pid'        : None,     # process whose block is traced by tracemalloc
+             'sampled_measures'  : [],       # measures in progress whose peak resident memory is sampled, the process of the sampling thread and its lock
+             'sampler_pid'       : None,
+             'sampler_lock'      : None }
+
+
+
+def Configure_instrumentation(log_pathname=None, profile_directory=None, trace_memory=None, argv=None) :
+
+    """
+
+    Turns on the measurements (JSON lines) and the cProfile capture of the blocks measured with Measure or Start_measure. Both are off unless a log pathname or a profile
+    directory is given, here, through the environment variables (LOG_ENV_VAR, PROFILE_ENV_VAR) or through the command line switches (LOG_SWITCH, PROFILE_SWITCH), which are
+    read when the module is imported. Processes forked afterwards (eg. pools of workers) inherit the configuration. The resident memory of the blocks is always measured
+    along with their times; the memory allocated by Python (tracemalloc) is only traced if asked for (TRACEMALLOC_ENV_VAR, TRACEMALLOC_SWITCH), since it slows the blocks.
+
+
+    Parameters :
+
+        log_pathname (string)      : Pathname of the JSON lines file the measurements are appended to. Optional.
+
+        profile_directory (string) : Directory in which a cProfile file (.prof) is saved for every block measured. It is created if needed. Optional.
+
+        trace_memory (bool)        : Whether the peak of the memory allocated by Python during each block is traced with tracemalloc. Optional.
+
+        argv (list)                : Command line arguments searched for LOG_SWITCH, PROFILE_SWITCH and TRACEMALLOC_SWITCH (eg. sys.argv). Optional. The other arguments are
+                                     ignored.
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    for arg in ( argv or [] ) :
+
+        if ( arg.startswith(LOG_SWITCH) ) :
+            settings.update( { 'log_pathname' : arg[len(LOG_SWITCH):] or None } )
+
+        elif ( arg.startswith(PROFILE_SWITCH) ) :
+            settings.update( { 'profile_directory' : arg[len(PROFILE_SWITCH):] or None } )
+
+        elif ( arg == TRACEMALLOC_SWITCH ) :
+            settings.update( { 'trace_memory' : True } )
+
+    if ( log_pathname is not None ) :
+        settings.update( { 'log_pathname' : log_pathname } )
+
+    if ( profile_directory is not None ) :
+        settings.update( { 'profile_directory' : profile_directory } )
+
+    if ( trace_memory is not None ) :
+        settings.update( { 'trace_memory' : trace_memory } )
+
+    if ( settings['log_pathname'] ) :
+        os.makedirs(os.path.dirname(os.path.abspath(settings['log_pathname'])), exist_ok=True)
+
+    if ( settings['profile_directory'] ) :
+        os.makedirs(settings['profile_directory'], exist_ok=True)
+
+
+# End of function definition
+
+
+
+def Start_measure(stage, station=None) :
+
+    """
+
+    Starts measuring a block of work (a stage, or a stage of one station) : its wall-clock and CPU times, its resident memory (sampled every RSS_SAMPLING_INTERVAL by a
+    thread of the process) and, if configured, its cProfile capture and the peak of the memory allocated by Python (tracemalloc). A block is not profiled, nor traced, if
+    another block of the same process already is (the outer block includes it). Nothing is done if the instrumentation is off.
+
+
+    Parameters :
+
+        stage (string)   : Name of the stage (eg. 'filter', 'temporal-mean', 'gem-dates', 'plot').
+
+        station (string) : Id of the station, or name of the file processed (eg. 'CA-Oas'). Optional.
+
+
+    Returns :
+
+        measure (dict) : Measurement in progress, to give to Stop_measure. Its 'rows' and 'status' keys, and any other key, may be set in the meantime; they are logged.
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    measure = { 'stage' : stage, 'station' : station, 'rows' : None, 'status' : OK_STATUS }
+
+    if ( ( settings['log_pathname'] is None ) and ( settings['profile_directory'] is None ) ) :
+        return measure
+
+    if ( settings['profiler_pid'] not in ( None, os.getpid() ) ) :   # profiler inherited from the parent process : it is not saved by this process
+
+        settings['profiler'].disable()
+        settings.update( { 'profiler' : None, 'profiler_pid' : None } )
+
+    if ( ( settings['profile_directory'] ) and ( settings['profiler'] is None ) ) :
+
+        measure.update( { 'profiler' : cProfile.Profile() } )
+        settings.update( { 'profiler' : measure['profiler'], 'profiler_pid' : os.getpid() } )
+        measure['profiler'].enable()
+
+    if ( settings['tracer_pid'] not in ( None, os.getpid() ) ) :   # traces inherited from the parent process
+
+        tracemalloc.stop()
+        settings.update( { 'tracer_pid' : None } )
+
+    if ( ( settings['trace_memory'] ) and ( settings['tracer_pid'] is None ) ) :
+
+        tracemalloc.start()
+        settings.update( { 'tracer_pid' : os.getpid() } )
+        measure.update( { 'traced' : True } )
+
+    if ( settings['sampler_pid'] != os.getpid() ) :   # the threads of the parent process are not forked with it (nor is its lock usable)
+
+        settings.update( { 'sampled_measures' : [], 'sampler_pid' : os.getpid(), 'sampler_lock' : threading.Lock() } )
+        threading.Thread(target=Sample_rss, args=(settings['sampled_measures'], settings['sampler_lock']), daemon=True).start()
+
+    start_rss = Get_rss()
+
+    with settings['sampler_lock'] :
+
+        measure.update( { 'start_rss' : start_rss, 'peak_rss' : start_rss } )
+        settings['sampled_measures'].append(measure)
+
+    measure.update( { 'start_times' : os.times(), 'start_time' : time.perf_counter() } )
+
+    return measure
+
+
+# End of function definition
+
+
+
+def Stop_measure(measure, nbr_of_rows=None, status=None) :
+
+    """
+
+    Stops measuring a block started with Start_measure, saves its cProfile capture and appends its measurements to the JSON lines file, as one line with the keys 'run_id',
+    'script', 'pid', 'time', 'stage', 'station', 'status', 'rows', 'seconds' (wall-clock time), 'cpu_seconds' (user and system times of the process and of the processes it
+    waited for), 'rows_per_second', 'rss_mb' (resident memory of the process at the end of the block), 'peak_rss_mb' (largest resident memory sampled during the block),
+    'rss_increase_mb' (peak minus the resident memory at the start of the block, ie. the memory the block needed), 'peak_traced_mb' (peak of the memory allocated by Python,
+    numpy arrays included, if traced) and 'profile' (pathname of the cProfile file), along with any key added to the measure. The memory of the processes the block waited
+    for is not included; they log their own blocks.
+
+
+    Parameters :
+
+        measure (dict)     : Measurement returned by Start_measure.
+
+        nbr_of_rows (int)  : Number of rows (entries) processed by the block. Optional (by default, the 'rows' key of the measure).
+
+        status (string)    : Outcome of the block (eg. OK_STATUS, ERROR_STATUS, 'skipped'). Optional (by default, the 'status' key of the measure).
+
+
+    Returns :
+
+        record (dict) : Measurements logged, or None if the instrumentation is off.
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    if ( 'start_time' not in measure ) :
+        return None
+
+    seconds   = time.perf_counter() - measure.pop('start_time')
+    end_times = os.times()
+
+    start_times = measure.pop('start_times')
+    profiler    = measure.pop('profiler', None)
+    cpu_seconds = sum( end_times[:4] ) - sum( start_times[:4] )   # user and system times, of the process then of its children
+
+    with settings['sampler_lock'] :
+
+        settings['sampled_measures'][:] = [ sampled_measure for sampled_measure in settings['sampled_measures'] if sampled_measure is not measure ]
+        start_rss = measure.pop('start_rss')
+        peak_rss  = measure.pop('peak_rss')
+
+    end_rss    = Get_rss()
+    peak_rss   = max(peak_rss, end_rss) if ( end_rss is not None ) else None
+    peak_trace = None
+
+    if ( measure.pop('traced', False) ) :
+
+        peak_trace = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        settings.update( { 'tracer_pid' : None } )
+
+    if ( nbr_of_rows is not None ) :
+        measure.update( { 'rows' : int(nbr_of_rows) } )
+
+    if ( status is not None ) :
+        measure.update( { 'status' : status } )
+
+    record = { 'stage' : measure['stage'], 'station' : measure['station'], 'status' : measure['status'], 'rows' : measure['rows'], 'seconds' : seconds,
+               'cpu_seconds' : cpu_seconds, 'rows_per_second' : measure['rows'] / seconds if ( ( measure['rows'] is not None ) and ( seconds > 0 ) ) else None,
+               'rss_mb' : end_rss / 2**20 if ( end_rss is not None ) else None, 'peak_rss_mb' : peak_rss / 2**20 if ( peak_rss is not None ) else None,
+               'rss_increase_mb' : ( peak_rss - start_rss ) / 2**20 if ( peak_rss is not None ) else None }
+
+    if ( peak_trace is not None ) :
+        record.update( { 'peak_traced_mb' : peak_trace / 2**20 } )
+
+    if ( profiler is not None ) :
+
+        profiler.disable()
+        settings.update( { 'profiler' : None, 'profiler_pid' : None } )
+
+        profile_name     = '_'.join( str(name).replace(os.sep, '-') for name in ( settings['run_id'], measure['stage'], measure['station'], os.getpid() ) if name is not None )
+        profile_pathname = os.path.join(settings['profile_directory'], profile_name + '.prof')
+
+        profiler.dump_stats(profile_pathname)
+        record.update( { 'profile' : profile_pathname } )
+
+    record.update( { key : value for key, value in measure.items() if key not in record } )
+    Log_record(record)
+    #pdb.set_trace()
+
+    return record
+
+
+# End of function definition
+
+
+
+@contextlib.contextmanager
+def Measure(stage, station=None, nbr_of_rows=None) :
+
+    """
+
+    Measures the block of a with statement (see Start_measure and Stop_measure). If the block raises an error or exits, its status is ERROR_STATUS and the error is logged
+    before being raised again.
+
+        with ins.Measure('temporal-mean', station_id) as measure :
+            ...
+            measure['rows'] = dates.shape[0]
+
+
+    Parameters :
+
+        stage (string)    : Name of the stage.
+
+        station (string)  : Id of the station. Optional.
+
+        nbr_of_rows (int) : Number of rows processed by the block, if known beforehand. Optional.
+
+
+    Returns :
+
+        measure (dict) : Measurement in progress, whose keys may be set within the block.
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    measure = Start_measure(stage, station)
+    measure.update( { 'rows' : nbr_of_rows } )
+
+    try :
+        yield measure
+
+    except BaseException as error :   # the functions exit when their parameters are not valid
+
+        measure.update( { 'status' : ERROR_STATUS, 'error' : repr(error) } )
+        raise
+
+    finally :
+        Stop_measure(measure)
+
+
+# End of function definition
+
+
+
+def Get_rss() :
+
+    """
+
+    Reads the resident memory of the process (the physical memory it uses, shared pages included) from RSS_PATHNAME.
+
+
+    Returns :
+
+        rss (int) : Resident memory, in bytes, or None if it cannot be read (eg. not on Linux).
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    try :
+
+        with open(RSS_PATHNAME) as rss_file :
+            rss = int( rss_file.read().split()[1] ) * os.sysconf('SC_PAGE_SIZE')
+
+    except (OSError, ValueError, IndexError) :
+        rss = None
+
+    return rss
+
+
+# End of function definition
+
+
+
+def Sample_rss(sampled_measures, sampler_lock) :
+
+    """
+
+    Samples the resident memory of the process every RSS_SAMPLING_INTERVAL and keeps, in each measure in progress, the largest value sampled (key 'peak_rss'). It runs in a
+    daemon thread, started once per process by Start_measure, until the process ends.
+
+
+    Parameters :
+
+        sampled_measures (list) : Measures in progress of the process (see Start_measure). Measures are added and removed by Start_measure and Stop_measure.
+
+        sampler_lock (Lock)     : Lock held while the measures are updated.
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    while ( True ) :
+
+        time.sleep(RSS_SAMPLING_INTERVAL)
+        rss = Get_rss()
+
+        if ( rss is None ) :
+            return
+
+        with sampler_lock :
+
+            for measure in sampled_measures :
+                measure.update( { 'peak_rss' : max(measure['peak_rss'], rss) } )
+
+
+# End of function definition
+
+
+
+def Log_record(record) :
+
+    """
+
+    Appends a record (eg. a measurement, or a counter) to the JSON lines file, as one line, with the id of the run, the script, the process id and the time added to it.
+    Every line is written at once to a file opened in append mode, so the processes of a pool can log to the same file. Nothing is done if no log pathname is configured.
+
+
+    Parameters :
+
+        record (dict) : Values to log. They must be serializable to JSON (numpy integers and floats are converted).
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    if ( settings['log_pathname'] is None ) :
+        return
+
+    line = json.dumps( dict( { 'run_id' : settings['run_id'], 'script' : settings['script'], 'pid' : os.getpid(), 'time' : datetime.datetime.now().isoformat(timespec='milliseconds') },
+                             **record ), default=lambda value : value.item() if hasattr(value, 'item') else str(value) )
+
+    log_file_descriptor = os.open(settings['log_pathname'], os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+
+    try :
+        os.write(log_file_descriptor, ( line + '\n' ).encode())
+
+    finally :
+        os.close(log_file_descriptor)
+
+
+# End of function definition
+
+
+
+Configure_instrumentation(argv=sys.argv)
@@ -3,6 +3,8 @@ import glob
 import numpy as np
 import sys
 import Make_comparative_bar_plot as mcbp
+import Station_data_store as sds
+import Station_catalog as sc
 import pdb
 
 """
@@ -17,7 +19,7 @@ Author        : Élise Comeau
 
 Created       : July 27th, 2021
 
-Last modified : August 9th, 2021
+Last modified : October 18th, 2026
 
 """
 
@@ -30,32 +32,30 @@ INPUT_DIRECTORY_1 = '/snow/diluca/FLUXNET_America/1990-2017/v3/TA-SW_IN-SW_OUT-L
 INPUT_DIRECTORY_2 = '/num-years1'
 INPUT_DIRECTORY_3 = '/npy'
 OUTPUT_DIRECTORY  = '/snow/comeau/FLUXNET_America/AMF_1990-2017/png'
+CATALOG_DIRECTORY = '/snow/comeau/FLUXNET_America/AMF_1990-2017'
 
 
 # Step 0.2 : Define filenames
 
 STATION_NAMES_FILENAME = 'AMF_station-filelist_1990-2017_TA-SW_IN-SW_OUT-LW_IN-LW_OUT-H-LE.txt'
 SUMMARY_FILENAME       = 'AMF_summary_1990-2017_TA-SW_IN-SW_OUT-LW_IN-LW_OUT-H-LE.txt'
+CATALOG_FILENAME       = 'AMF_station-catalog_1990-2017_TA-SW_IN-SW_OUT-LW_IN-LW_OUT-H-LE.json'
 
 
 # Step 0.3 : Define prefixes and suffixes
 
-HALF_HR_SUFFIX  = '_30.npy'
-THREE_HR_SUFFIX = '_3.npy'
-PNG_SUFFIX      = '.png'
+PNG_SUFFIX = '.png'
 
 
 # Step 0.4 : Define delimiters
 
 STATION_NAMES_DELIMITER        = '_'
 STATION_NBRS_AND_IDS_DELIMITER = ' '
-YRS_OF_DATA_DELIMITER          = ' '
 
 
 # Step 0.5 : Define special characters
 
 COLON_CHAR    = ':'
-NEW_LINE_CHAR = '\n'
 NULL_CHAR     = ''
 READING_CHAR  = 'r'
 SLASH_BAR     = '/'
@@ -64,25 +64,15 @@ STAR          = '*'
 
 # Step 0.6 : Define indexes
 
-DATE_INDEX          = 0
-FILEPATH_INDEX      = 0
-FIRST_ITEM_INDEX    = 0
-STATION_ID_INDEX    = 3
-STATION_NBR_INDEX_1 = 2
-STATION_NBR_INDEX_2 = 2
-YRS_OF_DATA_INDEX   = 4
+FILEPATH_INDEX = 0
 
 
 # Step 0.7 : Define values
 
-DATA_ID              = 'data'
-DATES_ID             = 'dates'
 MIN_NBR_DATA         = ['1', '2', '3', '4', '5', '6']
 NBR_OF_HEADER_ROWS   = 3
 ROUNDING_POSITION    = 3
 SAMPLING_PERCENTAGES = ['10', '25', '50', '60', '75', '100']  # minimum sampling percentages
-STATION_STR_1        = 'Station '
-STATION_STR_2        = ':'
 
 
 # Step 0.7 : Define plot constants
@@ -95,24 +85,13 @@ PLOT_TYPE                                   = 'amount-of-entries-ratio-and-yrs'
 X_AXIS_LABEL                                = 'site of measurement'
 
 
-# Step 1 : Obtain station ids and numbers
+# Step 1 : Obtain station ids and numbers (the filelists and summaries are only parsed again if they have changed)
 
-station_ids_file_pathname = INPUT_DIRECTORY_1 + SAMPLING_PERCENTAGES[0] + INPUT_DIRECTORY_2 + SLASH_BAR + STATION_NAMES_FILENAME
-station_ids_file          = open(station_ids_file_pathname, READING_CHAR)
+catalog_pathname = CATALOG_DIRECTORY + SLASH_BAR + CATALOG_FILENAME
+catalog          = sc.Load_station_catalog(catalog_pathname, INPUT_DIRECTORY_1, INPUT_DIRECTORY_2, STATION_NAMES_FILENAME, SUMMARY_FILENAME, SAMPLING_PERCENTAGES)
 
-station_ids_list  = []
-station_nbrs_list = []
-
-for station_ids_line in station_ids_file :
-
-    station_filename = os.path.basename(station_ids_line)
-    station_id       = station_filename.split(STATION_NAMES_DELIMITER)[STATION_ID_INDEX]
-    station_nbr      = station_filename.split(STATION_NAMES_DELIMITER)[STATION_NBR_INDEX_1]
-
-    station_ids_list.append(station_id)
-    station_nbrs_list.append(station_nbr)
-
-station_ids_file.close()
+station_ids_list  = catalog['station_ids']
+station_nbrs_list = catalog['station_nbrs']
 
 
 # Step 2 : Obtain station filenames
@@ -124,34 +103,20 @@ entry_ratios_and_yrs_of_data_legend_labels = []
 
 for sampling_percentage in SAMPLING_PERCENTAGES :
 
-    station_pathnames_file_pathname = INPUT_DIRECTORY_1 + sampling_percentage + INPUT_DIRECTORY_2 + SLASH_BAR + STATION_NAMES_FILENAME
-    station_pathnames_file          = open(station_pathnames_file_pathname)
-    station_pathnames               = station_pathnames_file.readlines()
-
-    yrs_of_data_pathname = INPUT_DIRECTORY_1 + sampling_percentage + INPUT_DIRECTORY_2 + SLASH_BAR + SUMMARY_FILENAME
-    yrs_of_data_file     = open(yrs_of_data_pathname)
-    yrs_of_data_content  = yrs_of_data_file.readlines()
-
     entry_ratios_per_station = []
     yrs_of_data_per_station  = []
 
     for station_id in station_ids_list :
 
-        station_filepath = [ station_pathname for station_pathname in station_pathnames if station_id in station_pathname ] 
+        station_entry = catalog['stations'][station_id]['sampling_percentages'].get(sampling_percentage)
 
-        if ( station_filepath ) :
+        if ( station_entry ) :
 
 
             # Step 3 : Obtain ratios of amount of entries (half hour over 3 hour averages)
 
-            three_hr_dates_filepath = station_filepath[FIRST_ITEM_INDEX].replace(NEW_LINE_CHAR, NULL_CHAR).replace(SLASH_BAR+SLASH_BAR, SLASH_BAR).replace(DATA_ID, DATES_ID)                        
-
-            three_hr_dates             = np.load(three_hr_dates_filepath)
-            three_hr_amount_of_entries = three_hr_dates.shape[DATE_INDEX]
-
-            half_hr_dates_filepath    = three_hr_dates_filepath.replace(THREE_HR_SUFFIX, HALF_HR_SUFFIX)
-            half_hr_dates             = np.load(half_hr_dates_filepath)
-            half_hr_amount_of_entries = half_hr_dates.shape[DATE_INDEX]
+            three_hr_amount_of_entries = sds.Get_nbr_of_rows(station_entry['dates_3_pathname'])   # only the header of the file is read
+            half_hr_amount_of_entries  = sds.Get_nbr_of_rows(station_entry['dates_30_pathname'])
 
             entry_ratio = round( (half_hr_amount_of_entries / three_hr_amount_of_entries), ROUNDING_POSITION)
 
@@ -159,11 +124,7 @@ for sampling_percentage in SAMPLING_PERCENTAGES :
 
             # Step 4 : Obtain number of years of data for 3 hour averages
 
-            station_nbr             = int( os.path.basename(three_hr_dates_filepath).split(STATION_NAMES_DELIMITER)[STATION_NBR_INDEX_2] )
-            station_str             = STATION_STR_1 + str(station_nbr) + STATION_STR_2   
-            station_yrs_of_data_str = [ yrs_of_data_item for yrs_of_data_item in yrs_of_data_content if station_str in yrs_of_data_item ]
-
-            yrs_of_data = float( station_yrs_of_data_str[FIRST_ITEM_INDEX].split(YRS_OF_DATA_DELIMITER)[YRS_OF_DATA_INDEX].replace(NEW_LINE_CHAR, NULL_CHAR) )
+            yrs_of_data = station_entry['yrs_of_data']
 
         else :
 
@@ -173,9 +134,6 @@ for sampling_percentage in SAMPLING_PERCENTAGES :
         entry_ratios_per_station.append(entry_ratio)
         yrs_of_data_per_station.append(yrs_of_data)
 
-    station_pathnames_file.close()
-    yrs_of_data_file.close()
-
     entry_ratios_all_stations.append(entry_ratios_per_station)
     yrs_of_data_all_stations.append(yrs_of_data_per_station)
 
@@ -38,7 +38,7 @@ def Make_comparative_bar_plot(data_x_list, data_y_list_1, data_y_list_2, x_axis_
 
     Created       : June 3rd, 2021
 
-    Last modified : August 5th, 2021
+    Last modified : October 18th, 2026
 
     """
 
@@ -117,7 +117,6 @@ def Make_comparative_bar_plot(data_x_list, data_y_list_1, data_y_list_2, x_axis_
 
         # Step 4 : Create first subplot
 
-        plt.figure()        
         fig, ax = plt.subplots(2, figsize=figure_dimensions)
             
         for index in range(nbr_of_sets_of_data) :
@@ -168,4 +167,5 @@ def Make_comparative_bar_plot(data_x_list, data_y_list_1, data_y_list_2, x_axis_
         # Step 6 : Save the plot
 
         fig.tight_layout()
-        plt.savefig(filepath, bbox_inches="tight")
+        fig.savefig(filepath, bbox_inches="tight")
+        plt.close(fig)
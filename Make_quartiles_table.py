@@ -0,0 +1,156 @@
+import os
+import sys
+import glob
+import numpy as np
+import fluxnet_classes as fc
+import Gem_cache as gc
+import Match_gem_dates as mgd
+import Get_UTC_offsets as guo
+import Calculate_stats as cs
+import Grouped_quartiles as gq
+import pdb
+
+
+"""
+
+This script calculates the three-hourly (hour of the day) and monthly quartiles of every energy balance variable of every station, for the 3 hour AmeriFlux (AMF) means
+and for the GEM simulation. Both sources use the same dates : the AMF dates which have a matching GEM date. The quartiles of all the stations are saved to a single table,
+with one line per station, source, variable and group.
+
+
+Author        : Élise Comeau
+
+Created       : October 18th, 2026
+
+Last modified : October 18th, 2026
+
+"""
+
+
+# Step 0 : Define constants
+
+# Step 0.1 : Define directories and filenames
+
+AMF_R_DIRECTORY     = '/snow/comeau/FLUXNET_America/AMF_1990-2017/npy/sampling-percentage50'   # 3 hour AMF means (see Run_pipeline.py)
+GEM_R_DIRECTORY     = '/snow/diluca/FLUXNET_America/GEM_1990-2017'
+GEM_C_DIRECTORY     = '/snow/comeau/FLUXNET_America/GEM_1990-2017/cache'
+TABLE_W_DIRECTORY   = '/snow/comeau/FLUXNET_America/AMF_1990-2017'
+TABLE_FILENAME      = 'AMF-GEM_quartiles_1990-2017_TA-SW_IN-SW_OUT-LW_IN-LW_OUT-H-LE_sampling-percentage50.csv'
+UTC_OFFSET_PATHNAME = '/snow/diluca/FLUXNET_America/1990-2021/G-LE-H-LW_OUT-LW_IN-SW_OUT-SW_IN-TA-/sampling-percentage50/num-years1/Stations_GEM_1990-2021_G-LE-H-LW_OUT-LW_IN-SW_OUT-SW_IN-TA-.txt'
+
+
+# Step 0.2 : Define delimiters, prefixes and suffixes
+
+DELIMITER_1         = ','   # delimiter used in the utc offset files, the GEM files and the table
+DELIMITER_2         = '_'   # delimiter used in the AMF filenames
+VAR_NAMES_DELIMITER = '-'
+
+DATES_ID        = 'dates'
+DATA_ID         = 'data'
+AMF_PREFIX      = 'AMF'
+GEM_PREFIX      = 'GEM'
+TXT_SUFFIX      = '.txt'
+THREE_HR_SUFFIX = '_3.npy'
+DATES_GLOB      = '/AMF_dates_*' + THREE_HR_SUFFIX
+
+
+# Step 0.3 : Define indexes and values
+
+AMF_STATION_ID_INDEX          = 3
+AMF_VAR_NAMES_INDEX           = 5
+UTC_OFFSET_STATION_INDEX      = 0
+UTC_OFFSET_OFFSET_INDEX       = 3
+UTC_OFFSET_NBR_OF_HEADER_ROWS = 1
+GEM_NBR_OF_HEADER_ROWS        = 2
+GEM_DATE_INDEX                = 0
+GEM_VAR_NAMES                 = ['TA', 'SW_IN', 'SW_OUT', 'LW_IN', 'LW_OUT', 'H', 'LE']   # order of the variables in the GEM files (after the date) whose header row does not name them
+AMF_T_FREQ                    = 3                                                        # in hours
+STATS_NAMES                   = ['COUNT', 'Q1', 'MEDIAN', 'Q3']
+
+
+
+# Step 1 : Obtain the 3 hour AMF files and the UTC offsets of the stations
+
+amf_dates_pathnames = sorted( glob.glob(AMF_R_DIRECTORY + DATES_GLOB) )
+
+if ( not amf_dates_pathnames ) :
+
+    print('No 3 hour AMF dates file was found. Quartiles cannot be calculated.\n')
+    sys.exit(0)
+
+var_names_string = os.path.basename(amf_dates_pathnames[0]).split(DELIMITER_2, AMF_VAR_NAMES_INDEX)[AMF_VAR_NAMES_INDEX].replace(THREE_HR_SUFFIX, '')
+var_names_list   = var_names_string.split(VAR_NAMES_DELIMITER)
+stats_names      = cs.Validate_stats_names(STATS_NAMES)   # unknown names are skipped, so the columns of the table match its header
+
+utc_offsets = guo.find_utc_offsets(UTC_OFFSET_PATHNAME, UTC_OFFSET_NBR_OF_HEADER_ROWS, DELIMITER_1, UTC_OFFSET_STATION_INDEX, UTC_OFFSET_OFFSET_INDEX)
+#pdb.set_trace()
+
+
+
+# Step 2 : Load the dates and data of both sources, keeping only the dates they share
+
+station_ids_list = []
+amf_dates_list   = []
+amf_data_list    = []
+gem_dates_list   = []
+gem_data_list    = []
+
+for amf_dates_pathname in amf_dates_pathnames :
+
+    station_id     = os.path.basename(amf_dates_pathname).split(DELIMITER_2)[AMF_STATION_ID_INDEX]
+    gem_pathname_r = GEM_R_DIRECTORY + '/' + station_id + TXT_SUFFIX
+    utc_offset     = utc_offsets.get(station_id)
+
+    if ( ( utc_offset is None ) or ( not os.path.exists(gem_pathname_r) ) ) :
+
+        print('The UTC offset or the GEM file of station ' + station_id + ' is missing. Station is skipped.\n')
+        continue
+
+    gem_var_names     = gc.Read_gem_var_names(gem_pathname_r, DELIMITER_1, GEM_DATE_INDEX, GEM_VAR_NAMES)   # the order of the variables is that of the header of the GEM file
+    missing_var_names = [ var_name for var_name in var_names_list if var_name not in gem_var_names ]
+
+    if ( missing_var_names ) :
+
+        print('The variable(s) ' + ', '.join(missing_var_names) + ' are missing from the GEM file of station ' + station_id + '. Quartiles cannot be calculated.\n')
+        sys.exit(0)
+
+    gem_var_indexes = [ gem_var_names.index(var_name) for var_name in var_names_list ]
+
+    amf_dates = np.load(amf_dates_pathname)
+    amf_data  = np.load(amf_dates_pathname.replace(DATES_ID, DATA_ID))
+
+    gem_dates_utc, gem_data = gc.Load_gem_file(gem_pathname_r, GEM_NBR_OF_HEADER_ROWS, DELIMITER_1, GEM_DATE_INDEX, fc.constants.reference_date, GEM_C_DIRECTORY)
+    gem_dates, gem_indexes  = mgd.Match_gem_dates(gem_dates_utc, amf_dates, utc_offset, AMF_T_FREQ, fc.constants.reference_date, return_indexes=True)
+
+    is_shared = np.isin(amf_dates, gem_dates)
+
+    station_ids_list.append(station_id)
+    amf_dates_list.append(amf_dates[is_shared])
+    amf_data_list.append(amf_data[is_shared])
+    gem_dates_list.append(gem_dates)
+    gem_data_list.append( gem_data[gem_indexes][:, gem_var_indexes] )
+    #pdb.set_trace()
+
+
+
+# Step 3 : Calculate the quartiles of every station, by hour of the day and by month (each source and grouping is a single reduction over all the stations)
+
+lines_list = []
+
+for grouping in gq.GROUPINGS :
+
+    for source, dates_list, data_list in ( (AMF_PREFIX, amf_dates_list, amf_data_list), (GEM_PREFIX, gem_dates_list, gem_data_list) ) :
+
+        station_indexes, group_values, stats_values = gq.Calculate_network_grouped_stats(stats_names, dates_list, data_list, fc.constants.reference_date, grouping)
+
+        lines_list.extend( gq.Make_grouped_stats_lines(source, grouping, station_ids_list, var_names_list, station_indexes, group_values, stats_values, DELIMITER_1) )
+        #pdb.set_trace()
+
+
+
+# Step 4 : Save the table
+
+os.makedirs(TABLE_W_DIRECTORY, exist_ok=True)
+
+gq.Save_grouped_stats_table(TABLE_W_DIRECTORY + '/' + TABLE_FILENAME, stats_names, lines_list, DELIMITER_1)
+print('Quartiles of ' + str(len(station_ids_list)) + ' stations saved')
@@ -4,6 +4,9 @@ import numpy as np
 import sys
 import Calculate_stats as cs
 import Make_comparative_bar_plot as mcbp
+import Station_data_store as sds
+import Station_catalog as sc
+import Render_plots as rp
 import fluxnet_classes as fc
 import pdb
 
@@ -19,7 +22,7 @@ Author        : Élise Comeau
 
 Created       : August 10th, 2021
 
-Last modified : August 10th, 2021
+Last modified : October 18th, 2026
 
 """
 
@@ -31,17 +34,18 @@ Last modified : August 10th, 2021
 INPUT_DIRECTORY_1 = '/snow/diluca/FLUXNET_America/1990-2017/v3/TA-SW_IN-SW_OUT-LW_IN-LW_OUT-H-LE/sampling-percentage'
 INPUT_DIRECTORY_2 = '/num-years1'
 OUTPUT_DIRECTORY  = '/snow/comeau/FLUXNET_America/AMF_1990-2017/png'
+CATALOG_DIRECTORY = '/snow/comeau/FLUXNET_America/AMF_1990-2017'
 
 
 # Step 0.2 : Define filenames
 
 STATION_NAMES_FILENAME = 'AMF_station-filelist_1990-2017_TA-SW_IN-SW_OUT-LW_IN-LW_OUT-H-LE.txt'
+SUMMARY_FILENAME       = 'AMF_summary_1990-2017_TA-SW_IN-SW_OUT-LW_IN-LW_OUT-H-LE.txt'
+CATALOG_FILENAME       = 'AMF_station-catalog_1990-2017_TA-SW_IN-SW_OUT-LW_IN-LW_OUT-H-LE.json'
 
 
 # Step 0.3 : Define prefixes and suffixes
 
-HALF_HR_SUFFIX  = '_30.npy'
-THREE_HR_SUFFIX = '_3.npy'
 TXT_SUFFIX      = '.txt'
 PNG_SUFFIX      = '.png'
 
@@ -55,9 +59,7 @@ VAR_NAMES_DELIMITER            = '-'
 
 # Step 0.5 : Define special characters
 
-NEW_LINE_CHAR = '\n'
 NULL_CHAR     = ''
-READING_CHAR  = 'r'
 SLASH_BAR     = '/'
 #STAR          = '*'
 
@@ -65,9 +67,6 @@ SLASH_BAR     = '/'
 # Step 0.6 : Define indexes
 
 DATA_INDEX        = 0
-FIRST_ITEM_INDEX  = 0
-STATION_ID_INDEX  = 3
-STATION_NBR_INDEX = 2
 VAR_NAMES_INDEX   = 3
 
 
@@ -77,6 +76,7 @@ MIN_NBR_DATA         = ['1', '2', '3', '4', '5', '6']
 TYPE_OF_STAT         = ['MEAN']
 ROUNDING_POSITION    = 3
 SAMPLING_PERCENTAGES = ['10', '25', '50', '60', '75', '100']  # minimum sampling percentages
+NBR_OF_WORKERS       = 8                                      # number of processes rendering the plots
 
 
 # Step 0.7 : Define plot constants
@@ -98,24 +98,13 @@ nbr_of_vars     = len(var_names_list)
 
 
 
-# Step 2 : Obtain station ids and numbers
+# Step 2 : Obtain station ids and numbers (the filelists are only parsed again if they have changed)
 
-station_ids_file_pathname = INPUT_DIRECTORY_1 + SAMPLING_PERCENTAGES[0] + INPUT_DIRECTORY_2 + SLASH_BAR + STATION_NAMES_FILENAME
-station_ids_file          = open(station_ids_file_pathname, READING_CHAR)
+catalog_pathname = CATALOG_DIRECTORY + SLASH_BAR + CATALOG_FILENAME
+catalog          = sc.Load_station_catalog(catalog_pathname, INPUT_DIRECTORY_1, INPUT_DIRECTORY_2, STATION_NAMES_FILENAME, SUMMARY_FILENAME, SAMPLING_PERCENTAGES)
 
-station_ids_list  = []
-station_nbrs_list = []
-
-for station_ids_line in station_ids_file :
-
-    station_filename = os.path.basename(station_ids_line)
-    station_id       = station_filename.split(STATION_NAMES_DELIMITER)[STATION_ID_INDEX]
-    station_nbr      = station_filename.split(STATION_NAMES_DELIMITER)[STATION_NBR_INDEX]
-
-    station_ids_list.append(station_id)
-    station_nbrs_list.append(station_nbr)
-
-station_ids_file.close()
+station_ids_list  = catalog['station_ids']
+station_nbrs_list = catalog['station_nbrs']
 
 
 
@@ -125,33 +114,27 @@ entry_ratios_all_stations       = []
 mean_value_of_data_all_stations = []
 
 entry_ratios_and_yrs_of_data_legend_labels = []
+input_pathnames                            = [ catalog_pathname ]
 
 for sampling_percentage in SAMPLING_PERCENTAGES :
 
-    station_pathnames_file_pathname = INPUT_DIRECTORY_1 + sampling_percentage + INPUT_DIRECTORY_2 + SLASH_BAR + STATION_NAMES_FILENAME
-    station_pathnames_file          = open(station_pathnames_file_pathname)
-    station_pathnames               = station_pathnames_file.readlines()
-
     entry_ratios_per_station       = []
     mean_value_of_data_per_station = []
 
     for station_id in station_ids_list :
 
-        station_filepath = [ station_pathname for station_pathname in station_pathnames if station_id in station_pathname ] 
+        station_entry = catalog['stations'][station_id]['sampling_percentages'].get(sampling_percentage)
 
-        if ( station_filepath ) :
+        if ( station_entry ) :
 
 
             # Step 4 : Obtain ratios of amount of entries (half hour over 3 hour averages)
 
-            three_hr_data_filepath = station_filepath[FIRST_ITEM_INDEX].replace(NEW_LINE_CHAR, NULL_CHAR).replace(SLASH_BAR+SLASH_BAR, SLASH_BAR)
+            input_pathnames.extend( [ station_entry['data_3_pathname'], station_entry['data_30_pathname'] ] )
 
-            three_hr_data              = np.load(three_hr_data_filepath)
+            three_hr_data              = sds.Open_station_array(station_entry['data_3_pathname'])
             three_hr_amount_of_entries = three_hr_data.shape[DATA_INDEX]
-
-            half_hr_data_filepath     = three_hr_data_filepath.replace(THREE_HR_SUFFIX, HALF_HR_SUFFIX)
-            half_hr_data              = np.load(half_hr_data_filepath)
-            half_hr_amount_of_entries = half_hr_data.shape[DATA_INDEX]
+            half_hr_amount_of_entries  = sds.Get_nbr_of_rows(station_entry['data_30_pathname'])   # only the header of the file is read
 
             entry_ratio = round( (half_hr_amount_of_entries / three_hr_amount_of_entries), ROUNDING_POSITION)
 
@@ -176,8 +159,6 @@ for sampling_percentage in SAMPLING_PERCENTAGES :
         entry_ratios_per_station.append(entry_ratio)
         mean_value_of_data_per_station.append(mean_values_of_data)
 
-    station_pathnames_file.close()
-
     entry_ratios_all_stations.append(entry_ratios_per_station)
     mean_value_of_data_all_stations.append(mean_value_of_data_per_station)
 
@@ -199,6 +180,8 @@ for station_nbr, station_id in zip( station_nbrs_list, station_ids_list ) :
 
     station_nbrs_and_ids.append(station_nbr_and_id)
 
+plot_jobs = []
+
 for var_index in range(nbr_of_vars) :
 
     var_name = var_names_list[var_index]
@@ -210,4 +193,8 @@ for var_index in range(nbr_of_vars) :
     plot_filename = PLOT_TYPE + INPUT_DIRECTORY_2.replace(SLASH_BAR, STATION_NAMES_DELIMITER) + STATION_NAMES_DELIMITER + var_name + PNG_SUFFIX
     plot_pathname = OUTPUT_DIRECTORY + SLASH_BAR + plot_filename
 
-    mcbp.Make_comparative_bar_plot(station_nbrs_and_ids, entry_ratios_all_stations, mean_value_of_var_all_stations, X_AXIS_LABEL, ENTRY_RATIOS_Y_AXIS_LABEL, mean_value_y_axis_label, entry_ratios_and_yrs_of_data_legend_labels, entry_ratios_and_yrs_of_data_legend_labels, plot_pathname)
+    plot_args = [ station_nbrs_and_ids, entry_ratios_all_stations, mean_value_of_var_all_stations, X_AXIS_LABEL, ENTRY_RATIOS_Y_AXIS_LABEL, mean_value_y_axis_label, entry_ratios_and_yrs_of_data_legend_labels, entry_ratios_and_yrs_of_data_legend_labels, plot_pathname ]
+    plot_jobs.append( rp.Make_plot_job(mcbp.Make_comparative_bar_plot, plot_args, plot_pathname, input_pathnames) )
+
+rp.Render_plot_jobs(plot_jobs, NBR_OF_WORKERS)   # plots newer than the files of every station are not produced again
+
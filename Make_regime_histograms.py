@@ -0,0 +1,172 @@
+import os
+import sys
+import glob
+import numpy as np
+import fluxnet_classes as fc
+import Gem_cache as gc
+import Match_gem_dates as mgd
+import Get_UTC_offsets as guo
+import Regime_histogram as rh
+import pdb
+
+
+"""
+
+This script bins the net radiation (Rnet) and the latent heat flux (LE) of every station into regimes, for the 3 hour AmeriFlux (AMF) means and for the GEM simulation, on
+the dates they share. For each regime, the number of entries and the sum of the sensible heat flux (H) are accumulated chunk by chunk for each station, and the histograms of
+the stations are then merged into one for the whole network, so a single pass is made over the data. The frequencies and mean H of the regimes are saved, with the counts
+and sums of every station, to a single .npz file.
+
+
+Author        : Élise Comeau
+
+Created       : October 18th, 2026
+
+Last modified : October 18th, 2026
+
+"""
+
+
+# Step 0 : Define constants
+
+# Step 0.1 : Define directories and filenames
+
+AMF_R_DIRECTORY     = '/snow/comeau/FLUXNET_America/AMF_1990-2017/npy/sampling-percentage50'   # 3 hour AMF means (see Run_pipeline.py)
+GEM_R_DIRECTORY     = '/snow/diluca/FLUXNET_America/GEM_1990-2017'
+GEM_C_DIRECTORY     = '/snow/comeau/FLUXNET_America/GEM_1990-2017/cache'
+REGIMES_W_DIRECTORY = '/snow/comeau/FLUXNET_America/AMF_1990-2017'
+REGIMES_FILENAME    = 'AMF-GEM_regimes_1990-2017_TA-SW_IN-SW_OUT-LW_IN-LW_OUT-H-LE_sampling-percentage50.npz'
+UTC_OFFSET_PATHNAME = '/snow/diluca/FLUXNET_America/1990-2021/G-LE-H-LW_OUT-LW_IN-SW_OUT-SW_IN-TA-/sampling-percentage50/num-years1/Stations_GEM_1990-2021_G-LE-H-LW_OUT-LW_IN-SW_OUT-SW_IN-TA-.txt'
+
+
+# Step 0.2 : Define delimiters, prefixes and suffixes
+
+DELIMITER_1         = ','   # delimiter used in the utc offset files and the GEM files
+DELIMITER_2         = '_'   # delimiter used in the AMF filenames
+VAR_NAMES_DELIMITER = '-'
+
+DATES_ID        = 'dates'
+DATA_ID         = 'data'
+AMF_PREFIX      = 'AMF'
+GEM_PREFIX      = 'GEM'
+TXT_SUFFIX      = '.txt'
+THREE_HR_SUFFIX = '_3.npy'
+DATES_GLOB      = '/AMF_dates_*' + THREE_HR_SUFFIX
+
+
+# Step 0.3 : Define indexes and values
+
+AMF_STATION_ID_INDEX          = 3
+AMF_VAR_NAMES_INDEX           = 5
+UTC_OFFSET_STATION_INDEX      = 0
+UTC_OFFSET_OFFSET_INDEX       = 3
+UTC_OFFSET_NBR_OF_HEADER_ROWS = 1
+GEM_NBR_OF_HEADER_ROWS        = 2
+GEM_DATE_INDEX                = 0
+GEM_VAR_NAMES                 = ['TA', 'SW_IN', 'SW_OUT', 'LW_IN', 'LW_OUT', 'H', 'LE']   # order of the variables in the GEM files (after the date) whose header row does not name them
+AMF_T_FREQ                    = 3                                                        # in hours
+CHUNK_NBR_OF_ROWS             = 100000                                                   # number of 3 hour means binned at a time
+RNET_BIN_EDGES                = np.arange(-200, 1001, 50)                                # in W/m2
+LE_BIN_EDGES                  = np.arange(-100, 601, 25)                                 # in W/m2
+
+
+
+# Step 1 : Obtain the 3 hour AMF files and the UTC offsets of the stations
+
+amf_dates_pathnames = sorted( glob.glob(AMF_R_DIRECTORY + DATES_GLOB) )
+
+if ( not amf_dates_pathnames ) :
+
+    print('No 3 hour AMF dates file was found. Regimes cannot be binned.\n')
+    sys.exit(0)
+
+var_names_string = os.path.basename(amf_dates_pathnames[0]).split(DELIMITER_2, AMF_VAR_NAMES_INDEX)[AMF_VAR_NAMES_INDEX].replace(THREE_HR_SUFFIX, '')
+var_names_list   = var_names_string.split(VAR_NAMES_DELIMITER)
+
+utc_offsets = guo.find_utc_offsets(UTC_OFFSET_PATHNAME, UTC_OFFSET_NBR_OF_HEADER_ROWS, DELIMITER_1, UTC_OFFSET_STATION_INDEX, UTC_OFFSET_OFFSET_INDEX)
+#pdb.set_trace()
+
+
+
+# Step 2 : Bin the regimes of every station, chunk by chunk, and merge them into the histograms of the network
+
+station_ids_list   = []
+station_histograms = { AMF_PREFIX : [], GEM_PREFIX : [] }   # keys are the sources and values are the histograms of the stations
+network_histograms = { source : rh.Create_regime_histogram(RNET_BIN_EDGES, LE_BIN_EDGES) for source in station_histograms }
+
+for amf_dates_pathname in amf_dates_pathnames :
+
+    station_id     = os.path.basename(amf_dates_pathname).split(DELIMITER_2)[AMF_STATION_ID_INDEX]
+    gem_pathname_r = GEM_R_DIRECTORY + '/' + station_id + TXT_SUFFIX
+    utc_offset     = utc_offsets.get(station_id)
+
+    if ( ( utc_offset is None ) or ( not os.path.exists(gem_pathname_r) ) ) :
+
+        print('The UTC offset or the GEM file of station ' + station_id + ' is missing. Station is skipped.\n')
+        continue
+
+    gem_var_names     = gc.Read_gem_var_names(gem_pathname_r, DELIMITER_1, GEM_DATE_INDEX, GEM_VAR_NAMES)   # the order of the variables is that of the header of the GEM file
+    missing_var_names = [ var_name for var_name in var_names_list if var_name not in gem_var_names ]
+
+    if ( missing_var_names ) :
+
+        print('The variable(s) ' + ', '.join(missing_var_names) + ' are missing from the GEM file of station ' + station_id + '. Regimes cannot be binned.\n')
+        sys.exit(0)
+
+    gem_var_indexes = [ gem_var_names.index(var_name) for var_name in var_names_list ]
+
+
+    # Step 2.1 : Find the rows of both sources on the dates they share (the data themselves are memory-mapped and only read one chunk at a time)
+
+    amf_dates = np.load(amf_dates_pathname)
+    amf_data  = np.load(amf_dates_pathname.replace(DATES_ID, DATA_ID), mmap_mode='r')
+
+    gem_dates_utc, gem_data = gc.Load_gem_file(gem_pathname_r, GEM_NBR_OF_HEADER_ROWS, DELIMITER_1, GEM_DATE_INDEX, fc.constants.reference_date, GEM_C_DIRECTORY)
+    gem_dates, gem_indexes  = mgd.Match_gem_dates(gem_dates_utc, amf_dates, utc_offset, AMF_T_FREQ, fc.constants.reference_date, return_indexes=True)
+
+    amf_indexes = np.flatnonzero( np.isin(amf_dates, gem_dates) )
+    #pdb.set_trace()
+
+
+    # Step 2.2 : Bin the chunks of the station
+
+    station_ids_list.append(station_id)
+
+    for source, data, indexes, column_indexes in ( (AMF_PREFIX, amf_data, amf_indexes, slice(None)), (GEM_PREFIX, gem_data, gem_indexes, gem_var_indexes) ) :
+
+        station_histogram = rh.Create_regime_histogram(RNET_BIN_EDGES, LE_BIN_EDGES)
+
+        for chunk_start in range(0, indexes.shape[0], CHUNK_NBR_OF_ROWS) :
+
+            chunk_data = data[ indexes[chunk_start:chunk_start + CHUNK_NBR_OF_ROWS] ][:, column_indexes]
+            rh.Update_regime_histogram(station_histogram, chunk_data, var_names_list)
+
+        station_histograms[source].append(station_histogram)
+        network_histograms[source] = rh.Merge_regime_histograms(network_histograms[source], station_histogram)
+        #pdb.set_trace()
+
+
+
+# Step 3 : Save the regimes of the network and the histograms of the stations
+
+os.makedirs(REGIMES_W_DIRECTORY, exist_ok=True)
+
+regimes_arrays = { 'station_ids' : np.array(station_ids_list), 'rnet_bin_edges' : RNET_BIN_EDGES, 'le_bin_edges' : LE_BIN_EDGES }
+
+for source, network_histogram in network_histograms.items() :
+
+    frequencies, h_means = rh.Get_regime_stats(network_histogram)
+
+    regimes_arrays.update( { source + '_frequencies'    : frequencies,
+                             source + '_h_means'        : h_means,
+                             source + '_station_counts' : np.array( [ histogram['counts'] for histogram in station_histograms[source] ] ).reshape( (-1,) + frequencies.shape ),
+                             source + '_station_h_sums' : np.array( [ histogram['h_sums'] for histogram in station_histograms[source] ] ).reshape( (-1,) + frequencies.shape ) } )
+
+regimes_pathname   = REGIMES_W_DIRECTORY + '/' + REGIMES_FILENAME
+temporary_pathname = regimes_pathname + '.' + str(os.getpid()) + '.tmp'
+
+with open(temporary_pathname, 'wb') as regimes_file :
+    np.savez(regimes_file, **regimes_arrays)
+
+os.replace(temporary_pathname, regimes_pathname)
+print('Regimes of ' + str(len(station_ids_list)) + ' stations saved')
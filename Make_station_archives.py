@@ -0,0 +1,153 @@
+import os
+import Station_archive as sa
+import Station_data_store as sds
+import Station_catalog as sc
+import pdb
+
+
+"""
+
+This script gathers the dates and data of each AmeriFlux (AMF) station into a single archive file per station. The archive holds the 30 minute means, the 3 hour means of every
+minimum sampling percentage and the GEM dates matching those of the station, as named datasets (see Station_archive.py). The stations and their files are taken from the
+station catalog (see Station_catalog.py), so no directory is searched. Scripts can then read a station with a single open instead of opening each of its .npy files
+(eg. Make_amount_of_data_plot.py).
+
+Datasets of an archive :
+
+    AMF/30/dates, AMF/30/data                                            : 30 minute means.
+    AMF/3/sampling-percentage<sampling percentage>/dates, .../data       : 3 hour means, one group per minimum sampling percentage.
+    GEM/3/dates                                                          : GEM dates matching the AMF dates (only if the GEM file exists).
+
+
+Author        : Élise Comeau
+
+Created       : October 18th, 2026
+
+Last modified : October 18th, 2026
+
+"""
+
+
+# Step 0 : Define constants
+
+# Step 0.1 : Define directories
+
+INPUT_DIRECTORY_1 = '/snow/diluca/FLUXNET_America/1990-2017/v3/TA-SW_IN-SW_OUT-LW_IN-LW_OUT-H-LE/sampling-percentage'
+INPUT_DIRECTORY_2 = '/num-years1'
+GEM_DIRECTORY     = '/snow/comeau/FLUXNET_America/GEM_1990-2017'
+OUTPUT_DIRECTORY  = '/snow/comeau/FLUXNET_America/AMF_1990-2017/h5'
+CATALOG_DIRECTORY = '/snow/comeau/FLUXNET_America/AMF_1990-2017'
+
+
+# Step 0.2 : Define filenames
+
+STATION_NAMES_FILENAME = 'AMF_station-filelist_1990-2017_TA-SW_IN-SW_OUT-LW_IN-LW_OUT-H-LE.txt'
+SUMMARY_FILENAME       = 'AMF_summary_1990-2017_TA-SW_IN-SW_OUT-LW_IN-LW_OUT-H-LE.txt'
+CATALOG_FILENAME       = 'AMF_station-catalog_1990-2017_TA-SW_IN-SW_OUT-LW_IN-LW_OUT-H-LE.json'
+
+
+# Step 0.3 : Define prefixes and suffixes
+
+AMF_PREFIX = 'AMF'
+GEM_PREFIX = 'GEM'
+TXT_SUFFIX = '.txt'
+
+
+# Step 0.4 : Define delimiters
+
+STATION_NAMES_DELIMITER = '_'
+VAR_NAMES_DELIMITER     = '-'
+
+
+# Step 0.5 : Define special characters
+
+NULL_CHAR = ''
+SLASH_BAR = '/'
+
+
+# Step 0.6 : Define indexes
+
+VAR_NAMES_INDEX = 3
+
+
+# Step 0.7 : Define values
+
+DATA_ID                 = 'data'
+DATES_ID                = 'dates'
+SAMPLING_PERCENTAGES    = ['10', '25', '50', '60', '75', '100']  # minimum sampling percentages
+GEM_SAMPLING_PERCENTAGE = '50'                                   # minimum sampling percentage of the AMF dates the GEM dates are matched to (see filter_gem_dates_and_data.py)
+
+
+
+# Step 1 : Obtain variables of interest
+
+var_names      = STATION_NAMES_FILENAME.split(STATION_NAMES_DELIMITER, VAR_NAMES_INDEX)[VAR_NAMES_INDEX].replace(TXT_SUFFIX, NULL_CHAR)
+var_names_list = var_names.split(VAR_NAMES_DELIMITER)
+
+
+
+# Step 2 : Obtain station numbers, ids and files (the filelists and summaries are only parsed again if they have changed)
+
+catalog_pathname = CATALOG_DIRECTORY + SLASH_BAR + CATALOG_FILENAME
+catalog          = sc.Load_station_catalog(catalog_pathname, INPUT_DIRECTORY_1, INPUT_DIRECTORY_2, STATION_NAMES_FILENAME, SUMMARY_FILENAME, SAMPLING_PERCENTAGES)
+
+os.makedirs(OUTPUT_DIRECTORY, exist_ok=True)
+
+
+
+# Step 3 : Gather the dates and data of each station
+
+for station_id, station_nbr in zip(catalog['station_ids'], catalog['station_nbrs']) :
+
+    station_entries = catalog['stations'][station_id]['sampling_percentages']
+    datasets_dict   = {}
+    attributes_dict = { SLASH_BAR : { 'station_id' : station_id, 'station_nbr' : station_nbr, 'var_names' : var_names_list } }
+
+
+    # Step 3.1 : Obtain dates and data for 0.5 hour averages (the same files for every sampling percentage)
+
+    station_entry = station_entries.get(SAMPLING_PERCENTAGES[0])
+
+    if ( station_entry and os.path.exists(station_entry['dates_30_pathname']) and os.path.exists(station_entry['data_30_pathname']) ) :
+
+        datasets_dict.update( { sa.HALF_HR_GROUP + DATES_ID : sds.Open_station_array(station_entry['dates_30_pathname']),
+                                sa.HALF_HR_GROUP + DATA_ID  : sds.Open_station_array(station_entry['data_30_pathname']) } )
+        attributes_dict.update( { sa.HALF_HR_GROUP : { 't_freq' : 0.5 } } )   # in hours
+
+
+    # Step 3.2 : Obtain dates and data for 3 hour averages
+
+    for sampling_percentage in SAMPLING_PERCENTAGES :
+
+        station_entry = station_entries.get(sampling_percentage)
+
+        if ( station_entry and os.path.exists(station_entry['dates_3_pathname']) and os.path.exists(station_entry['data_3_pathname']) ) :
+
+            three_hr_group = sa.THREE_HR_GROUP + sampling_percentage + SLASH_BAR
+
+            datasets_dict.update( { three_hr_group + DATES_ID : sds.Open_station_array(station_entry['dates_3_pathname']),
+                                    three_hr_group + DATA_ID  : sds.Open_station_array(station_entry['data_3_pathname']) } )
+            attributes_dict.update( { three_hr_group : { 't_freq' : 3, 'sampling_percentage' : int(sampling_percentage) } } )
+
+
+    # Step 3.3 : Obtain GEM dates matching the AMF dates (named after the AMF dates they are matched to)
+
+    station_entry = station_entries.get(GEM_SAMPLING_PERCENTAGE)
+
+    if ( station_entry ) :
+
+        gem_dates_pathname = GEM_DIRECTORY + SLASH_BAR + os.path.basename(station_entry['dates_3_pathname']).replace(AMF_PREFIX, GEM_PREFIX)
+
+        if ( os.path.exists(gem_dates_pathname) ) :
+
+            datasets_dict.update( { sa.GEM_GROUP + DATES_ID : sds.Open_station_array(gem_dates_pathname) } )
+            attributes_dict.update( { sa.GEM_GROUP : { 't_freq' : 3 } } )
+
+    #pdb.set_trace()
+
+
+    # Step 4 : Write the archive of the station
+
+    archive_pathname = sa.Get_archive_pathname(OUTPUT_DIRECTORY, station_nbr, station_id, var_names)
+
+    sa.Write_station_archive(archive_pathname, datasets_dict, attributes_dict)
@@ -8,7 +8,7 @@ import Get_datetime_index as gdi
 import pdb
 
 
-def Make_time_series_plot(dates_arrays_list, data_arrays_list, labels_list, var_name, filepath) :
+def Make_time_series_plot(dates_arrays_list, data_arrays_list, labels_list, var_name, filepath, window_start=None, window_end=None) :
 
     """
     Creates a plot showing the values of different sets of data according to their respective dates.
@@ -26,27 +26,55 @@ def Make_time_series_plot(dates_arrays_list, data_arrays_list, labels_list, var_
 
         filepath (string)        : Filepath used to save the plot.
 
+        window_start (float)     : Epoch date, in seconds, at which the plot starts. Optional; see window_end.
+
+        window_end (float)       : Epoch date, in seconds, at which the plot ends (included). If neither window_start nor window_end is given, the plot covers the first 144
+                                   dates of the first date array, and the other date arrays are matched to those dates.
+
 
     Author        : Élise Comeau
 
     Created       : June 15th 2021
 
-    Last modified : August 4th 2021 
+    Last modified : October 18th 2026
 
     """
 
 
 
-    # Step 1 : Convert dates to datetime format
+    # Step 1 : Find the window of each set of data and convert its dates to datetime format
+
+    # the windows are found with a binary search on the epoch dates, so that only the dates and data within the windows are read and converted
 
     datetime_arrays_list = []
+    data_windows_list    = []
+
+    reference_dates       = dates_arrays_list[0]
+    reference_start_index = 0
+    reference_end_index   = min(144, reference_dates.shape[0] - 1)
+
+    for dates_array, data_array in zip(dates_arrays_list, data_arrays_list) :
 
-    for dates_array in dates_arrays_list :
+        if ( ( window_start is not None ) or ( window_end is not None ) ) :   # window given by its dates
 
-        datetime_list  = etd.epoch_to_datetime(dates_array, fc.constants.reference_date)
-        datetime_array = np.asarray(datetime_list)
+            start_datetime_index = 0 if ( window_start is None ) else int( np.searchsorted(dates_array, window_start, side='left') )
+            end_datetime_index   = dates_array.shape[0] if ( window_end is None ) else int( np.searchsorted(dates_array, window_end, side='right') )
+
+        elif ( len(datetime_arrays_list) == 0 ) :                              # window given by the first dates of the reference (ie, first) date array
+
+            start_datetime_index = reference_start_index
+            end_datetime_index   = reference_end_index
+
+        else :
+
+            start_datetime_index = gdi.Get_epoch_index(dates_array, reference_dates[reference_start_index])
+            end_datetime_index   = gdi.Get_epoch_index(dates_array, reference_dates[reference_end_index]) + 1
+
+        datetime_array = etd.epoch_to_datetime64(dates_array, fc.constants.reference_date, start_datetime_index, end_datetime_index)
+        data_window    = np.asarray(data_array[start_datetime_index:end_datetime_index])
 
         datetime_arrays_list.append(datetime_array)
+        data_windows_list.append(data_window)
         #pdb.set_trace()
 
 
@@ -76,35 +104,25 @@ def Make_time_series_plot(dates_arrays_list, data_arrays_list, labels_list, var_
     locale.setlocale(locale.LC_TIME, loc)
     ax.xaxis.set_major_formatter(mdates.DateFormatter(datetime_format))
 
-    for datetime_array, data_array in zip(datetime_arrays_list, data_arrays_list) :
-   
-        if ( counter == 0 ) :
-
-            start_datetime_index = 0
-            end_datetime_index   = 144
-
-            specific_start_datetime = datetime_array[start_datetime_index]
-            specific_end_datetime   = datetime_array[end_datetime_index] 
+    for datetime_array, data_window in zip(datetime_arrays_list, data_windows_list) :
 
+        if ( counter == 0 ) :
             line_style = 'None'
 
         else :
-
-            start_datetime_index = gdi.Get_datetime_index(datetime_array, specific_start_datetime)
-            end_datetime_index   = gdi.Get_datetime_index(datetime_array, specific_end_datetime) + 1
-
-            line_style  = 'solid'
+            line_style = 'solid'
 
         marker_type = marker_types[counter]
-        plt.plot(datetime_array[start_datetime_index:end_datetime_index], data_array[start_datetime_index:end_datetime_index], label=labels_list[counter], marker=marker_type, linestyle=line_style, alpha=alpha_value)
+        ax.plot(datetime_array, data_window, label=labels_list[counter], marker=marker_type, linestyle=line_style, alpha=alpha_value)
         counter = counter + 1
 
 
     # Step 4 : Add identifiers to plot
 
-    plt.xlabel(x_label, fontweight='bold')
-    plt.ylabel(y_label, fontweight='bold')
+    ax.set_xlabel(x_label, fontweight='bold')
+    ax.set_ylabel(y_label, fontweight='bold')
 
-    plt.legend()
+    ax.legend()
 
-    plt.savefig(filepath, bbox_inches="tight")
+    fig.savefig(filepath, bbox_inches="tight")
+    plt.close(fig)
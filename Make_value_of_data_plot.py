@@ -1,7 +1,8 @@
-import os
-import glob
 import numpy as np
 import Make_time_series_plot as mtsp
+import Station_data_store as sds
+import Station_catalog as sc
+import Render_plots as rp
 import sys
 import pdb
 
@@ -16,7 +17,7 @@ Author        : Élise Comeau
 
 Created       : July 28th, 2021
 
-Last modified : August 9th, 2021
+Last modified : October 18th, 2026
 
 """
 
@@ -26,20 +27,20 @@ Last modified : August 9th, 2021
 
 INPUT_DIRECTORY_1 = '/snow/diluca/FLUXNET_America/1990-2017/v3/TA-SW_IN-SW_OUT-LW_IN-LW_OUT-H-LE/sampling-percentage'
 INPUT_DIRECTORY_2 = '/num-years1'
-INPUT_DIRECTORY_3 = '/npy'
 OUTPUT_DIRECTORY  = '/snow/comeau/FLUXNET_America/AMF_1990-2017/png'
+CATALOG_DIRECTORY = '/snow/comeau/FLUXNET_America/AMF_1990-2017'
 
 
 # Step 0.2 : Define filenames
 
 STATION_NAMES_FILENAME = 'AMF_station-filelist_1990-2017_TA-SW_IN-SW_OUT-LW_IN-LW_OUT-H-LE.txt'
+SUMMARY_FILENAME       = 'AMF_summary_1990-2017_TA-SW_IN-SW_OUT-LW_IN-LW_OUT-H-LE.txt'
+CATALOG_FILENAME       = 'AMF_station-catalog_1990-2017_TA-SW_IN-SW_OUT-LW_IN-LW_OUT-H-LE.json'
 
 
 # Step 0.3 : Define prefixes and suffixes
 
 AMF_PREFIX      = 'AMF_'
-HALF_HR_SUFFIX  = '_30.npy'
-THREE_HR_SUFFIX = '_3.npy'
 PNG_SUFFIX      = '.png'
 TXT_SUFFIX      = '.txt'
 
@@ -53,26 +54,20 @@ VAR_NAMES_DELIMITER     = '-'
 # Step 0.5 : Define special characters
 
 NULL_CHAR    = ''
-READING_CHAR = 'r'
 SLASH_BAR    = '/'
-STAR         = '*'
 
 
 # Step 0.6 : Define indexes
 
-FILEPATH_INDEX    = 0
 FIRST_ITEM_INDEX  = 0
-STATION_ID_INDEX  = 3
-STATION_NBR_INDEX = 2
 VAR_NAMES_INDEX   = 3
 
 
 # Step 0.7 : Define values
 
-DATA_ID              = 'data'
-DATES_ID             = 'dates'
 SAMPLING_PERCENTAGES = ['10', '25', '50', '60', '75', '100']  # minimum sampling percentages
 MIN_NBR_DATA         = ['1', '2', '3', '4', '5', '6']
+NBR_OF_WORKERS       = 8                                      # number of processes rendering the plots
 
 
 # Step 0.8 : Define plot constants
@@ -91,69 +86,50 @@ var_names_list  = var_names.split(VAR_NAMES_DELIMITER)
 
 
 
-# Step 2 : Obtain station numbers and ids
+# Step 2 : Obtain station numbers and ids (the filelists are only parsed again if they have changed)
 
-station_names_file_pathname = INPUT_DIRECTORY_1 + SAMPLING_PERCENTAGES[0] + INPUT_DIRECTORY_2 + SLASH_BAR + STATION_NAMES_FILENAME
-station_names_file          = open(station_names_file_pathname, READING_CHAR)
+catalog_pathname = CATALOG_DIRECTORY + SLASH_BAR + CATALOG_FILENAME
+catalog          = sc.Load_station_catalog(catalog_pathname, INPUT_DIRECTORY_1, INPUT_DIRECTORY_2, STATION_NAMES_FILENAME, SUMMARY_FILENAME, SAMPLING_PERCENTAGES)
 
-station_nbrs_list         = []
-station_ids_list          = []
-
-for station_names_line in station_names_file :
-
-    amf_filename = os.path.basename(station_names_line)
-    station_nbr  = amf_filename.split(STATION_NAMES_DELIMITER)[STATION_NBR_INDEX]
-    station_id   = amf_filename.split(STATION_NAMES_DELIMITER)[STATION_ID_INDEX]
-
-    station_ids_list.append(station_id)
-    station_nbrs_list.append(station_nbr)
-
-station_names_file.close()
+station_nbrs_list = catalog['station_nbrs']
+station_ids_list  = catalog['station_ids']
 
 
 
 # Step 3 : Obtain dates and data for plot
 
+plot_jobs = []
+
 for station_id, station_nbr in zip(station_ids_list, station_nbrs_list) :
 
     station_dates_list = []
     station_data_list  = []
     labels_list        = []
+    input_pathnames    = []
 
-    # Step 3.1 : Obtain dates and data for 0.5 hour average
-
-    dates_0_5_hr_filepath_pattern = INPUT_DIRECTORY_1 + SAMPLING_PERCENTAGES[0] + INPUT_DIRECTORY_2 + INPUT_DIRECTORY_3 + SLASH_BAR + STAR + DATES_ID + STAR + station_id + STAR + HALF_HR_SUFFIX
-    dates_0_5_hr_files            = glob.glob(dates_0_5_hr_filepath_pattern)
+    station_entries = catalog['stations'][station_id]['sampling_percentages']
 
-    if ( dates_0_5_hr_files ) :
+    # Step 3.1 : Obtain dates and data for 0.5 hour average
 
-        dates_0_5_hr_filepath         = glob.glob(dates_0_5_hr_filepath_pattern)[FILEPATH_INDEX]
-        dates_0_5_hr                  = np.load(dates_0_5_hr_filepath)
+    if ( SAMPLING_PERCENTAGES[0] in station_entries ) :
 
-        data_0_5_hr_filepath_pattern = dates_0_5_hr_filepath_pattern.replace(DATES_ID, DATA_ID)
-        data_0_5_hr_filepath         = glob.glob(data_0_5_hr_filepath_pattern)[FILEPATH_INDEX]
-        data_0_5_hr                  = np.load(data_0_5_hr_filepath)
+        dates_0_5_hr = sds.Open_station_array(station_entries[SAMPLING_PERCENTAGES[0]]['dates_30_pathname'])
+        data_0_5_hr  = sds.Open_station_array(station_entries[SAMPLING_PERCENTAGES[0]]['data_30_pathname'])
 
         station_dates_list.append(dates_0_5_hr)
         station_data_list.append(data_0_5_hr)
         labels_list.append(HALF_HR_LEGEND_LABEL)
+        input_pathnames.extend( [ station_entries[SAMPLING_PERCENTAGES[0]]['dates_30_pathname'], station_entries[SAMPLING_PERCENTAGES[0]]['data_30_pathname'] ] )
 
     for sampling_percentage in SAMPLING_PERCENTAGES :
 
 
         # Step 3.2 : Obtain dates and data for 3 hour averages
 
-        dates_3_hr_filepath_pattern = INPUT_DIRECTORY_1 + sampling_percentage + INPUT_DIRECTORY_2 + INPUT_DIRECTORY_3 + SLASH_BAR + STAR + DATES_ID + STAR + station_id + STAR + THREE_HR_SUFFIX
-        dates_3_hr_files            = glob.glob(dates_3_hr_filepath_pattern)
+        if ( sampling_percentage in station_entries ) :
 
-        if ( dates_3_hr_files ) :
-
-            dates_3_hr_filepath = glob.glob(dates_3_hr_filepath_pattern)[FILEPATH_INDEX]
-            dates_3_hr          = np.load(dates_3_hr_filepath)
-
-            data_3_hr_filepath_pattern = dates_3_hr_filepath_pattern.replace(DATES_ID, DATA_ID)
-            data_3_hr_filepath         = glob.glob(data_3_hr_filepath_pattern)[FILEPATH_INDEX]
-            data_3_hr                  = np.load(data_3_hr_filepath)
+            dates_3_hr = sds.Open_station_array(station_entries[sampling_percentage]['dates_3_pathname'])
+            data_3_hr  = sds.Open_station_array(station_entries[sampling_percentage]['data_3_pathname'])
 
             min_nbr_data      = MIN_NBR_DATA[SAMPLING_PERCENTAGES.index(sampling_percentage)]
             values_3_hr_label = THREE_HR_LEGEND_LABEL_1 + min_nbr_data + THREE_HR_LEGEND_LABEL_2
@@ -161,10 +137,11 @@ for station_id, station_nbr in zip(station_ids_list, station_nbrs_list) :
             station_dates_list.append(dates_3_hr)
             station_data_list.append(data_3_hr)
             labels_list.append(values_3_hr_label)
+            input_pathnames.extend( [ station_entries[sampling_percentage]['dates_3_pathname'], station_entries[sampling_percentage]['data_3_pathname'] ] )
 
 
 
-    # Step 4 : Create plots
+    # Step 4 : Prepare plots
 
     for var_name in var_names_list :
 
@@ -179,4 +156,12 @@ for station_id, station_nbr in zip(station_ids_list, station_nbrs_list) :
         plot_filename = PLOT_TYPE + STATION_NAMES_DELIMITER + station_nbr + STATION_NAMES_DELIMITER + station_id + STATION_NAMES_DELIMITER + var_name + STATION_NAMES_DELIMITER + INPUT_DIRECTORY_2.replace(SLASH_BAR, NULL_CHAR) + PNG_SUFFIX
         plot_pathname = OUTPUT_DIRECTORY + SLASH_BAR + plot_filename
 
-        mtsp.Make_time_series_plot(station_dates_list, station_data_ploting_list, labels_list, var_name, plot_pathname)
+        plot_args = [ station_dates_list, station_data_ploting_list, labels_list, var_name, plot_pathname ]
+        plot_jobs.append( rp.Make_plot_job(mtsp.Make_time_series_plot, plot_args, plot_pathname, input_pathnames) )
+
+
+
+# Step 5 : Create plots (plots newer than the files of their station are not produced again)
+
+rp.Render_plot_jobs(plot_jobs, NBR_OF_WORKERS)
+
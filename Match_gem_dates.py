@@ -0,0 +1,173 @@
+import numpy as np
+import pandas as pd
+import Datetime_to_epoch as dte
+import pdb
+
+
+
+def Read_gem_dates(gem_pathname, nbr_of_header_rows, delimiter, date_index, reference_date) :
+
+    """
+
+    Reads the dates of a GEM station file and converts them to epoch dates. The dates are read as a single column of integers (%Y%m%d%H format) instead of line by line.
+
+
+    Parameters :
+
+        gem_pathname (string)            : Absolute pathname of the GEM station file.
+
+        nbr_of_header_rows (int)         : Number of header rows in the GEM file.
+
+        delimiter (string)               : Delimiter used in the GEM file to seperate the variables on a line.
+
+        date_index (int)                 : Index of the dates on a line of the GEM file.
+
+        reference_date (datetime object) : Reference date from which epoch dates are calculated.
+
+
+    Returns :
+
+        gem_dates_utc (array) : Epoch dates, in seconds (integers), of the GEM file. The dates are in UTC, like the GEM file.
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    # Step 1 : Read the dates
+
+    gem_date_column = pd.read_csv(gem_pathname, sep=delimiter, header=None, skiprows=nbr_of_header_rows, usecols=[date_index], dtype={date_index : np.int64})
+    gem_date_ints   = gem_date_column[date_index].to_numpy()
+    #pdb.set_trace()
+
+
+    # Step 2 : Convert the dates (%Y%m%d%H) to epoch dates
+
+    gem_dates_utc = Convert_gem_dates(gem_date_ints, reference_date)
+
+    return gem_dates_utc
+
+
+# End of function definition
+
+
+
+def Convert_gem_dates(gem_date_ints, reference_date) :
+
+    """
+
+    Converts GEM dates written as integers in the %Y%m%d%H format (eg. 1990010103) to epoch dates.
+
+
+    Parameters :
+
+        gem_date_ints (array)            : GEM dates as integers.
+
+        reference_date (datetime object) : Reference date from which epoch dates are calculated.
+
+
+    Returns :
+
+        gem_dates_utc (array) : Epoch dates, in seconds (integers). The dates are in UTC, like the GEM files.
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    years  = gem_date_ints // 1000000
+    months = gem_date_ints // 10000 % 100
+    days   = gem_date_ints // 100 % 100
+    hours  = gem_date_ints % 100
+
+    gem_dates_utc = dte.datetime_to_epoch(years, months, days, hours, 0, reference_date)
+
+    return gem_dates_utc
+
+
+# End of function definition
+
+
+
+def Match_gem_dates(gem_dates_utc, amf_dates, utc_offset, amf_t_freq, reference_date, return_indexes=False) :
+
+    """
+
+    Finds the GEM dates matching those of an AmeriFlux (AMF) station. GEM dates are converted to local time and to the central time of their period, like the AMF dates.
+
+
+    Parameters :
+
+        gem_dates_utc (array)            : Epoch dates, in seconds, of the GEM file, in UTC (see Read_gem_dates).
+
+        amf_dates (array)                : Epoch dates, in seconds, of the AMF station, in local time and centered on their period.
+
+        utc_offset (int)                 : UTC offset of the AMF station, in hours (eg. -8).
+
+        amf_t_freq (int)                 : Temporal frequency of the AMF data, in hours (eg. 3).
+
+        reference_date (datetime object) : Reference date from which epoch dates were calculated.
+
+        return_indexes (bool)            : If True, the indexes of the matched GEM dates in gem_dates_utc are also returned (eg. to select the matching rows of the GEM data).
+
+
+    Returns :
+
+        gem_dates (array)   : Central epoch dates, in seconds and in local time, of the GEM dates that match AMF dates. They are in the same order as in the GEM file.
+
+        gem_indexes (array) : Indexes of the matched GEM dates in gem_dates_utc. Only returned if return_indexes is True.
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    # Step 1 : Convert the GEM dates to local time since AmeriFlux dates are in local time
+
+    gem_dates_local = gem_dates_utc + utc_offset * 3600
+
+
+    # Step 2 : Keep the GEM dates at the end of an AMF period
+
+    reference_seconds = reference_date.hour * 3600 + reference_date.minute * 60 + reference_date.second   # reference_date might not be at midnight
+    gem_hours_local   = ( gem_dates_local + reference_seconds ) // 3600 % 24
+
+    is_period_end = ( gem_hours_local % amf_t_freq == 0 )
+    #pdb.set_trace()
+
+
+    # Step 3 : Take the central time of the GEM time interval and verify if it matches any of the AMF dates
+
+    gem_dates_center = gem_dates_local[is_period_end] - ( amf_t_freq / 2 ) * 3600
+
+    is_matched = np.isin(gem_dates_center, amf_dates)   # both arrays are sorted once instead of scanning amf_dates for every GEM date
+    gem_dates  = gem_dates_center[is_matched]
+    #pdb.set_trace()
+
+    if ( return_indexes ) :
+
+        gem_indexes = np.flatnonzero(is_period_end)[is_matched]
+        return gem_dates, gem_indexes
+
+    return gem_dates
+
+
+# End of function definition
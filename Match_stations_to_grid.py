@@ -0,0 +1,111 @@
+import os
+import numpy as np
+import pandas as pd
+import Grid_matcher as gm
+import pdb
+
+
+"""
+
+This script matches every AmeriFlux station to the nearest grid points of the GEM simulation. The grid points are put in a KD-tree once, then all the stations are
+matched in a single query. Grid points which are mostly water (land fraction below MIN_LAND_FRACTION) are never matched and, optionally, neither are those whose
+elevation is too different from that of the station. The matched grid points of all the stations are saved to a single table (see Extract_gem_stations.py).
+
+
+Author        : Élise Comeau
+
+Created       : October 18th, 2026
+
+Last modified : October 18th, 2026
+
+"""
+
+
+# Step 0 : Define constants
+
+# Step 0.1 : Define directories and filenames
+
+STATION_COORDS_PATHNAME = '/snow/diluca/FLUXNET_America/1990-2021/Stations_coordinates.txt'   # station id, latitude, longitude and elevation of every station
+GRID_R_DIRECTORY        = '/snow/diluca/FLUXNET_America/GEM_grid'                             # geographic coordinates and geophysical fields of the grid points (.npy)
+GRID_LATS_FILENAME      = 'lat.npy'
+GRID_LONS_FILENAME      = 'lon.npy'
+GRID_LAND_FILENAME      = 'land_fraction.npy'
+GRID_ELEVATION_FILENAME = 'elevation.npy'
+MATCHES_W_DIRECTORY     = '/snow/comeau/FLUXNET_America/GEM_1990-2017'
+MATCHES_FILENAME        = 'Stations_grid-points_GEM.csv'
+
+
+# Step 0.2 : Define delimiters and indexes
+
+DELIMITER                 = ','
+COORDS_NBR_OF_HEADER_ROWS = 1
+COORDS_STATION_INDEX      = 0
+COORDS_LAT_INDEX          = 1
+COORDS_LON_INDEX          = 2
+COORDS_ELEVATION_INDEX    = 3
+
+
+# Step 0.3 : Define values
+
+NBR_OF_MATCHES           = 4      # nearest grid points kept per station (the first one is the one used)
+MIN_LAND_FRACTION        = 0.5    # None to match grid points of any land fraction
+MAX_ELEVATION_DIFFERENCE = None   # in m (eg. 300); None to match grid points of any elevation
+
+
+
+# Step 1 : Read the coordinates of the stations and of the grid points
+
+station_coords = pd.read_csv(STATION_COORDS_PATHNAME, sep=DELIMITER, header=None, skiprows=COORDS_NBR_OF_HEADER_ROWS)
+
+station_ids_list   = [ str(station_id).strip() for station_id in station_coords[COORDS_STATION_INDEX] ]
+station_lats       = station_coords[COORDS_LAT_INDEX].to_numpy(dtype=np.float64)
+station_lons       = station_coords[COORDS_LON_INDEX].to_numpy(dtype=np.float64)
+station_elevations = station_coords[COORDS_ELEVATION_INDEX].to_numpy(dtype=np.float64) if ( MAX_ELEVATION_DIFFERENCE is not None ) else None
+
+grid_lats       = np.load(GRID_R_DIRECTORY + '/' + GRID_LATS_FILENAME)
+grid_lons       = np.load(GRID_R_DIRECTORY + '/' + GRID_LONS_FILENAME)
+grid_mask       = ( np.load(GRID_R_DIRECTORY + '/' + GRID_LAND_FILENAME) >= MIN_LAND_FRACTION ) if ( MIN_LAND_FRACTION is not None ) else None
+grid_elevations = np.load(GRID_R_DIRECTORY + '/' + GRID_ELEVATION_FILENAME) if ( MAX_ELEVATION_DIFFERENCE is not None ) else None
+#pdb.set_trace()
+
+
+
+# Step 2 : Match all the stations at once
+
+grid_tree = gm.Build_grid_tree(grid_lats, grid_lons, grid_mask)
+
+grid_indexes, distances = gm.Match_to_grid(grid_tree, station_lats, station_lons, NBR_OF_MATCHES, station_elevations, grid_elevations, MAX_ELEVATION_DIFFERENCE)
+#pdb.set_trace()
+
+
+
+# Step 3 : Save the matched grid points (one line per station and match, from the nearest to the farthest)
+
+lines_list = [ DELIMITER.join( [ 'STATION', 'MATCH', 'GRID_INDEX', 'I', 'J', 'LAT', 'LON', 'DISTANCE' ] ) ]
+
+for station_nbr, station_id in enumerate(station_ids_list) :
+
+    for match_nbr in range(NBR_OF_MATCHES) :
+
+        grid_index = int( grid_indexes[station_nbr, match_nbr] )
+
+        if ( grid_index < 0 ) :
+
+            print('Only ' + str(match_nbr) + ' grid point(s) could be matched to station ' + station_id + '.\n')
+            break
+
+        i, j = np.unravel_index(grid_index, grid_tree['grid_shape']) if ( len(grid_tree['grid_shape']) == 2 ) else (grid_index, 0)
+
+        lines_list.append( DELIMITER.join( [ station_id, str(match_nbr + 1), str(grid_index), str(i), str(j), '{:.4f}'.format(np.ravel(grid_lats)[grid_index]),
+                                             '{:.4f}'.format(np.ravel(grid_lons)[grid_index]), '{:.3f}'.format(distances[station_nbr, match_nbr]) ] ) )
+
+os.makedirs(MATCHES_W_DIRECTORY, exist_ok=True)
+
+matches_pathname   = MATCHES_W_DIRECTORY + '/' + MATCHES_FILENAME
+temporary_pathname = matches_pathname + '.' + str(os.getpid()) + '.tmp'
+
+with open(temporary_pathname, 'w') as matches_file :
+    matches_file.write( '\n'.join(lines_list) + '\n' )
+
+os.replace(temporary_pathname, matches_pathname)
+print(str(len(station_ids_list)) + ' stations matched to the grid')
@@ -0,0 +1,277 @@
+import os
+import json
+import hashlib
+import pdb
+
+
+
+HASH_BLOCK_SIZE = 1 << 20   # files are hashed 1 MiB at a time
+
+
+
+def Hash_file(pathname) :
+
+    """
+
+    Calculates the hash (SHA-1) of the content of a file.
+
+
+    Parameters :
+
+        pathname (string) : Absolute pathname of the file.
+
+
+    Returns :
+
+        file_hash (string) : Hexadecimal hash of the content of the file.
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    file_hash = hashlib.sha1()
+
+    with open(pathname, 'rb') as hashed_file :
+
+        for block in iter(lambda : hashed_file.read(HASH_BLOCK_SIZE), b'') :
+            file_hash.update(block)
+
+    return file_hash.hexdigest()
+
+
+# End of function definition
+
+
+
+def Load_manifest(manifest_pathname) :
+
+    """
+
+    Reads the manifest of the pipeline, which records, for each step (one stage of one station), the hashes of its input files, its parameters and its output files.
+
+
+    Parameters :
+
+        manifest_pathname (string) : Absolute pathname of the manifest (json).
+
+
+    Returns :
+
+        manifest (dict) : Keys are the names of the steps (eg. 'filter/CA-Oas') and values are dictionaries with the keys 'inputs', 'params' and 'outputs'.
+                          The manifest is empty if the file does not exist yet.
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    manifest = {}
+
+    if ( os.path.exists(manifest_pathname) ) :
+
+        with open(manifest_pathname) as manifest_file :
+            manifest = json.load(manifest_file)
+
+    return manifest
+
+
+# End of function definition
+
+
+
+def Save_manifest(manifest, manifest_pathname) :
+
+    """
+
+    Saves the manifest of the pipeline. The file is replaced in a single operation, so that an interrupted run never leaves a partial manifest.
+
+
+    Parameters :
+
+        manifest (dict)            : Manifest (see Load_manifest).
+
+        manifest_pathname (string) : Absolute pathname of the manifest (json).
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    temporary_pathname = manifest_pathname + '.' + str(os.getpid()) + '.tmp'
+
+    with open(temporary_pathname, 'w') as manifest_file :
+        json.dump(manifest, manifest_file, indent=1, sort_keys=True)
+
+    os.replace(temporary_pathname, manifest_pathname)
+
+
+# End of function definition
+
+
+
+def Describe_inputs(input_pathnames, previous_inputs) :
+
+    """
+
+    Describes the input files of a step by their size, modification time and hash. A file whose size and modification time are those recorded in previous_inputs is
+    not hashed again.
+
+
+    Parameters :
+
+        input_pathnames (list) : Absolute pathnames of the input files.
+
+        previous_inputs (dict) : Description of the inputs recorded in the manifest for the step (empty if the step was never run).
+
+
+    Returns :
+
+        inputs (dict) : Keys are the pathnames and values are dictionaries with the keys 'size', 'mtime_ns' and 'hash'. A missing file is described by None.
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    inputs = {}
+
+    for input_pathname in input_pathnames :
+
+        if ( not os.path.exists(input_pathname) ) :
+
+            inputs.update( { input_pathname : None } )
+            continue
+
+        input_stat     = os.stat(input_pathname)
+        previous_input = previous_inputs.get(input_pathname)
+
+        if ( previous_input and ( previous_input['size'] == input_stat.st_size ) and ( previous_input['mtime_ns'] == input_stat.st_mtime_ns ) ) :
+            input_hash = previous_input['hash']
+
+        else :
+            input_hash = Hash_file(input_pathname)
+
+        inputs.update( { input_pathname : { 'size' : input_stat.st_size, 'mtime_ns' : input_stat.st_mtime_ns, 'hash' : input_hash } } )
+
+    return inputs
+
+
+# End of function definition
+
+
+
+def Step_is_up_to_date(manifest, step_name, input_pathnames, params, output_pathnames) :
+
+    """
+
+    Checks whether a step of the pipeline must be run again. A step is up to date if the contents of its input files and its parameters are those recorded in the manifest
+    when it was last run and if all its output files exist.
+
+
+    Parameters :
+
+        manifest (dict)         : Manifest (see Load_manifest).
+
+        step_name (string)      : Name of the step (eg. 'filter/CA-Oas').
+
+        input_pathnames (list)  : Absolute pathnames of the input files of the step.
+
+        params (dict)           : Parameters of the step. Values must be json types (strings, numbers, lists, dictionaries).
+
+        output_pathnames (list) : Absolute pathnames of the output files of the step.
+
+
+    Returns :
+
+        step_is_up_to_date (bool) : True if the step does not need to be run again.
+
+        inputs (dict)             : Description of the input files (see Describe_inputs), to record once the step is run.
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    step_record = manifest.get(step_name, {})
+    inputs      = Describe_inputs(input_pathnames, step_record.get('inputs', {}))
+
+    hashes          = { input_pathname : ( input_description['hash'] if input_description else None ) for input_pathname, input_description in inputs.items() }
+    recorded_hashes = { input_pathname : ( input_description['hash'] if input_description else None ) for input_pathname, input_description in step_record.get('inputs', {}).items() }
+
+    step_is_up_to_date = ( ( step_record != {} ) and ( None not in hashes.values() ) and ( hashes == recorded_hashes )
+                           and ( json.loads(json.dumps(params)) == step_record['params'] )                                    # eg. tuples are recorded as lists
+                           and ( sorted(output_pathnames) == sorted(step_record['outputs']) ) and all( os.path.exists(output_pathname) for output_pathname in output_pathnames ) )
+    #pdb.set_trace()
+
+    return step_is_up_to_date, inputs
+
+
+# End of function definition
+
+
+
+def Record_step(manifest, step_name, inputs, params, output_pathnames) :
+
+    """
+
+    Records in the manifest that a step of the pipeline was run. The manifest is not saved (see Save_manifest).
+
+
+    Parameters :
+
+        manifest (dict)         : Manifest (see Load_manifest).
+
+        step_name (string)      : Name of the step (eg. 'filter/CA-Oas').
+
+        inputs (dict)           : Description of the input files, as returned by Step_is_up_to_date before the step was run.
+
+        params (dict)           : Parameters of the step.
+
+        output_pathnames (list) : Absolute pathnames of the output files of the step.
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    manifest.update( { step_name : { 'inputs' : inputs, 'params' : json.loads(json.dumps(params)), 'outputs' : list(output_pathnames) } } )
+
+
+# End of function definition
@@ -13,13 +13,18 @@
 # Step 1 : Import packages
 
 import pandas as pd
+import numpy as np
 import csv
 import os
 import re
+import sys
 import matplotlib.pyplot as plt
 import datetime
 import matplotlib.dates as mdates
 
+sys.path.append( os.path.dirname( os.path.dirname( os.path.abspath(__file__) ) ) )   # the modules of the repository are in the parent directory
+import Derived_variables as dv
+
 
 
 
@@ -179,27 +184,25 @@ for fileName in fileNames:
 
                 dataColumns = data.columns
  
-                if ('NETRAD' in dataColumns) :                                                                                                                 # If the data already has a variable 'NETRAD' ...
-
-                    for i in range(0, (rowCount - 1)) :
-
-                        if ( data['NETRAD'].iloc[i] == ABSENT_VALUE ) :                                                                                        # ... verify if there are no missing values. If there are missing values ... 
-                            data['NETRAD'].iloc[i] = ( data['LW_IN'].iloc[i] - data['LW_OUT'].iloc[i] ) + ( data['SW_IN'].iloc[i] - data['SW_OUT'].iloc[i] )   # ... then calculate it.
+                # the derived variables are calculated for every row at once; where SW_IN is 0 (or less), the albedo is marked as absent (ABSENT_VALUE) instead of dividing by
+                # zero. Earlier versions of this script wrote inf, NaN or negative albedos there; the readers of the files written below (see Read_amf_data.Filter_amf_columns)
+                # drop the entries equal to ABSENT_VALUE, so those albedos are now missing instead.
 
-                else :                                                                                                                                         # Otherwise ...
-                    data['NETRAD*'] = ( data['LW_IN'] - data['LW_OUT'] ) + ( data['SW_IN'] - data['SW_OUT'] )                                                  # ... create the variable 'NETRAD'.                                                 
+                netRad = dv.Calculate_net_radiation(data['SW_IN'].to_numpy(), data['SW_OUT'].to_numpy(), data['LW_IN'].to_numpy(), data['LW_OUT'].to_numpy())
+                alb    = dv.Calculate_albedo(data['SW_IN'].to_numpy(), data['SW_OUT'].to_numpy(), ABSENT_VALUE)
 
+                if ('NETRAD' in dataColumns) :                                                        # If the data already has a variable 'NETRAD' ...
+                    data['NETRAD'] = np.where(data['NETRAD'] == ABSENT_VALUE, netRad, data['NETRAD'])  # ... calculate its missing values.
 
-                if ('ALB' in dataColumns) :                                                                  # The procedure for 'ALB' is identical to that of 'NETRAD'.
+                else :                                                                                # Otherwise ...
+                    data['NETRAD*'] = netRad                                                          # ... create the variable 'NETRAD'.
 
-                    for i in range(0, (rowCount - 1)) :
-
-                        if ( data['ALB'].iloc[i] == ABSENT_VALUE ) :
-                            data['ALB'].iloc[i] = ( data['SW_OUT'].iloc[i] / data['SW_IN'].iloc[i] ) * 100    # only the Sun's radiation is considered for the albedo
+                if ('ALB' in dataColumns) :                                                           # The procedure for 'ALB' is identical to that of 'NETRAD'.
+                    data['ALB'] = np.where(data['ALB'] == ABSENT_VALUE, alb, data['ALB'])
 
                 else :
-                    data['ALB*'] = ( data['SW_OUT'] / data['SW_IN'] ) * 100      
-      
+                    data['ALB*'] = alb
+
 
 
             # Step 6 : Write to file (if applicable)
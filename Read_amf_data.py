@@ -0,0 +1,290 @@
+import os
+import numpy as np
+import pandas as pd
+import Datetime_to_epoch as dte
+import Derived_variables as dv
+import pdb
+
+
+
+def Read_amf_data(pathname, var_names_list, nbr_of_header_rows, delimiter, dates_index, missing_value, half_time, reference_date, derived_var_names_list=None) :
+
+    """
+
+    Reads the dates and the data of some variables from an AmeriFlux (AMF) csv file. Only the columns of the variables of interest are parsed, and entries with at least one
+    missing value are removed.
+
+
+    Parameters :
+
+        pathname (string)                : Absolute pathname of the AMF csv file.
+
+        var_names_list (list)            : Names of the variables to extract, as written in the header of the file (eg. ['TA', 'SW_IN']). The data columns follow this order.
+
+        nbr_of_header_rows (int)         : Number of header rows in the file. The last header row contains the names of the variables.
+
+        delimiter (string)               : Delimiter used in the file to seperate the variables on a line.
+
+        dates_index (int)                : Index of the dates (ie, TIMESTAMP_START, in the %Y%m%d%H%M format) on a line.
+
+        missing_value (float)            : Value used in the file for missing data (eg. -9999).
+
+        half_time (int)                  : Half of the temporal frequency of the data, expressed in minutes. Dates are moved to the center of their period.
+
+        reference_date (datetime object) : Reference date from which epoch dates are calculated.
+
+        derived_var_names_list (list)    : Names of derived variables (eg. ['NETRAD', 'ALB'], see Derived_variables.py) to calculate from the variables of interest. Optional.
+                                           Where a derived variable is undefined (eg. albedo at night), its value is NaN.
+
+
+    Returns :
+
+        dates_array (array) : Epoch dates, in seconds, of the complete entries.
+
+        data_array (array)  : Data of the complete entries. Each column represents one variable; the derived variables follow the variables of interest.
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    # Step 1 : Find the columns of the variables of interest
+
+    with open(pathname) as dates_and_data_file :
+
+        for line_nbr in range(0, nbr_of_header_rows - 1) :
+            dates_and_data_file.readline()
+
+        var_names_in_file = dates_and_data_file.readline().replace('\n', '').split(delimiter)
+
+    var_indexes = [ var_names_in_file.index(var_name) for var_name in var_names_list ]
+    #pdb.set_trace()
+
+
+    # Step 2 : Read the dates and the data of the variables of interest
+
+    # round_trip parsing gives the same floats as float(), which was used when reading the file line by line
+
+    columns = pd.read_csv(pathname, sep=delimiter, header=None, skiprows=nbr_of_header_rows, usecols=[dates_index] + var_indexes, dtype={dates_index : np.int64}, float_precision='round_trip')
+
+    timestamps = columns[dates_index].to_numpy()
+    data_array = columns[var_indexes].to_numpy(dtype=np.float64)
+    #pdb.set_trace()
+
+
+    # Step 3 : Remove the entries with at least one missing value and convert the dates
+
+    dates_array, data_array = Filter_amf_columns(timestamps, data_array, missing_value, half_time, reference_date)
+    #pdb.set_trace()
+
+
+    # Step 4 : Add the derived variables
+
+    data_array = dv.Add_derived_variables(data_array, var_names_list, derived_var_names_list, np.nan)
+
+    return dates_array, data_array
+
+
+# End of function definition
+
+
+
+def Filter_amf_columns(timestamps, data_array, missing_value, half_time, reference_date) :
+
+    """
+
+    Removes the entries with at least one missing value from the dates and data read from an AmeriFlux (AMF) csv file and converts the dates to epoch dates. A value is
+    missing if it is equal to missing_value, or if it is not finite (an empty field, or a ratio such as an albedo divided by zero in files written by older scripts).
+
+
+    Parameters :
+
+        timestamps (array)               : Dates of the entries (ie, TIMESTAMP_START, in the %Y%m%d%H%M format), as integers.
+
+        data_array (array)               : Data of the entries. Each column represents one variable.
+
+        missing_value (float)            : Value used in the file for missing data (eg. -9999).
+
+        half_time (int)                  : Half of the temporal frequency of the data, expressed in minutes. Dates are moved to the center of their period.
+
+        reference_date (datetime object) : Reference date from which epoch dates are calculated.
+
+
+    Returns :
+
+        dates_array (array) : Epoch dates, in seconds, of the complete entries.
+
+        data_array (array)  : Data of the complete entries. Both arrays are empty and one dimensional if there is no complete entry.
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    # Step 1 : Remove the entries with at least one missing value
+
+    is_complete = np.all( ( data_array != missing_value ) & np.isfinite(data_array), axis=1 )
+
+    timestamps = timestamps[is_complete]
+    data_array = data_array[is_complete]
+
+    if ( timestamps.shape[0] == 0 ) :   # no complete entry; empty arrays are kept one dimensional
+        return np.array([]), np.array([])
+
+
+    # Step 2 : Convert the dates (%Y%m%d%H%M) to the central time of their period, in seconds since reference_date
+
+    years   = timestamps // 100000000
+    months  = timestamps // 1000000 % 100
+    days    = timestamps // 10000 % 100
+    hours   = timestamps // 100 % 100
+    minutes = timestamps % 100 + half_time
+
+    dates_array = dte.datetime_to_epoch(years, months, days, hours, minutes, reference_date).astype(np.float64)
+
+    return dates_array, data_array
+
+
+# End of function definition
+
+
+
+def Stream_amf_data(pathname, dates_pathname, data_pathname, var_names_list, nbr_of_header_rows, delimiter, dates_index, missing_value, half_time, reference_date, chunk_nbr_of_rows, derived_var_names_list=None) :
+
+    """
+
+    Same as Read_amf_data, except that the file is read chunk_nbr_of_rows lines at a time and the dates and data are written to .npy files as they are read. The memory used
+    depends on the size of the chunks, not on the length of the file. The .npy files are identical to those obtained by saving the arrays returned by Read_amf_data.
+
+
+    Parameters :
+
+        dates_pathname (string)  : Pathname of the .npy file to which the dates are saved.
+
+        data_pathname (string)   : Pathname of the .npy file to which the data are saved.
+
+        chunk_nbr_of_rows (int)  : Number of lines of the csv file read at a time.
+
+        The other parameters are those of Read_amf_data.
+
+
+    Returns :
+
+        nbr_of_entries (int) : Number of complete entries saved.
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    # Step 1 : Find the columns of the variables of interest
+
+    with open(pathname) as dates_and_data_file :
+
+        for line_nbr in range(0, nbr_of_header_rows - 1) :
+            dates_and_data_file.readline()
+
+        var_names_in_file = dates_and_data_file.readline().replace('\n', '').split(delimiter)
+
+    var_indexes = [ var_names_in_file.index(var_name) for var_name in var_names_list ]
+    nbr_of_vars = len(var_indexes) + len(derived_var_names_list or [])
+
+
+    # Step 2 : Filter each chunk of the file and append its complete entries to temporary raw files (no header; rows are only counted)
+
+    dates_raw_pathname = dates_pathname + '.' + str(os.getpid()) + '.raw'
+    data_raw_pathname  = data_pathname + '.' + str(os.getpid()) + '.raw'
+
+    # the .npy files are first written to temporary files, then renamed, so an interrupted run never leaves an incomplete .npy file behind (see Gem_cache)
+
+    npy_pathnames       = [ dates_pathname, data_pathname ]
+    temporary_pathnames = [ npy_pathname + '.' + str(os.getpid()) + '.tmp' for npy_pathname in npy_pathnames ]
+
+    nbr_of_entries = 0
+
+    try :
+
+        chunks = pd.read_csv(pathname, sep=delimiter, header=None, skiprows=nbr_of_header_rows, usecols=[dates_index] + var_indexes, dtype={dates_index : np.int64},
+                             float_precision='round_trip', chunksize=chunk_nbr_of_rows)
+
+        with open(dates_raw_pathname, 'wb') as dates_raw_file, open(data_raw_pathname, 'wb') as data_raw_file :
+
+            for chunk in chunks :
+
+                dates_array, data_array = Filter_amf_columns(chunk[dates_index].to_numpy(), chunk[var_indexes].to_numpy(dtype=np.float64), missing_value, half_time, reference_date)
+                data_array              = dv.Add_derived_variables(data_array, var_names_list, derived_var_names_list, np.nan)
+
+                if ( dates_array.shape[0] > 0 ) :
+
+                    np.ascontiguousarray(dates_array).tofile(dates_raw_file)
+                    np.ascontiguousarray(data_array).tofile(data_raw_file)
+                    nbr_of_entries = nbr_of_entries + dates_array.shape[0]
+
+                #pdb.set_trace()
+
+
+        # Step 3 : Copy the raw files to the temporary .npy files, chunk_nbr_of_rows entries at a time, and rename them
+
+        if ( nbr_of_entries == 0 ) :   # no complete entry; empty arrays are kept one dimensional, as in Read_amf_data
+
+            for temporary_pathname in temporary_pathnames :
+
+                with open(temporary_pathname, 'wb') as temporary_file :
+                    np.save(temporary_file, np.array([]))
+
+        else :
+
+            for raw_pathname, temporary_pathname, shape in ( (dates_raw_pathname, temporary_pathnames[0], (nbr_of_entries,)), (data_raw_pathname, temporary_pathnames[1], (nbr_of_entries, nbr_of_vars)) ) :
+
+                npy_array     = np.lib.format.open_memmap(temporary_pathname, mode='w+', dtype=np.float64, shape=shape)
+                nbr_of_values = int( np.prod(shape[1:]) )   # per entry
+                first_entry   = 0
+
+                with open(raw_pathname, 'rb') as raw_file :
+
+                    while ( first_entry < nbr_of_entries ) :
+
+                        raw_values = np.fromfile(raw_file, dtype=np.float64, count=chunk_nbr_of_rows * nbr_of_values)
+                        last_entry = first_entry + raw_values.shape[0] // nbr_of_values
+
+                        npy_array[first_entry:last_entry] = raw_values.reshape( (-1,) + shape[1:] )
+                        first_entry = last_entry
+
+                npy_array.flush()
+                del npy_array
+
+        for temporary_pathname, npy_pathname in zip(temporary_pathnames, npy_pathnames) :
+            os.replace(temporary_pathname, npy_pathname)
+
+
+    # Step 4 : Remove the temporary files, whether the station was saved or not
+
+    finally :
+
+        for leftover_pathname in [ dates_raw_pathname, data_raw_pathname ] + temporary_pathnames :
+
+            if ( os.path.exists(leftover_pathname) ) :
+                os.remove(leftover_pathname)
+
+    return nbr_of_entries
+
+
+# End of function definition
@@ -0,0 +1,256 @@
+import sys
+import numpy as np
+import Derived_variables as dv
+import pdb
+
+
+
+def Create_regime_histogram(rnet_bin_edges, le_bin_edges) :
+
+    """
+
+    Creates an empty histogram of the regimes of net radiation (Rnet) and latent heat flux (LE). Each combination of a Rnet bin and a LE bin is a regime; the histogram
+    counts the entries of each regime and sums their sensible heat flux (H). Data can be added chunk by chunk (see Update_regime_histogram) and histograms with the same
+    bins can be merged (see Merge_regime_histograms), eg. to bin a whole network one station and one period at a time.
+
+
+    Parameters :
+
+        rnet_bin_edges (array) : Edges of the Rnet bins, increasing. As with np.histogram2d, each bin includes its lower edge and the last bin also includes its upper edge.
+
+        le_bin_edges (array)   : Edges of the LE bins, increasing.
+
+
+    Returns :
+
+        histogram (dict) : Histogram, with the keys 'rnet_bin_edges', 'le_bin_edges', 'counts' (number of entries of each regime) and 'h_sums' (sum of H for each regime).
+                           'counts' and 'h_sums' have one row per Rnet bin and one column per LE bin.
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    rnet_bin_edges = np.asarray(rnet_bin_edges, dtype=np.float64)
+    le_bin_edges   = np.asarray(le_bin_edges, dtype=np.float64)
+
+    histogram_shape = (rnet_bin_edges.shape[0] - 1, le_bin_edges.shape[0] - 1)
+
+    histogram = { 'rnet_bin_edges' : rnet_bin_edges,
+                  'le_bin_edges'   : le_bin_edges,
+                  'counts'         : np.zeros(histogram_shape, dtype=np.int64),
+                  'h_sums'         : np.zeros(histogram_shape) }
+
+    return histogram
+
+
+# End of function definition
+
+
+
+def Update_regime_histogram(histogram, data, var_names_list) :
+
+    """
+
+    Adds data to a regime histogram. Rnet is calculated from the four radiation columns (unless the data already have a NETRAD column). Entries with a missing value (NaN)
+    of Rnet, LE or H, or outside the bins, are not counted.
+
+
+    Parameters :
+
+        histogram (dict)      : Regime histogram (see Create_regime_histogram). It is modified.
+
+        data (array)          : Data (eg. a chunk of the 3 hour means of a station). Each column represents one variable.
+
+        var_names_list (list) : Names of the variables of the columns of data (eg. ['TA', 'SW_IN', 'SW_OUT', 'LW_IN', 'LW_OUT', 'H', 'LE']).
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    # Step 1 : Obtain Rnet, LE and H
+
+    if ( np.shape(data)[0] == 0 ) :
+        return
+
+    columns = { var_name : data[:, var_names_list.index(var_name)] for var_name in set(var_names_list) }
+
+    if ( not ( {'H', 'LE'}.issubset(columns) and ( 'NETRAD' in columns or set(dv.DERIVED_VAR_NAMES['NETRAD']).issubset(columns) ) ) ) :
+
+        print('The variables needed to bin the regimes (Rnet, LE and H) are not all in the data. Regimes cannot be binned.\n')
+        sys.exit(0)
+
+    if ( 'NETRAD' in columns ) :
+        rnets = np.asarray(columns['NETRAD'], dtype=np.float64)
+
+    else :
+        rnets = dv.Calculate_net_radiation(columns['SW_IN'], columns['SW_OUT'], columns['LW_IN'], columns['LW_OUT'])
+
+    les = np.asarray(columns['LE'], dtype=np.float64)
+    hs  = np.asarray(columns['H'], dtype=np.float64)
+
+
+    # Step 2 : Find the bin of every entry (same bins as np.histogram2d) and its regime, numbered row by row
+
+    rnet_bin_indexes = Get_bin_indexes(rnets, histogram['rnet_bin_edges'])
+    le_bin_indexes   = Get_bin_indexes(les, histogram['le_bin_edges'])
+
+    is_binned = ( rnet_bin_indexes >= 0 ) & ( le_bin_indexes >= 0 ) & ~np.isnan(hs)
+
+    nbr_of_regimes = histogram['counts'].size
+    regime_indexes = rnet_bin_indexes[is_binned] * histogram['counts'].shape[1] + le_bin_indexes[is_binned]
+    #pdb.set_trace()
+
+
+    # Step 3 : Count the entries and sum H of every regime at once
+
+    histogram['counts'] += np.bincount(regime_indexes, minlength=nbr_of_regimes).reshape(histogram['counts'].shape)
+    histogram['h_sums'] += np.bincount(regime_indexes, weights=hs[is_binned], minlength=nbr_of_regimes).reshape(histogram['h_sums'].shape)
+
+
+# End of function definition
+
+
+
+def Merge_regime_histograms(histogram_1, histogram_2) :
+
+    """
+
+    Merges two regime histograms, as if all their data had been added to a single one. Both must have the same bins.
+
+
+    Parameters :
+
+        histogram_1 (dict) : First regime histogram (see Create_regime_histogram).
+
+        histogram_2 (dict) : Second regime histogram.
+
+
+    Returns :
+
+        histogram (dict) : New regime histogram holding the data of both. The histograms merged are not modified.
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    if ( not ( np.array_equal(histogram_1['rnet_bin_edges'], histogram_2['rnet_bin_edges']) and np.array_equal(histogram_1['le_bin_edges'], histogram_2['le_bin_edges']) ) ) :
+
+        print('The regime histograms do not have the same bins. Regime histograms cannot be merged.\n')
+        sys.exit(0)
+
+    histogram = Create_regime_histogram(histogram_1['rnet_bin_edges'], histogram_1['le_bin_edges'])
+
+    histogram['counts'] = histogram_1['counts'] + histogram_2['counts']
+    histogram['h_sums'] = histogram_1['h_sums'] + histogram_2['h_sums']
+
+    return histogram
+
+
+# End of function definition
+
+
+
+def Get_regime_stats(histogram) :
+
+    """
+
+    Obtains the frequency of every regime and the mean intensity of its sensible heat flux.
+
+
+    Parameters :
+
+        histogram (dict) : Regime histogram (see Create_regime_histogram).
+
+
+    Returns :
+
+        frequencies (array) : Fraction of the binned entries (from 0 to 1) in each regime. One row per Rnet bin and one column per LE bin.
+
+        h_means (array)     : Mean H of each regime (NaN for a regime without entries).
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    counts = histogram['counts']
+
+    with np.errstate(invalid='ignore', divide='ignore') :   # regimes without entries (or a histogram without any)
+
+        frequencies = counts / counts.sum() if ( counts.sum() > 0 ) else np.zeros(counts.shape)
+        h_means     = np.where(counts > 0, histogram['h_sums'] / counts, np.nan)
+
+    return frequencies, h_means
+
+
+# End of function definition
+
+
+
+def Get_bin_indexes(values, bin_edges) :
+
+    """
+
+    Finds the bin of each value, as np.histogram2d does : each bin includes its lower edge and the last bin also includes its upper edge.
+
+
+    Parameters :
+
+        values (array)    : Values to bin.
+
+        bin_edges (array) : Edges of the bins, increasing.
+
+
+    Returns :
+
+        bin_indexes (array) : Index of the bin of each value, or -1 for a value outside the bins or missing (NaN).
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    last_bin_index = bin_edges.shape[0] - 2
+
+    bin_indexes = np.searchsorted(bin_edges, values, side='right') - 1
+    bin_indexes = np.where(values == bin_edges[-1], last_bin_index, bin_indexes)
+
+    bin_indexes[ ( bin_indexes > last_bin_index ) | np.isnan(values) ] = -1
+
+    return bin_indexes
+
+
+# End of function definition
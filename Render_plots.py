@@ -0,0 +1,236 @@
+import os
+import time
+import multiprocessing
+import matplotlib
+matplotlib.use('Agg')                  # plots are only saved to files
+import matplotlib.pyplot as plt
+import Instrumentation as ins
+from concurrent.futures import ProcessPoolExecutor
+import pdb
+
+
+
+RENDERED_STATUS = 'rendered'
+SKIPPED_STATUS  = 'skipped'
+FAILED_STATUS   = 'failed'
+
+plot_jobs = []   # jobs of the current run; the processes of the pool inherit them when they are forked, so the arrays of the jobs are not copied to them
+
+
+
+def Make_plot_job(plot_function, plot_args, output_pathname, input_pathnames) :
+
+    """
+
+    Describes a plot to render : the function producing it, its arguments, the file it is saved to and the files its data come from.
+
+
+    Parameters :
+
+        plot_function (function) : Function producing the plot (eg. Make_time_series_plot). It must be defined at the top level of a module.
+
+        plot_args (list)         : Arguments of plot_function, output pathname included, in order.
+
+        output_pathname (string) : Absolute pathname of the plot file.
+
+        input_pathnames (list)   : Absolute pathnames of the files the data of the plot come from.
+
+
+    Returns :
+
+        plot_job (dict) : The job, with the keys 'plot_function', 'plot_args', 'output_pathname' and 'input_pathnames'.
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    plot_job = { 'plot_function' : plot_function, 'plot_args' : plot_args, 'output_pathname' : output_pathname, 'input_pathnames' : input_pathnames }
+
+    return plot_job
+
+
+# End of function definition
+
+
+
+def Plot_is_up_to_date(output_pathname, input_pathnames) :
+
+    """
+
+    Checks whether a plot file is newer than all the files its data come from.
+
+
+    Parameters :
+
+        output_pathname (string) : Absolute pathname of the plot file.
+
+        input_pathnames (list)   : Absolute pathnames of the files the data of the plot come from.
+
+
+    Returns :
+
+        plot_is_up_to_date (bool) : True if the plot file exists and is newer than every input file. False otherwise, or if there are no input files to compare with.
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    if ( ( not input_pathnames ) or ( not os.path.exists(output_pathname) ) ) :
+        return False
+
+    for input_pathname in input_pathnames :
+
+        if ( ( not os.path.exists(input_pathname) ) or ( os.stat(input_pathname).st_mtime_ns >= os.stat(output_pathname).st_mtime_ns ) ) :
+            return False
+
+    return True
+
+
+# End of function definition
+
+
+
+def Render_plot_job(job_index) :
+
+    """
+
+    Renders one plot job of plot_jobs and closes the figures it opened.
+
+
+    Parameters :
+
+        job_index (int) : Index of the job in plot_jobs.
+
+
+    Returns :
+
+        job_status (string)   : RENDERED_STATUS, or FAILED_STATUS if the plot function raised an error or exited.
+
+        job_duration (float)  : Time taken to render the plot, in seconds.
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    plot_job   = plot_jobs[job_index]
+    start_time = time.perf_counter()
+    measure    = ins.Start_measure('plot', os.path.basename(plot_job['output_pathname']))   # see Instrumentation (off by default)
+
+    try :
+
+        plot_job['plot_function'](*plot_job['plot_args'])
+        job_status = RENDERED_STATUS
+
+    except (Exception, SystemExit) as error :   # the plot functions exit when their parameters are not valid
+
+        print('Plot ' + plot_job['output_pathname'] + ' could not be produced : ' + repr(error) + '\n')
+        job_status = FAILED_STATUS
+
+    finally :
+        plt.close('all')
+
+    job_duration = time.perf_counter() - start_time
+    ins.Stop_measure(measure, status=job_status)
+    #pdb.set_trace()
+
+    return job_status, job_duration
+
+
+# End of function definition
+
+
+
+def Render_plot_jobs(jobs, nbr_of_workers) :
+
+    """
+
+    Renders a list of plot jobs (see Make_plot_job) with a pool of processes. Jobs whose plot file is newer than their input files are skipped.
+    The status and duration of each job are printed.
+
+
+    Parameters :
+
+        jobs (list)          : Plot jobs.
+
+        nbr_of_workers (int) : Number of processes used. With 1, the plots are rendered one after the other in the current process.
+
+
+    Returns :
+
+        jobs_summary (list) : One tuple (output pathname, status, duration in seconds) per job, in the same order as the jobs were given.
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    global plot_jobs
+
+
+    # Step 1 : Find the jobs to render
+
+    plot_jobs = jobs
+
+    job_indexes = [ job_index for job_index, plot_job in enumerate(jobs) if not Plot_is_up_to_date(plot_job['output_pathname'], plot_job['input_pathnames']) ]
+    job_results = dict.fromkeys(range(len(jobs)), (SKIPPED_STATUS, 0.))
+
+
+    # Step 2 : Render the plots
+
+    if ( ( nbr_of_workers <= 1 ) or ( len(job_indexes) <= 1 ) ) :
+
+        job_results.update( zip(job_indexes, map(Render_plot_job, job_indexes)) )
+
+    else :
+
+        # the scripts calling this function are not protected by a main guard, so the processes are forked (they must not import the calling script again)
+
+        with ProcessPoolExecutor(max_workers=nbr_of_workers, mp_context=multiprocessing.get_context('fork')) as executor :
+            job_results.update( zip(job_indexes, executor.map(Render_plot_job, job_indexes)) )
+
+    plot_jobs = []
+    #pdb.set_trace()
+
+
+    # Step 3 : Report the status and duration of each job
+
+    jobs_summary = []
+
+    for job_index, plot_job in enumerate(jobs) :
+
+        job_status, job_duration = job_results[job_index]
+        jobs_summary.append( (plot_job['output_pathname'], job_status, job_duration) )
+
+        print('Plot ' + os.path.basename(plot_job['output_pathname']) + ' : ' + job_status + ' (' + str(round(job_duration, 2)) + ' s)')
+
+    return jobs_summary
+
+
+# End of function definition
@@ -0,0 +1,368 @@
+import os
+import glob
+import numpy as np
+import fluxnet_classes as fc
+import Filter_amf_stations as fas
+import Temporal_mean as tm
+import Gem_cache as gc
+import Match_gem_dates as mgd
+import Get_UTC_offsets as guo
+import Station_data_store as sds
+import Pipeline_manifest as pm
+import Instrumentation as ins
+import pdb
+
+
+"""
+
+This script runs the processing of the AmeriFlux (AMF) and GEM data, stage by stage, for every station :
+
+    filter        : extracts the dates and data of the energy balance variables from the AMF csv file (see Filter_amf_data_abridged.py) and saves them to .npy files.
+    temporal-mean : produces the 3 hour means from the 30 minute means, for every minimum sampling percentage.
+    gem-dates     : extracts the GEM dates matching the 3 hour AMF dates (see filter_gem_dates_and_data.py).
+
+Each stage of each station is a step. The hashes of the input files and the parameters of every step are recorded in a manifest; on the next run, a step is only run again
+if the content of one of its input files or one of its parameters has changed, or if one of its output files is missing. A new AMF csv file thus only costs the work of its
+station, and a stage whose output is unchanged does not trigger the next one. The plots are produced by the Make_*_plot.py scripts, which skip plots newer than their data.
+
+The time taken, the number of rows processed and the memory used by each step can be logged as JSON lines, and each step profiled, with --instrumentation=<pathname of
+the log> and --profile=<directory of the profiles> (see Instrumentation.py and Summarize_instrumentation.py). With a MEMORY_BUDGET, the number of stations filtered at
+the same time is chosen so that their estimated memory stays within it.
+
+
+Author        : Élise Comeau
+
+Created       : October 18th, 2026
+
+Last modified : October 18th, 2026
+
+"""
+
+
+# Step 0 : Define constants
+
+# Step 0.1 : Define directories
+
+AMF_R_DIRECTORY       = '/home/data/Validation/AmeriFlux'                                                                 # 'R' for reading
+AMF_W_DIRECTORY       = '/snow/comeau/FLUXNET_America/AMF_1990-2017/npy'                                                  # 'W' for writing
+GEM_R_DIRECTORY       = '/snow/diluca/FLUXNET_America/GEM_1990-2017'
+GEM_W_DIRECTORY       = '/snow/comeau/FLUXNET_America/GEM_1990-2017'
+GEM_C_DIRECTORY       = '/snow/comeau/FLUXNET_America/GEM_1990-2017/cache'                                                # 'C' for cache
+STATION_IDS_DIRECTORY = '/snow/diluca/FLUXNET_America/1990-2017/v3/TA-SW_IN-SW_OUT-LW_IN-LW_OUT-H-LE/sampling-percentage'
+MIN_NBR_YRS_DIRECTORY = '/num-years1'
+SAMPLING_DIRECTORY    = '/sampling-percentage'
+
+
+# Step 0.2 : Define filenames
+
+DATES_FILENAME_1       = 'AMF_dates_'
+DATES_FILENAME_2       = '_1990-2017_'
+HALF_HR_FILENAME_3     = '_0-5.npy'
+THREE_HR_FILENAME_3    = '_3.npy'
+MANIFEST_FILENAME      = 'AMF_pipeline-manifest_1990-2017_TA-SW_IN-SW_OUT-LW_IN-LW_OUT-H-LE.json'
+STATION_NAMES_FILENAME = 'AMF_station-filelist_1990-2017_TA-SW_IN-SW_OUT-LW_IN-LW_OUT-H-LE.txt'
+SUMMARY_FILENAME       = 'AMF_summary_1990-2017_TA-SW_IN-SW_OUT-LW_IN-LW_OUT-H-LE.txt'
+UTC_OFFSET_PATHNAME    = '/snow/diluca/FLUXNET_America/1990-2021/G-LE-H-LW_OUT-LW_IN-SW_OUT-SW_IN-TA-/sampling-percentage50/num-years1/Stations_GEM_1990-2021_G-LE-H-LW_OUT-LW_IN-SW_OUT-SW_IN-TA-.txt'
+
+
+# Step 0.3 : Define delimiters
+
+DATES_AND_DATA_DELIMITER = ','
+STATION_IDS_DELIMITER    = '_'
+VAR_NAMES_DELIMITER      = '-'
+
+
+# Step 0.4 : Define prefixes and suffixes
+
+AMF_PREFIX = 'AMF'
+GEM_PREFIX = 'GEM'
+CSV_SUFFIX = '.csv'
+TXT_SUFFIX = '.txt'
+
+
+# Step 0.5 : Define special characters
+
+NULL_CHAR     = ''
+READING_CHAR  = 'r'
+SLASH_BAR     = '/'
+STAR          = '*'
+
+
+# Step 0.6 : Define indexes
+
+DATES_INDEX                = 0
+GEM_DATE_INDEX             = 0
+STATION_NBR_INDEX          = 2
+STATION_ID_INDEX           = 3
+UTC_OFFSET_STATION_INDEX   = 0
+UTC_OFFSET_OFFSET_INDEX    = 3
+VAR_NAMES_INDEX            = 3
+
+
+# Step 0.7 : Define values
+
+DATA_ID                       = 'data'
+DATES_ID                      = 'dates'
+HALF_HOURLY                   = 'HH'
+HALF_TIME                     = 15                                     # half of 30 minutes is 15 minutes
+MISSING_VALUE                 = '-9999'                                # convention used in the AMF files
+NBR_OF_HEADER_ROWS            = 3
+GEM_NBR_OF_HEADER_ROWS        = 2
+UTC_OFFSET_NBR_OF_HEADER_ROWS = 1
+CHUNK_NBR_OF_ROWS             = 100000                                 # number of lines of a csv file read at a time (about 6 years of 30 minute data)
+DERIVED_VAR_NAMES             = []                                     # derived variables saved after the variables of interest (eg. ['NETRAD', 'ALB'])
+NBR_OF_WORKERS                = 8                                      # number of stations filtered at the same time
+MEMORY_BUDGET                 = None                                   # memory the stations filtered at the same time may use, in MB (eg. 16000); by default, NBR_OF_WORKERS stations at a time
+SAMPLING_PERCENTAGES          = ['10', '25', '50', '60', '75', '100']  # minimum sampling percentages
+GEM_SAMPLING_PERCENTAGE       = '50'                                   # minimum sampling percentage of the AMF dates the GEM dates are matched to
+T_FREQ_SHORT                  = 1800                                   # 30 minutes, in seconds
+T_FREQ_LONG                   = 10800                                  # 3 hours, in seconds
+CENTRAL_TIME                  = 1.5                                    # the 3 hour periods are 00:00 to 03:00, 03:00 to 06:00, etc.
+AMF_T_FREQ                    = 3                                      # in hours
+
+
+# Step 0.8 : Define the steps to run
+
+STAGES             = ['filter', 'temporal-mean', 'gem-dates']   # stages to run, in order; the outputs of the other stages are left as they are
+FORCED_STATION_IDS = []                                          # stations whose steps are run even if they are up to date (eg. ['CA-Oas'])
+
+
+
+# Step 1 : Obtain variables of interest
+
+var_names_string = STATION_NAMES_FILENAME.split(STATION_IDS_DELIMITER, VAR_NAMES_INDEX)[VAR_NAMES_INDEX].replace(TXT_SUFFIX, NULL_CHAR)
+var_names_list   = var_names_string.split(VAR_NAMES_DELIMITER)
+
+
+
+# Step 2 : Obtain station numbers and ids (the number of a station is the one its filelists give it, so that adding a station does not rename the files of the others)
+
+station_nbrs = {}   # keys are the station ids and values are their numbers (eg. '001')
+
+for sampling_percentage in SAMPLING_PERCENTAGES :
+
+    station_ids_file_pathname = STATION_IDS_DIRECTORY + sampling_percentage + MIN_NBR_YRS_DIRECTORY + SLASH_BAR + STATION_NAMES_FILENAME
+
+    with open(station_ids_file_pathname, READING_CHAR) as station_ids_file :
+
+        for station_ids_file_line in station_ids_file :
+
+            station_filename = os.path.basename(station_ids_file_line)
+            station_nbrs.setdefault( station_filename.split(STATION_IDS_DELIMITER)[STATION_ID_INDEX], station_filename.split(STATION_IDS_DELIMITER)[STATION_NBR_INDEX] )
+
+station_ids_list  = sorted(list(station_nbrs))
+station_nbrs_list = [ station_nbrs[station_id] for station_id in station_ids_list ]
+
+
+
+# Step 3 : Obtain the files of each station
+
+half_hr_pathnames  = {}   # keys are the station ids and values are the pathnames of the dates and data files
+three_hr_pathnames = {}   # keys are the station ids and values are dictionaries whose keys are the sampling percentages
+gem_pathnames      = {}   # keys are the station ids and values are the pathnames of the GEM file and of the matched GEM dates file
+
+for station_nbr, station_id in zip(station_nbrs_list, station_ids_list) :
+
+    dates_filename_1 = DATES_FILENAME_1 + station_nbr + STATION_IDS_DELIMITER + station_id + DATES_FILENAME_2 + var_names_string
+
+    half_hr_dates_pathname = AMF_W_DIRECTORY + SLASH_BAR + dates_filename_1 + HALF_HR_FILENAME_3
+    half_hr_pathnames.update( { station_id : ( half_hr_dates_pathname, half_hr_dates_pathname.replace(DATES_ID, DATA_ID) ) } )
+
+    three_hr_pathnames.update( { station_id : {} } )
+
+    for sampling_percentage in SAMPLING_PERCENTAGES :
+
+        three_hr_dates_pathname = AMF_W_DIRECTORY + SAMPLING_DIRECTORY + sampling_percentage + SLASH_BAR + dates_filename_1 + THREE_HR_FILENAME_3
+        three_hr_pathnames[station_id].update( { sampling_percentage : ( three_hr_dates_pathname, three_hr_dates_pathname.replace(DATES_ID, DATA_ID) ) } )
+
+    gem_r_pathname = GEM_R_DIRECTORY + SLASH_BAR + station_id + TXT_SUFFIX
+    gem_w_pathname = GEM_W_DIRECTORY + SLASH_BAR + os.path.basename(three_hr_pathnames[station_id][GEM_SAMPLING_PERCENTAGE][0]).replace(AMF_PREFIX, GEM_PREFIX)
+    gem_pathnames.update( { station_id : ( gem_r_pathname, gem_w_pathname ) } )
+
+for sampling_percentage in SAMPLING_PERCENTAGES :
+    os.makedirs(AMF_W_DIRECTORY + SAMPLING_DIRECTORY + sampling_percentage, exist_ok=True)
+
+manifest_pathname = AMF_W_DIRECTORY + SLASH_BAR + MANIFEST_FILENAME
+manifest          = pm.Load_manifest(manifest_pathname)
+#pdb.set_trace()
+
+
+
+# Step 4 : Filter the AMF csv files (the stations to filter are processed in parallel)
+
+if ( 'filter' in STAGES ) :
+
+    filter_params = { 'var_names' : var_names_list, 'nbr_of_header_rows' : NBR_OF_HEADER_ROWS, 'delimiter' : DATES_AND_DATA_DELIMITER, 'dates_index' : DATES_INDEX,
+                      'missing_value' : MISSING_VALUE, 'half_time' : HALF_TIME, 'reference_date' : fc.constants.reference_date.isoformat(), 'derived_var_names' : DERIVED_VAR_NAMES }
+
+    steps = []   # steps to run, as tuples (step name, station id, csv pathname, description of the inputs)
+
+    for station_id in station_ids_list :
+
+        csv_pathnames = glob.glob(AMF_R_DIRECTORY + SLASH_BAR + AMF_PREFIX + STATION_IDS_DELIMITER + station_id + STAR + HALF_HOURLY + STAR + CSV_SUFFIX)
+
+        if ( not csv_pathnames ) :
+
+            print('No AMF csv file was found for station ' + station_id + '. Station is not filtered.\n')
+            continue
+
+        step_name = 'filter/' + station_id
+        step_is_up_to_date, inputs = pm.Step_is_up_to_date(manifest, step_name, csv_pathnames[:1], filter_params, half_hr_pathnames[station_id])
+
+        if ( ( not step_is_up_to_date ) or ( station_id in FORCED_STATION_IDS ) ) :
+            steps.append( (step_name, station_id, csv_pathnames[0], inputs) )
+
+    measure = ins.Start_measure('filter')
+
+    filtered_dates_list = fas.Filter_amf_stations([ step[2] for step in steps ], [ half_hr_pathnames[step[1]][0] for step in steps ], [ half_hr_pathnames[step[1]][1] for step in steps ], var_names_list,
+                                                  NBR_OF_HEADER_ROWS, DATES_AND_DATA_DELIMITER, DATES_INDEX, float(MISSING_VALUE), HALF_TIME, fc.constants.reference_date, NBR_OF_WORKERS,
+                                                  CHUNK_NBR_OF_ROWS, DERIVED_VAR_NAMES, MEMORY_BUDGET, skip_failed_stations=True)   # a station that fails does not stop the others
+
+    nbr_of_failed_steps = filtered_dates_list.count(None)
+
+    measure.update( { 'stations_run' : len(steps) - nbr_of_failed_steps, 'stations_failed' : nbr_of_failed_steps } )
+    ins.Stop_measure(measure, sum( nbr_of_entries for nbr_of_entries in filtered_dates_list if nbr_of_entries is not None ), ( ins.ERROR_STATUS if nbr_of_failed_steps else None ))
+
+    for ( step_name, station_id, csv_pathname, inputs ), nbr_of_entries in zip(steps, filtered_dates_list) :
+
+        if ( nbr_of_entries is not None ) :   # the failed steps are not recorded, so that they are run again
+            pm.Record_step(manifest, step_name, inputs, filter_params, half_hr_pathnames[station_id])
+
+    pm.Save_manifest(manifest, manifest_pathname)
+    print('Stage filter : ' + str(len(steps) - nbr_of_failed_steps) + ' of ' + str(len(station_ids_list)) + ' stations run, ' + str(nbr_of_failed_steps) + ' failed')
+
+
+    # Step 4.1 : Save number of years of data (the number of entries of the stations not filtered again is read from the header of their dates file)
+
+    total_dates_list = [ ( sds.Get_nbr_of_rows(half_hr_pathnames[station_id][0]) if os.path.exists(half_hr_pathnames[station_id][0]) else 0 ) for station_id in station_ids_list ]
+    t_freq_list      = [ T_FREQ_SHORT / 3600 ] * len(total_dates_list)   # in hours
+
+    fc.print_summary(total_dates_list, AMF_W_DIRECTORY + SLASH_BAR + SUMMARY_FILENAME, t_freq_list, var_names_string)
+    #pdb.set_trace()
+
+
+
+# Step 5 : Produce the 3 hour means of every minimum sampling percentage (the counts and means of each station are calculated once for all the sampling percentages)
+
+if ( 'temporal-mean' in STAGES ) :
+
+    temporal_mean_params = { 'var_names' : var_names_list, 't_freq_short' : T_FREQ_SHORT, 't_freq_long' : T_FREQ_LONG, 'central_time' : CENTRAL_TIME,
+                             'sampling_percentages' : SAMPLING_PERCENTAGES }
+
+    nbr_of_steps_run    = 0
+    nbr_of_failed_steps = 0
+
+    for station_id in station_ids_list :
+
+        output_pathnames = [ pathname for sampling_percentage in SAMPLING_PERCENTAGES for pathname in three_hr_pathnames[station_id][sampling_percentage] ]
+
+        step_name = 'temporal-mean/' + station_id
+        step_is_up_to_date, inputs = pm.Step_is_up_to_date(manifest, step_name, list(half_hr_pathnames[station_id]), temporal_mean_params, output_pathnames)
+
+        if ( ( step_is_up_to_date ) and ( station_id not in FORCED_STATION_IDS ) ) :
+            continue
+
+        if ( not all( os.path.exists(pathname) for pathname in half_hr_pathnames[station_id] ) ) :
+
+            print('The 30 minute means of station ' + station_id + ' are missing. 3 hour means cannot be produced.\n')
+            continue
+
+        measure = ins.Start_measure('temporal-mean', station_id)
+
+        try :
+
+            dates_0_5_hr = np.load(half_hr_pathnames[station_id][0])
+            data_0_5_hr  = np.load(half_hr_pathnames[station_id][1])
+
+            if ( dates_0_5_hr.shape[0] == 0 ) :   # a station without complete entries has no 3 hour means (as a station none of whose periods has enough data)
+
+                data_3_hr_list  = [ np.array([]) ] * len(SAMPLING_PERCENTAGES)
+                dates_3_hr_list = [ np.array([]) ] * len(SAMPLING_PERCENTAGES)
+
+            else :
+
+                data_3_hr_list, dates_3_hr_list = tm.Temporal_mean_multi_threshold(data_0_5_hr, dates_0_5_hr, T_FREQ_SHORT, T_FREQ_LONG, CENTRAL_TIME,
+                                                                                   [ float(sampling_percentage) for sampling_percentage in SAMPLING_PERCENTAGES ])
+
+            for sampling_percentage, data_3_hr, dates_3_hr in zip(SAMPLING_PERCENTAGES, data_3_hr_list, dates_3_hr_list) :
+
+                np.save(three_hr_pathnames[station_id][sampling_percentage][0], dates_3_hr)
+                np.save(three_hr_pathnames[station_id][sampling_percentage][1], data_3_hr)
+
+        except ( Exception, SystemExit ) as error :   # the functions exit when their parameters are not valid; the step is not recorded, so that it is run again
+
+            print('The 3 hour means of station ' + station_id + ' could not be produced (' + repr(error) + '). Station is skipped.\n')
+            ins.Stop_measure(measure, status=ins.ERROR_STATUS)
+
+            nbr_of_failed_steps = nbr_of_failed_steps + 1
+            continue
+
+        ins.Stop_measure(measure, dates_0_5_hr.shape[0])
+
+        pm.Record_step(manifest, step_name, inputs, temporal_mean_params, output_pathnames)
+        pm.Save_manifest(manifest, manifest_pathname)   # saved after every step, so that the steps run are kept if a later one stops the pipeline
+        nbr_of_steps_run = nbr_of_steps_run + 1
+        #pdb.set_trace()
+
+    print('Stage temporal-mean : ' + str(nbr_of_steps_run) + ' of ' + str(len(station_ids_list)) + ' stations run, ' + str(nbr_of_failed_steps) + ' failed')
+
+
+
+# Step 6 : Extract the GEM dates matching the 3 hour AMF dates (the UTC offset of a station is one of its parameters, so that changing it only affects that station)
+
+if ( 'gem-dates' in STAGES ) :
+
+    utc_offsets = guo.find_utc_offsets(UTC_OFFSET_PATHNAME, UTC_OFFSET_NBR_OF_HEADER_ROWS, DATES_AND_DATA_DELIMITER, UTC_OFFSET_STATION_INDEX, UTC_OFFSET_OFFSET_INDEX)
+
+    nbr_of_steps_run    = 0
+    nbr_of_failed_steps = 0
+
+    for station_id in station_ids_list :
+
+        gem_r_pathname, gem_w_pathname = gem_pathnames[station_id]
+        amf_dates_pathname             = three_hr_pathnames[station_id][GEM_SAMPLING_PERCENTAGE][0]
+
+        if ( station_id not in utc_offsets ) :
+
+            print('The UTC offset of station ' + station_id + ' is unknown. GEM dates cannot be matched.\n')
+            continue
+
+        gem_dates_params = { 'utc_offset' : utc_offsets[station_id], 'amf_t_freq' : AMF_T_FREQ, 'nbr_of_header_rows' : GEM_NBR_OF_HEADER_ROWS,
+                             'delimiter' : DATES_AND_DATA_DELIMITER, 'date_index' : GEM_DATE_INDEX, 'reference_date' : fc.constants.reference_date.isoformat() }
+
+        step_name = 'gem-dates/' + station_id
+        step_is_up_to_date, inputs = pm.Step_is_up_to_date(manifest, step_name, [ gem_r_pathname, amf_dates_pathname ], gem_dates_params, [ gem_w_pathname ])
+
+        if ( ( step_is_up_to_date ) and ( station_id not in FORCED_STATION_IDS ) ) :
+            continue
+
+        if ( not ( os.path.exists(gem_r_pathname) and os.path.exists(amf_dates_pathname) ) ) :
+
+            print('The GEM file or the 3 hour AMF dates of station ' + station_id + ' are missing. GEM dates cannot be matched.\n')
+            continue
+
+        measure = ins.Start_measure('gem-dates', station_id)
+
+        try :
+
+            gem_dates_utc   = gc.Load_gem_file(gem_r_pathname, GEM_NBR_OF_HEADER_ROWS, DATES_AND_DATA_DELIMITER, GEM_DATE_INDEX, fc.constants.reference_date, GEM_C_DIRECTORY, load_data=False)[0]
+            gem_dates_array = mgd.Match_gem_dates(gem_dates_utc, np.load(amf_dates_pathname), utc_offsets[station_id], AMF_T_FREQ, fc.constants.reference_date)
+
+            np.save(gem_w_pathname, gem_dates_array)
+
+        except ( Exception, SystemExit ) as error :   # the functions exit when their parameters are not valid; the step is not recorded, so that it is run again
+
+            print('The GEM dates of station ' + station_id + ' could not be matched (' + repr(error) + '). Station is skipped.\n')
+            ins.Stop_measure(measure, status=ins.ERROR_STATUS)
+
+            nbr_of_failed_steps = nbr_of_failed_steps + 1
+            continue
+
+        ins.Stop_measure(measure, gem_dates_utc.shape[0])
+
+        pm.Record_step(manifest, step_name, inputs, gem_dates_params, [ gem_w_pathname ])
+        pm.Save_manifest(manifest, manifest_pathname)
+        nbr_of_steps_run = nbr_of_steps_run + 1
+        #pdb.set_trace()
+
+    print('Stage gem-dates : ' + str(nbr_of_steps_run) + ' of ' + str(len(station_ids_list)) + ' stations run, ' + str(nbr_of_failed_steps) + ' failed')
@@ -0,0 +1,279 @@
+import os
+import numpy as np
+import pdb
+
+
+
+CHUNK_NBR_OF_ROWS = 65536   # number of rows per chunk in the archives; reading a slice of a dataset only decompresses the chunks it overlaps
+COMPRESSION       = 'gzip'
+COMPRESSION_LEVEL = 4
+
+ARCHIVE_FILENAME_1 = 'AMF_'          # archive of a station : AMF_<station number>_<station id>_1990-2017_<variables>.h5 (see Make_station_archives.py)
+ARCHIVE_FILENAME_2 = '_1990-2017_'
+H5_SUFFIX          = '.h5'
+HALF_HR_GROUP      = 'AMF/30/'                     # names of the groups of an archive; each holds a 'dates' and, for the AMF groups, a 'data' dataset
+THREE_HR_GROUP     = 'AMF/3/sampling-percentage'   # followed by the minimum sampling percentage
+GEM_GROUP          = 'GEM/3/'
+
+
+
+def Write_station_archive(archive_pathname, datasets_dict, attributes_dict) :
+
+    """
+
+    Writes the dates and data of one station (or more) to a single archive file (HDF5). Each array is saved as a named, chunked and compressed dataset.
+
+
+    Parameters :
+
+        archive_pathname (string) : Absolute pathname of the archive. An existing archive is replaced once the new one is complete.
+
+        datasets_dict (dict)      : Arrays to save. The keys are the names of the datasets, with groups separated by '/' (eg. 'AMF/3/sampling-percentage50/dates').
+
+        attributes_dict (dict)    : Metadata to save. The keys are the names of the datasets or groups ('/' for the whole archive) and the values are dictionaries of
+                                    attributes (eg. { '/' : { 'station_id' : 'CA-Oas' } }). Lists of strings are allowed as values.
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    import h5py   # only needed to read or write the archives
+
+    temporary_pathname = archive_pathname + '.' + str(os.getpid()) + '.tmp'
+
+    with h5py.File(temporary_pathname, 'w') as archive :
+
+
+        # Step 1 : Save the arrays
+
+        for dataset_name, dataset_array in datasets_dict.items() :
+
+            dataset_array = np.asarray(dataset_array)
+
+            if ( dataset_array.size == 0 ) :   # empty arrays cannot be chunked
+                archive.create_dataset(dataset_name, data=dataset_array)
+
+            else :
+
+                chunk_shape = ( min(dataset_array.shape[0], CHUNK_NBR_OF_ROWS), ) + dataset_array.shape[1:]
+                archive.create_dataset(dataset_name, data=dataset_array, chunks=chunk_shape, compression=COMPRESSION, compression_opts=COMPRESSION_LEVEL, shuffle=True)
+
+            #pdb.set_trace()
+
+
+        # Step 2 : Save the metadata
+
+        for object_name, attributes in attributes_dict.items() :
+
+            archive_object = archive[object_name] if ( object_name in archive ) else archive.create_group(object_name)   # a group without datasets is created
+
+            for attribute_name, attribute_value in attributes.items() :
+                archive_object.attrs[attribute_name] = attribute_value
+
+
+    # Step 3 : Replace the archive (an interrupted run leaves the previous archive as it was)
+
+    os.replace(temporary_pathname, archive_pathname)
+
+
+# End of function definition
+
+
+
+def List_station_datasets(archive_pathname) :
+
+    """
+
+    Lists the datasets of an archive, with their shape. The arrays themselves are not read.
+
+
+    Parameters :
+
+        archive_pathname (string) : Absolute pathname of the archive.
+
+
+    Returns :
+
+        datasets_shapes (dict) : Keys are the names of the datasets (eg. 'AMF/30/dates') and values are their shapes.
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    import h5py   # only needed to read or write the archives
+
+    datasets_shapes = {}
+
+    def add_dataset(object_name, archive_object) :
+
+        if ( isinstance(archive_object, h5py.Dataset) ) :
+            datasets_shapes.update( { object_name : archive_object.shape } )
+
+    with h5py.File(archive_pathname, 'r') as archive :
+        archive.visititems(add_dataset)
+
+    return datasets_shapes
+
+
+# End of function definition
+
+
+
+def Read_station_dataset(archive_pathname, dataset_name, start_row=None, end_row=None) :
+
+    """
+
+    Reads a dataset, or some consecutive rows of a dataset, from an archive.
+
+
+    Parameters :
+
+        archive_pathname (string) : Absolute pathname of the archive.
+
+        dataset_name (string)     : Name of the dataset (eg. 'AMF/3/sampling-percentage50/data').
+
+        start_row (int)           : First row to read. By default, reading starts at the first row.
+
+        end_row (int)             : Row at which reading stops (excluded), as in a slice. By default, reading stops at the last row.
+
+
+    Returns :
+
+        dataset_array (array) : Rows of the dataset.
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    import h5py   # only needed to read or write the archives
+
+    with h5py.File(archive_pathname, 'r') as archive :
+
+        dataset = archive[dataset_name]
+
+        if ( dataset.ndim == 0 ) :
+            dataset_array = dataset[()]
+
+        else :
+            dataset_array = dataset[start_row:end_row]
+
+    return dataset_array
+
+
+# End of function definition
+
+
+
+def Read_station_attributes(archive_pathname, object_name='/') :
+
+    """
+
+    Reads the metadata of an archive, or of one of its datasets or groups.
+
+
+    Parameters :
+
+        archive_pathname (string) : Absolute pathname of the archive.
+
+        object_name (string)      : Name of the dataset or group. By default, the metadata of the whole archive are read.
+
+
+    Returns :
+
+        attributes (dict) : Metadata of the dataset or group. Strings are returned as str.
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    import h5py   # only needed to read or write the archives
+
+    attributes = {}
+
+    with h5py.File(archive_pathname, 'r') as archive :
+
+        for attribute_name, attribute_value in archive[object_name].attrs.items() :
+
+            if ( isinstance(attribute_value, bytes) ) :
+                attribute_value = attribute_value.decode()
+
+            elif ( isinstance(attribute_value, np.ndarray) and ( attribute_value.dtype.kind in ('O', 'S') ) ) :
+                attribute_value = [ value.decode() if isinstance(value, bytes) else value for value in attribute_value.tolist() ]
+
+            attributes.update( { attribute_name : attribute_value } )
+
+    return attributes
+
+
+# End of function definition
+
+
+
+def Get_archive_pathname(archive_directory, station_nbr, station_id, var_names_string) :
+
+    """
+
+    Gives the pathname of the archive of a station, as written by Make_station_archives.py.
+
+
+    Parameters :
+
+        archive_directory (string) : Directory of the archives.
+
+        station_nbr (string)       : Number of the station (eg. '001').
+
+        station_id (string)        : Id of the station (eg. 'CA-Oas').
+
+        var_names_string (string)  : Variables of interest, as in the filenames (eg. 'TA-SW_IN-SW_OUT-LW_IN-LW_OUT-H-LE').
+
+
+    Returns :
+
+        archive_pathname (string) : Absolute pathname of the archive.
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    archive_pathname = os.path.join(archive_directory, ARCHIVE_FILENAME_1 + station_nbr + '_' + station_id + ARCHIVE_FILENAME_2 + var_names_string + H5_SUFFIX)
+
+    return archive_pathname
+
+
+# End of function definition
+
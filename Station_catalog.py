@@ -0,0 +1,222 @@
+import os
+import re
+import json
+import Get_UTC_offsets as guo
+import pdb
+
+
+
+STATION_NAMES_DELIMITER = '_'
+STATION_ID_INDEX        = 3
+STATION_NBR_INDEX       = 2
+YRS_OF_DATA_DELIMITER   = ' '
+YRS_OF_DATA_INDEX       = 4
+SUMMARY_STATION_PATTERN = re.compile(r'Station (\d+):')   # a summary line looks like 'Station 12: ... <years of data>'
+
+UTC_OFFSET_NBR_OF_HEADER_ROWS = 1
+UTC_OFFSET_DELIMITER          = ','
+UTC_OFFSET_STATION_INDEX      = 0
+UTC_OFFSET_OFFSET_INDEX       = 3
+
+HALF_HR_SUFFIX  = '_30.npy'
+THREE_HR_SUFFIX = '_3.npy'
+DATA_ID         = 'data'
+DATES_ID        = 'dates'
+
+
+
+def Load_station_catalog(catalog_pathname, input_directory_1, input_directory_2, station_names_filename, summary_filename, sampling_percentages, utc_offset_pathname=None) :
+
+    """
+
+    Loads the catalog of the AmeriFlux (AMF) stations, which holds, for each station, its number, the pathnames of its dates and data files, its number of years of data
+    (per minimum sampling percentage) and its UTC offset. The catalog is saved to catalog_pathname (json); it is only built again from the station filelists and summaries
+    when one of them has changed since.
+
+
+    Parameters :
+
+        catalog_pathname (string)       : Absolute pathname of the catalog file.
+
+        input_directory_1 (string)      : Directory of the filelists and summaries, up to the sampling percentage (eg. '.../sampling-percentage').
+
+        input_directory_2 (string)      : Rest of the directory, after the sampling percentage (eg. '/num-years1').
+
+        station_names_filename (string) : Filename of the station filelists. Each line of a filelist is the pathname of the 3 hour data file of a station.
+
+        summary_filename (string)       : Filename of the summaries, which give the number of years of data of each station.
+
+        sampling_percentages (list)     : Minimum sampling percentages, as strings (eg. ['10', '25']).
+
+        utc_offset_pathname (string)    : Absolute pathname of the file containing the UTC offsets of the stations (see Get_UTC_offsets.py). Optional.
+
+
+    Returns :
+
+        catalog (dict) : The catalog. Its keys are :
+
+                             'station_ids'  : Station ids (eg. 'CA-Oas') in the order of the filelist of the first sampling percentage.
+                             'station_nbrs' : Station numbers (eg. '001') in the same order.
+                             'stations'     : Dictionary whose keys are the station ids and whose values are dictionaries with the keys 'utc_offset' (None if unknown)
+                                              and 'sampling_percentages'. The latter maps each sampling percentage to a dictionary with the keys 'station_nbr',
+                                              'dates_3_pathname', 'data_3_pathname', 'dates_30_pathname', 'data_30_pathname' and 'yrs_of_data' (None if unknown).
+                                              A sampling percentage is absent if the station is not in its filelist.
+                             'sources'      : Modification times of the files the catalog was built from.
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    # Step 1 : Find the files the catalog is built from
+
+    source_pathnames = []
+
+    for sampling_percentage in sampling_percentages :
+
+        source_directory = input_directory_1 + sampling_percentage + input_directory_2
+        source_pathnames.append( os.path.join(source_directory, station_names_filename) )
+        source_pathnames.append( os.path.join(source_directory, summary_filename) )
+
+    if ( utc_offset_pathname ) :
+        source_pathnames.append(utc_offset_pathname)
+
+    sources = { source_pathname : ( os.stat(source_pathname).st_mtime_ns if os.path.exists(source_pathname) else None ) for source_pathname in source_pathnames }
+
+
+    # Step 2 : Read the saved catalog, if it is up to date
+
+    if ( os.path.exists(catalog_pathname) ) :
+
+        with open(catalog_pathname) as catalog_file :
+            catalog = json.load(catalog_file)
+
+        if ( catalog['sources'] == sources ) :
+            return catalog
+
+
+    # Step 3 : Otherwise, build the catalog and save it
+
+    catalog = Build_station_catalog(input_directory_1, input_directory_2, station_names_filename, summary_filename, sampling_percentages, utc_offset_pathname)
+    catalog.update( { 'sources' : sources } )
+
+    temporary_pathname = catalog_pathname + '.' + str(os.getpid()) + '.tmp'
+
+    with open(temporary_pathname, 'w') as catalog_file :
+        json.dump(catalog, catalog_file, indent=1)
+
+    os.replace(temporary_pathname, catalog_pathname)
+    #pdb.set_trace()
+
+    return catalog
+
+
+# End of function definition
+
+
+
+def Build_station_catalog(input_directory_1, input_directory_2, station_names_filename, summary_filename, sampling_percentages, utc_offset_pathname=None) :
+
+    """
+
+    Builds the catalog of the AmeriFlux (AMF) stations by reading each station filelist and summary once.
+
+
+    Parameters :
+
+        See Load_station_catalog.
+
+
+    Returns :
+
+        catalog (dict) : The catalog, without its 'sources' key (see Load_station_catalog).
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    # Step 1 : Obtain the UTC offsets
+
+    utc_offsets = {}
+
+    if ( utc_offset_pathname ) :
+        utc_offsets = guo.find_utc_offsets(utc_offset_pathname, UTC_OFFSET_NBR_OF_HEADER_ROWS, UTC_OFFSET_DELIMITER, UTC_OFFSET_STATION_INDEX, UTC_OFFSET_OFFSET_INDEX)
+
+
+    # Step 2 : Read the filelist and the summary of each sampling percentage
+
+    station_ids_list  = []
+    station_nbrs_list = []
+    stations          = {}
+
+    for sampling_percentage in sampling_percentages :
+
+        source_directory = input_directory_1 + sampling_percentage + input_directory_2
+
+
+        # Step 2.1 : Obtain the number of years of data of each station number
+
+        yrs_of_data_per_station_nbr = {}
+        summary_pathname            = os.path.join(source_directory, summary_filename)
+
+        if ( os.path.exists(summary_pathname) ) :
+
+            with open(summary_pathname) as summary_file :
+
+                for summary_line in summary_file :
+
+                    summary_match = SUMMARY_STATION_PATTERN.search(summary_line)
+
+                    if ( summary_match ) :
+                        yrs_of_data = float( summary_line.split(YRS_OF_DATA_DELIMITER)[YRS_OF_DATA_INDEX].replace('\n', '') )
+                        yrs_of_data_per_station_nbr.update( { int(summary_match.group(1)) : yrs_of_data } )
+
+
+        # Step 2.2 : Obtain the files of each station
+
+        with open( os.path.join(source_directory, station_names_filename) ) as station_names_file :
+
+            for station_names_line in station_names_file :
+
+                data_3_pathname  = station_names_line.replace('\n', '').replace('//', '/')
+                station_filename = os.path.basename(data_3_pathname)
+                station_id       = station_filename.split(STATION_NAMES_DELIMITER)[STATION_ID_INDEX]
+                station_nbr      = station_filename.split(STATION_NAMES_DELIMITER)[STATION_NBR_INDEX]
+
+                if ( sampling_percentage == sampling_percentages[0] ) :   # the order of the stations is that of the first filelist
+
+                    station_ids_list.append(station_id)
+                    station_nbrs_list.append(station_nbr)
+
+                station = stations.setdefault(station_id, { 'utc_offset' : utc_offsets.get(station_id), 'sampling_percentages' : {} })
+
+                station['sampling_percentages'].update( { sampling_percentage : { 'station_nbr'       : station_nbr,
+                                                                                  'dates_3_pathname'  : data_3_pathname.replace(DATA_ID, DATES_ID),
+                                                                                  'data_3_pathname'   : data_3_pathname,
+                                                                                  'dates_30_pathname' : data_3_pathname.replace(DATA_ID, DATES_ID).replace(THREE_HR_SUFFIX, HALF_HR_SUFFIX),
+                                                                                  'data_30_pathname'  : data_3_pathname.replace(THREE_HR_SUFFIX, HALF_HR_SUFFIX),
+                                                                                  'yrs_of_data'       : yrs_of_data_per_station_nbr.get(int(station_nbr)) } } )
+        #pdb.set_trace()
+
+
+    # Step 3 : Return the catalog
+
+    catalog = { 'station_ids' : station_ids_list, 'station_nbrs' : station_nbrs_list, 'stations' : stations }
+
+    return catalog
+
+
+# End of function definition
@@ -0,0 +1,173 @@
+import numpy as np
+import pdb
+
+
+
+def Get_nbr_of_rows(pathname) :
+
+    """
+
+    Finds the number of rows (ie, entries) of an array saved to a .npy file. Only the header of the file is read.
+
+
+    Parameters :
+
+        pathname (string) : Absolute pathname of the .npy file.
+
+
+    Returns :
+
+        nbr_of_rows (int) : Number of rows of the array (0 for an empty array).
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    with open(pathname, 'rb') as npy_file :
+
+        version = np.lib.format.read_magic(npy_file)
+
+        if ( version == (1, 0) ) :
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(npy_file)
+
+        elif ( version == (2, 0) ) :
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(npy_file)
+
+        else :                                                          # other versions of the format have no public header reader
+            shape = np.load(pathname, mmap_mode='r').shape
+
+    nbr_of_rows = shape[0] if ( len(shape) > 0 ) else 1
+    #pdb.set_trace()
+
+    return nbr_of_rows
+
+
+# End of function definition
+
+
+
+def Open_station_array(pathname) :
+
+    """
+
+    Opens an array saved to a .npy file (eg. the dates or the data of a station) without reading it. Only the parts of the array that are used are read from the disk.
+
+
+    Parameters :
+
+        pathname (string) : Absolute pathname of the .npy file.
+
+
+    Returns :
+
+        station_array (array) : Memory-mapped array, read only.
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    station_array = np.load(pathname, mmap_mode='r')
+
+    return station_array
+
+
+# End of function definition
+
+
+
+def Get_date_range(pathname) :
+
+    """
+
+    Finds the first and last dates of a dates .npy file. Only the first and last entries are read.
+
+
+    Parameters :
+
+        pathname (string) : Absolute pathname of the dates .npy file.
+
+
+    Returns :
+
+        first_date (float) : First date of the file (None if the file is empty).
+
+        last_date (float)  : Last date of the file (None if the file is empty).
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    dates = Open_station_array(pathname)
+
+    if ( dates.shape[0] == 0 ) :
+        return None, None
+
+    first_date = float(dates[0])
+    last_date  = float(dates[-1])
+
+    return first_date, last_date
+
+
+# End of function definition
+
+
+
+def Get_rows(pathname, start_row, end_row) :
+
+    """
+
+    Reads some consecutive rows of an array saved to a .npy file. Only those rows are read from the disk.
+
+
+    Parameters :
+
+        pathname (string) : Absolute pathname of the .npy file.
+
+        start_row (int)   : First row to read.
+
+        end_row (int)     : Row at which reading stops (excluded), as in a slice.
+
+
+    Returns :
+
+        rows (array) : Rows start_row to end_row - 1 of the array, in memory.
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    station_array = Open_station_array(pathname)
+    rows          = np.array(station_array[start_row:end_row])
+
+    return rows
+
+
+# End of function definition
@@ -0,0 +1,410 @@
+import math
+import numpy as np
+import Calculate_stats as cs
+import pdb
+
+
+
+SKETCH_ERROR_FACTOR = 4.      # size of the lowest level of a quantile sketch, times the rank error; measured rank errors stay well below the requested one with this factor
+SKETCH_LEVEL_RATIO  = 2. / 3  # ratio of the sizes of two consecutive levels of a quantile sketch (the highest level is the largest)
+
+
+
+def Create_stats_accumulator(nbr_of_vars, rank_error=0.01) :
+
+    """
+
+    Creates an accumulator of descriptive statistics, to which data can be added chunk by chunk (see Update_stats_accumulator) and which can be merged with other accumulators
+    (eg. from other stations or processes, see Merge_stats_accumulators). The whole data never need to be in memory.
+
+    The count, mean and standard deviation are updated exactly (Welford/Chan updates), as are the minimum and maximum. Quantiles are estimated with a mergeable sketch (KLL)
+    whose size does not depend on the amount of data.
+
+
+    Parameters :
+
+        nbr_of_vars (int)  : Number of variables (ie, columns of the data).
+
+        rank_error (float) : Largest error allowed on the rank of the estimated quantiles, as a fraction of the amount of data (eg. 0.01 : the estimated median lies between
+                             the 49th and 51st percentiles). Quantiles are exact as long as the accumulator holds fewer than about 4 / rank_error values per variable.
+
+
+    Returns :
+
+        accumulator (dict) : The accumulator, with the keys 'counts', 'means', 'm2s' (sums of the squared deviations from the means), 'mins', 'maxs' (one value per variable)
+                             and 'sketches' (one quantile sketch per variable).
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    sketch_size = int( math.ceil(SKETCH_ERROR_FACTOR / rank_error) )
+
+    accumulator = { 'counts'   : np.zeros(nbr_of_vars, dtype=np.int64),
+                    'means'    : np.zeros(nbr_of_vars),
+                    'm2s'      : np.zeros(nbr_of_vars),
+                    'mins'     : np.full(nbr_of_vars, np.inf),
+                    'maxs'     : np.full(nbr_of_vars, -np.inf),
+                    'sketches' : [ { 'size' : sketch_size, 'levels' : [ np.array([]) ], 'offsets' : [ 0 ] } for var_nbr in range(nbr_of_vars) ] }
+
+    return accumulator
+
+
+# End of function definition
+
+
+
+def Update_stats_accumulator(accumulator, data_chunk) :
+
+    """
+
+    Adds a chunk of data to an accumulator. Missing data (NaN) are ignored.
+
+
+    Parameters :
+
+        accumulator (dict) : Accumulator (see Create_stats_accumulator). It is modified.
+
+        data_chunk (array) : Data to add. Each column represents a single variable (a one dimensional array is a single variable).
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    data_chunk = np.asarray(data_chunk, dtype=np.float64)
+    data_chunk = data_chunk.reshape( (data_chunk.shape[0], -1) ) if ( data_chunk.shape[0] > 0 ) else data_chunk.reshape( (0, len(accumulator['sketches'])) )
+
+
+    # Step 1 : Calculate the statistics of the chunk
+
+    is_valid     = ~np.isnan(data_chunk)
+    chunk_counts = np.count_nonzero(is_valid, axis=0)
+
+    with np.errstate(invalid='ignore', divide='ignore') :                 # variables without valid data in the chunk
+
+        chunk_means = np.where(chunk_counts > 0, np.nansum(data_chunk, axis=0) / chunk_counts, 0.)
+        chunk_m2s   = np.nansum( (data_chunk - chunk_means)**2, axis=0 )
+
+    chunk_accumulator = { 'counts'   : chunk_counts,
+                          'means'    : chunk_means,
+                          'm2s'      : chunk_m2s,
+                          'mins'     : np.where(chunk_counts > 0, np.nanmin(np.where(is_valid, data_chunk, np.inf), axis=0, initial=np.inf), np.inf),
+                          'maxs'     : np.where(chunk_counts > 0, np.nanmax(np.where(is_valid, data_chunk, -np.inf), axis=0, initial=-np.inf), -np.inf),
+                          'sketches' : [] }
+
+
+    # Step 2 : Merge them with those of the accumulator
+
+    Merge_moments(accumulator, chunk_accumulator)
+
+    for var_nbr, sketch in enumerate(accumulator['sketches']) :
+
+        sketch['levels'][0] = np.concatenate( ( sketch['levels'][0], data_chunk[is_valid[:, var_nbr], var_nbr] ) )
+        Compact_sketch(sketch)
+
+    #pdb.set_trace()
+
+
+# End of function definition
+
+
+
+def Merge_stats_accumulators(accumulator_1, accumulator_2) :
+
+    """
+
+    Merges two accumulators, as if all their data had been added to a single one. Both must have the same number of variables and the same rank error.
+
+
+    Parameters :
+
+        accumulator_1 (dict) : First accumulator (see Create_stats_accumulator).
+
+        accumulator_2 (dict) : Second accumulator.
+
+
+    Returns :
+
+        accumulator (dict) : New accumulator holding the data of both. The accumulators merged are not modified.
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    accumulator = { 'counts'   : accumulator_1['counts'].copy(),
+                    'means'    : accumulator_1['means'].copy(),
+                    'm2s'      : accumulator_1['m2s'].copy(),
+                    'mins'     : accumulator_1['mins'].copy(),
+                    'maxs'     : accumulator_1['maxs'].copy(),
+                    'sketches' : [] }
+
+    Merge_moments(accumulator, accumulator_2)
+
+    for sketch_1, sketch_2 in zip(accumulator_1['sketches'], accumulator_2['sketches']) :
+
+        nbr_of_levels = max( len(sketch_1['levels']), len(sketch_2['levels']) )
+        levels        = [ np.concatenate( [ sketch['levels'][level_nbr] for sketch in (sketch_1, sketch_2) if level_nbr < len(sketch['levels']) ] ) for level_nbr in range(nbr_of_levels) ]
+        offsets       = [ ( sketch_1['offsets'] + [ 0 ] * nbr_of_levels )[level_nbr] for level_nbr in range(nbr_of_levels) ]
+
+        sketch = { 'size' : sketch_1['size'], 'levels' : levels, 'offsets' : offsets }
+        Compact_sketch(sketch)
+
+        accumulator['sketches'].append(sketch)
+
+    return accumulator
+
+
+# End of function definition
+
+
+
+def Get_accumulated_stats(accumulator, stats_names) :
+
+    """
+
+    Obtains descriptive statistics from an accumulator.
+
+
+    Parameters :
+
+        accumulator (dict) : Accumulator (see Create_stats_accumulator).
+
+        stats_names (list) : Names of the descriptive statistics (see Calculate_stats.Calculate_stats). 'MEAN', 'STANDARD_DEVIATION', 'COUNT', 'MIN' and 'MAX' are exact;
+                             the quantiles ('Q1', 'MEDIAN', 'PERCENTILE_90', etc.) are estimated within the rank error of the accumulator.
+
+
+    Returns :
+
+        stats_values (array) : Value of the descriptive statistics. Each row represents one statistic, in the order of stats_names (unknown names are skipped), and each column one variable.
+                               Statistics of a variable without data are NaN (0 for 'COUNT').
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    stats_names = cs.Validate_stats_names(stats_names)   # unknown names are skipped
+
+    counts  = accumulator['counts']
+    is_full = counts > 0
+
+    stats_values_list = []
+
+    with np.errstate(invalid='ignore', divide='ignore') :
+
+        for stat_name in stats_names :
+
+            if ( stat_name == 'MEAN' ) :
+                stat_values = np.where(is_full, accumulator['means'], np.nan)
+
+            elif ( stat_name == 'STANDARD_DEVIATION' ) :
+                stat_values = np.where(is_full, np.sqrt(accumulator['m2s'] / counts), np.nan)
+
+            elif ( stat_name == 'COUNT' ) :
+                stat_values = counts.astype(np.float64)
+
+            elif ( stat_name == 'MIN' ) :
+                stat_values = np.where(is_full, accumulator['mins'], np.nan)
+
+            elif ( stat_name == 'MAX' ) :
+                stat_values = np.where(is_full, accumulator['maxs'], np.nan)
+
+            else :
+                stat_values = np.array( [ Get_sketch_quantile(sketch, cs.Get_quantile(stat_name), stat_name) for sketch in accumulator['sketches'] ] )
+
+            stats_values_list.append(stat_values)
+
+    stats_values = np.array(stats_values_list)
+    return stats_values
+
+
+# End of function definition
+
+
+
+def Merge_moments(accumulator, other_accumulator) :
+
+    """
+
+    Merges the counts, means, sums of squared deviations, minimums and maximums of an accumulator into another one (Chan et al. parallel update).
+
+
+    Parameters :
+
+        accumulator (dict)       : Accumulator updated.
+
+        other_accumulator (dict) : Accumulator merged into the first one. It is not modified.
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    counts_1, means_1, m2s_1 = accumulator['counts'], accumulator['means'], accumulator['m2s']
+    counts_2, means_2, m2s_2 = other_accumulator['counts'], other_accumulator['means'], other_accumulator['m2s']
+
+    counts = counts_1 + counts_2
+    deltas = means_2 - means_1
+
+    with np.errstate(invalid='ignore', divide='ignore') :
+
+        means = np.where(counts > 0, means_1 + deltas * (counts_2 / counts), 0.)
+        m2s   = np.where(counts > 0, m2s_1 + m2s_2 + deltas**2 * (counts_1 * (counts_2 / counts)), 0.)
+
+    accumulator.update( { 'counts' : counts, 'means' : means, 'm2s' : m2s,
+                          'mins'   : np.minimum(accumulator['mins'], other_accumulator['mins']), 'maxs' : np.maximum(accumulator['maxs'], other_accumulator['maxs']) } )
+
+
+# End of function definition
+
+
+
+def Compact_sketch(sketch) :
+
+    """
+
+    Compacts the levels of a quantile sketch that hold more values than their capacity. The values of such a level are sorted and every other value is moved to the next
+    level, where each value stands for twice as many data. The values kept alternate between the odd and even positions from one compaction to the next.
+
+
+    Parameters :
+
+        sketch (dict) : Quantile sketch, with the keys 'size', 'levels' (values of each level, the values of level h standing for 2**h data each) and 'offsets'. It is modified.
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    level_nbr = 0
+
+    while ( level_nbr < len(sketch['levels']) ) :
+
+        nbr_of_levels = len(sketch['levels'])
+        capacity      = max( 2, int( math.ceil(sketch['size'] * SKETCH_LEVEL_RATIO**(nbr_of_levels - 1 - level_nbr)) ) )
+        level         = sketch['levels'][level_nbr]
+
+        if ( level.shape[0] > capacity ) :
+
+            if ( level_nbr == nbr_of_levels - 1 ) :
+
+                sketch['levels'].append( np.array([]) )
+                sketch['offsets'].append(0)
+
+            level = np.sort(level)
+
+            if ( level.shape[0] % 2 == 1 ) :   # an odd value is left on its level
+
+                kept_value = level[-1:]
+                level      = level[:-1]
+
+            else :
+                kept_value = level[:0]
+
+            offset = sketch['offsets'][level_nbr]
+            sketch['offsets'][level_nbr] = 1 - offset
+
+            sketch['levels'][level_nbr + 1] = np.concatenate( ( sketch['levels'][level_nbr + 1], level[offset::2] ) )
+            sketch['levels'][level_nbr]     = kept_value
+
+        level_nbr = level_nbr + 1
+
+
+# End of function definition
+
+
+
+def Get_sketch_quantile(sketch, quantile, stat_name) :
+
+    """
+
+    Estimates a quantile from a quantile sketch. While no value of the sketch was compacted, the quantile is exact (see Calculate_stats.Calculate_sorted_stat).
+
+
+    Parameters :
+
+        sketch (dict)      : Quantile sketch (see Compact_sketch).
+
+        quantile (float)   : Quantile, from 0 to 1.
+
+        stat_name (string) : Name of the statistic (eg. 'MEDIAN').
+
+
+    Returns :
+
+        quantile_value (float) : Estimated value of the quantile (NaN if the sketch is empty).
+
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    values  = np.concatenate(sketch['levels'])
+    weights = np.concatenate( [ np.full(level.shape[0], 2**level_nbr) for level_nbr, level in enumerate(sketch['levels']) ] )
+
+    if ( values.shape[0] == 0 ) :
+        return np.nan
+
+    order   = np.argsort(values, kind='stable')
+    values  = values[order]
+    weights = weights[order]
+
+    if ( len(sketch['levels']) == 1 ) :   # no value was compacted
+
+        quantile_value = cs.Calculate_sorted_stat(stat_name, values, np.array([0]), np.array([values.shape[0]]), np.array([False]))[0]
+
+    else :
+
+        cumulative_weights = np.cumsum(weights)
+        rank               = quantile * cumulative_weights[-1]
+        quantile_value     = values[ min( np.searchsorted(cumulative_weights, rank, side='left'), values.shape[0] - 1 ) ]
+
+    return quantile_value
+
+
+# End of function definition
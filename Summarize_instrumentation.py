@@ -0,0 +1,126 @@
+import sys
+import numpy as np
+import pandas as pd
+import pdb
+
+
+"""
+
+This script summarizes the measurements logged by the scripts run with --instrumentation=<pathname> (or the FLUXNET_INSTRUMENTATION environment variable, see
+Instrumentation.py) : the time taken, the rows processed and the memory used by every stage of a run, its slowest stations and the blocks which failed. It then compares the run with a
+reference run (by default, the previous one) and lists the stations whose time per row increased by more than REGRESSION_FACTOR. The cProfile files of a station, if any,
+can be read with python -m pstats <pathname>.
+
+
+Author        : Élise Comeau
+
+Created       : October 18th, 2026
+
+Last modified : October 18th, 2026
+
+"""
+
+
+# Step 0 : Define constants
+
+LOG_PATHNAME      = '/snow/comeau/FLUXNET_America/AMF_1990-2017/npy/AMF_instrumentation_1990-2017.jsonl'
+RUN_ID            = None    # run to summarize (by default, the last one)
+REFERENCE_RUN_ID  = None    # run to compare it with (by default, the one before it)
+NBR_OF_SLOWEST    = 10      # number of slowest stations listed for each stage
+REGRESSION_FACTOR = 1.25    # a station is listed if its time per row is multiplied by more than this factor
+MIN_SECONDS       = 1.      # blocks shorter than this (in both runs) are not compared, their times being mostly noise
+ERROR_STATUS      = 'error'
+
+
+
+# Step 1 : Read the measurements and find the runs to compare (in the order they started)
+
+records = pd.read_json(LOG_PATHNAME, lines=True, dtype=False)
+
+if ( records.empty ) :
+
+    print('No measurement was found in ' + LOG_PATHNAME + '.\n')
+    sys.exit(0)
+
+for column in ['station', 'rows', 'rows_per_second', 'rss_increase_mb', 'error'] :   # keys not logged by every block (or by older versions of Instrumentation)
+
+    if ( column not in records.columns ) :
+        records[column] = None
+
+run_ids_list = records.groupby('run_id')['time'].min().sort_values().index.tolist()
+
+run_id           = RUN_ID or run_ids_list[-1]
+reference_run_id = REFERENCE_RUN_ID or ( run_ids_list[run_ids_list.index(run_id) - 1] if ( run_ids_list.index(run_id) > 0 ) else None )
+
+run_records      = records[ records['run_id'] == run_id ]
+station_records  = run_records[ run_records['station'].notna() ]
+#pdb.set_trace()
+
+
+
+# Step 2 : Summarize every stage of the run (the stage records cover the whole stage, eg. a pool of workers; the station records are summed)
+
+print('Run ' + run_id + ' (' + ', '.join( run_records['script'].unique() ) + ')\n')
+
+for stage, stage_records in run_records.groupby('stage', sort=False) :
+
+    stage_station_records = stage_records[ stage_records['station'].notna() ]
+    stage_total_records   = stage_records[ stage_records['station'].isna() ]
+
+    line = 'Stage ' + stage + ' : ' + str(stage_station_records.shape[0]) + ' stations, ' + str(round(stage_station_records['seconds'].sum(), 1)) + ' s, '
+    line = line + str(round(stage_station_records['cpu_seconds'].sum(), 1)) + ' CPU s, ' + str(int(stage_station_records['rows'].fillna(0).sum())) + ' rows'
+
+    if ( not stage_total_records.empty ) :
+        line = line + ' (whole stage : ' + str(round(stage_total_records['seconds'].sum(), 1)) + ' s, ' + str(round(stage_total_records['cpu_seconds'].sum(), 1)) + ' CPU s)'
+
+    if ( stage_station_records['rss_increase_mb'].notna().any() ) :   # memory needed by the largest station (what a worker must be able to hold)
+
+        largest_record = stage_station_records.loc[ stage_station_records['rss_increase_mb'].idxmax() ]
+        line = line + ', up to ' + str(round(largest_record['rss_increase_mb'], 1)) + ' MB (' + str(largest_record['station']) + ')'
+
+    print(line)
+
+    for index, record in stage_station_records.nlargest(NBR_OF_SLOWEST, 'seconds').iterrows() :
+
+        rows_per_second = ( str(int(record['rows_per_second'])) + ' rows/s' ) if ( pd.notna(record['rows_per_second']) ) else ''
+        memory          = ( str(round(record['rss_increase_mb'], 1)) + ' MB' ) if ( pd.notna(record['rss_increase_mb']) ) else ''
+        print('    ' + str(record['station']).ljust(40) + str(round(record['seconds'], 2)).rjust(10) + ' s   ' + rows_per_second.ljust(20) + memory)
+
+    print('')
+
+
+
+# Step 3 : List the blocks which failed
+
+for index, record in run_records[ run_records['status'] == ERROR_STATUS ].iterrows() :
+    print('Failed : ' + record['stage'] + ' ' + str(record['station']) + ' : ' + str(record['error']))
+
+
+
+# Step 4 : Compare the time per row of every station with the reference run (the time itself if the rows are unknown)
+
+if ( reference_run_id is None ) :
+
+    print('No reference run to compare run ' + run_id + ' with.')
+    sys.exit(0)
+
+reference_records = records[ ( records['run_id'] == reference_run_id ) & records['station'].notna() ]
+
+keys     = ['stage', 'station']
+compared = pd.merge(station_records.groupby(keys)[['seconds', 'rows']].sum(min_count=1).reset_index(),
+                    reference_records.groupby(keys)[['seconds', 'rows']].sum(min_count=1).reset_index(), on=keys, suffixes=('', '_reference'))
+
+compared = compared[ ( compared['seconds'] >= MIN_SECONDS ) | ( compared['seconds_reference'] >= MIN_SECONDS ) ]
+
+rows_are_known    = ( compared['rows'] > 0 ) & ( compared['rows_reference'] > 0 )
+compared['ratio'] = np.where(rows_are_known, ( compared['seconds'] / compared['rows'] ) / ( compared['seconds_reference'] / compared['rows_reference'] ),
+                             compared['seconds'] / compared['seconds_reference'])
+
+regressions = compared[ compared['ratio'] > REGRESSION_FACTOR ].sort_values('ratio', ascending=False)
+#pdb.set_trace()
+
+print('Compared with run ' + reference_run_id + ' : ' + str(regressions.shape[0]) + ' of ' + str(compared.shape[0]) + ' steps slower by more than a factor ' + str(REGRESSION_FACTOR))
+
+for index, regression in regressions.iterrows() :
+    print('    ' + regression['stage'].ljust(16) + str(regression['station']).ljust(40) + str(round(regression['seconds_reference'], 2)).rjust(10) + ' s -> '
+          + str(round(regression['seconds'], 2)) + ' s (x' + str(round(regression['ratio'], 2)) + ')')
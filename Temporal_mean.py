@@ -42,7 +42,65 @@ def Temporal_mean(data_short_period, dates_short_period, t_freq_short, t_freq_lo
 
     Created       : June 3rd, 2021
 
-    Last modified : August 3rd, 2021
+    Last modified : October 18th, 2026
+
+
+    """
+
+
+    # Step 1 : Calculate the temporal mean for the single minimum data percentage
+
+    data_long_period_list, dates_long_period_list = Temporal_mean_multi_threshold(data_short_period, dates_short_period, t_freq_short, t_freq_long, central_time, [ min_data_percentage ])
+
+
+    # Step 2 : Return the results from the temporal averaging.
+
+    data_long_period  = data_long_period_list[0]
+    dates_long_period = dates_long_period_list[0]
+
+    return data_long_period, dates_long_period
+
+
+# End of function definition
+
+
+
+def Temporal_mean_multi_threshold(data_short_period, dates_short_period, t_freq_short, t_freq_long, central_time, min_data_percentages) :
+
+
+    """
+
+    Calculates the temporal mean for a given time period from the temporal mean of a shorter time period for data of one or more variables, once for each of several minimum data
+    percentages. The counts and means of each period are calculated only once; each minimum data percentage then only selects the periods that have enough data.
+    
+    Parameters :
+    
+        data_short_period (array)    : Data averaged over the shorter time period. Each column represents one variable.
+        
+        dates_short_period (array)   : Dates associated with data_short_period.
+        
+        t_freq_short (int)           : Temporal frequency associated with data_short_period, expressed in seconds.
+        
+        t_freq_long (int)            : Temporal frequency associated with data_long_period, expressed in seconds.
+        
+        central_time (float)         : Time about which the temporal mean will be calculated, expressed in hours ranging from 0 to 24 (0 inclusive, 24 exclusive). See Temporal_mean.
+
+        min_data_percentages (list)  : Minimum amounts of data that must be present over the shorter time period to be included in the mean of the longer time period. Each is
+                                       expressed as a percentage from 0 to 100 (eg. [10, 25, 50, 60, 75, 100]).
+    
+    
+    Returns :
+    
+       data_long_period_list (list)  : Data averaged over the longer time period, one array per minimum data percentage (in the same order as min_data_percentages).
+       
+       dates_long_period_list (list) : Dates associated with each array of data_long_period_list.
+       
+
+    Author        : Élise Comeau
+
+    Created       : October 18th, 2026
+
+    Last modified : October 18th, 2026
 
 
     """
@@ -70,7 +128,7 @@ def Temporal_mean(data_short_period, dates_short_period, t_freq_short, t_freq_lo
         print('The central time is out of bounds. Temporal mean will not be calculated.\n')
         sys.exit(0)
 
-    elif ( ( min_data_percentage < 0 ) or ( min_data_percentage > 100 ) ) :
+    elif ( any( ( min_data_percentage < 0 ) or ( min_data_percentage > 100 ) for min_data_percentage in min_data_percentages ) ) :
 
         print('The minimum data percentage is out of bounds. Temporal mean will not be calculated.\n')
         sys.exit(0)
@@ -123,50 +181,61 @@ def Temporal_mean(data_short_period, dates_short_period, t_freq_short, t_freq_lo
 
         # Step 3 : Calculate the mean over the longer time period.
 
-        contiguous_data    = []
-        contiguous_dates   = []
-        total_rows         = data_short_period.shape[0]
-        initial_row        = 0                           # row at whihch temporal averaging begins        
-        data_per_period    = t_freq_long / t_freq_short  # quantity of data per period, provided all the data is present
-        offset             = 0                           # necessary to include the correct amount of rows in the mean calculation 
-        #pdb.set_trace()
+        total_rows      = data_short_period.shape[0]
+        data_per_period = t_freq_long / t_freq_short  # quantity of data per period, provided all the data is present
+
+        # each row is assigned the number of periods that have passed since initial_time; a row that is earlier than the current period (ie, out of order) is kept in
+        # the current period, hence the running maximum
+
+        period_nbrs = np.floor_divide(dates_short_period - initial_time, t_freq_long)
+        period_nbrs = np.maximum.accumulate(period_nbrs)
 
-        for row in range(total_rows) :
+        first_rows        = np.concatenate( ( [0], np.flatnonzero(period_nbrs[1:] != period_nbrs[:-1]) + 1 ) )   # row at which each period begins
+        number_of_entries = np.diff( np.append(first_rows, total_rows) )
+        data_percentage   = number_of_entries / data_per_period * 100                                              # percentage of data that is present within each period
 
-            time_difference = dates_short_period[row] - initial_time
+        # the rows of every period are summed one position at a time (first row of each period, then second row, etc.); the rows are therefore added in the same order
+        # as np.mean would, which keeps the means identical to those of a period by period calculation
 
-            if ( (time_difference >= t_freq_long) or (row == total_rows - 1) ) :
+        period_sums = data_short_period[first_rows, :]
+
+        for row_position in range(1, np.max(number_of_entries)) :
+
+            has_row_position               = ( number_of_entries > row_position )
+            period_sums[has_row_position] += data_short_period[first_rows[has_row_position] + row_position, :]
+
+        period_means = period_sums / number_of_entries[:, np.newaxis]   # average of each variable (ie, column) for each period
+
+        period_dates = initial_time + period_nbrs[first_rows] * t_freq_long + t_freq_long / 2   # dates correspond to the middle of the period
+        #pdb.set_trace()
 
-                if ( time_difference < t_freq_long ) :     # if we have not accumulated enough data but we are at the end of data_short_period
-                    offset = 1
 
-                number_of_entries = ( row + offset ) - initial_row
-                data_percentage   = number_of_entries / data_per_period * 100     # calculate the percentage of data that is present within the current period
+        # Step 4 : Keep the periods with enough data for each minimum data percentage
 
-                if ( data_percentage >= min_data_percentage ) :
+        data_long_period_list  = []
+        dates_long_period_list = []
 
-                    contiguous_data.append(np.mean(data_short_period[initial_row:row+offset,:], axis=0))   # data corresponds to the average of each variable (ie, column) for each entry per long temporal frequency
-                    contiguous_dates.append(initial_time + t_freq_long / 2)                                # dates correspond to the middle of the period
+        for min_data_percentage in min_data_percentages :
 
-                initial_time += int(time_difference / t_freq_long) * t_freq_long   # we must find how many t_freq_long have passed since the last initial_time to find the new one
-                initial_row   = row
+            is_kept = ( data_percentage >= min_data_percentage )
 
-        if ( offset == 0 ) :    # if the last row of data_short_period was excluded from the last period
+            if ( np.any(is_kept) ) :
 
-            data_percentage = 1 / data_per_period * 100            # weight is 1, since only the last row of data was excluded
+                data_long_period  = period_means[is_kept]
+                dates_long_period = period_dates[is_kept]
 
-            if ( data_percentage >= min_data_percentage ) :
+            else :
 
-                contiguous_data.append(data_short_period[row,:])
-                contiguous_dates.append(initial_time + t_freq_long / 2)
+                data_long_period  = np.array([])
+                dates_long_period = np.array([])
 
+            data_long_period_list.append(data_long_period)
+            dates_long_period_list.append(dates_long_period)
 
-        # Step 4 : Return the results from the temporal averaging.
 
-        data_long_period  = np.array(contiguous_data)
-        dates_long_period = np.array(contiguous_dates)
+        # Step 5 : Return the results from the temporal averaging.
 
-        return data_long_period, dates_long_period
+        return data_long_period_list, dates_long_period_list
 
 
 # End of function definition